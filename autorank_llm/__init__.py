@@ -1,3 +1,61 @@
-from .evaluator import LLMEvaluator
-from .models import LLM, ModelRegistry
-from .utils import normalize_skill_levels, rank_llms, explainability_report, check_bias_and_fairness, check_robustness
+import importlib
+from typing import Any, List
+
+# Public names and the submodule defining each. Submodules are imported on first
+# attribute access, so ``import autorank_llm`` stays cheap for short-lived workers.
+_EXPORTS = {
+    'TokenBudget': 'budget',
+    'BudgetExceededError': 'budget',
+    'ResponseCache': 'cache',
+    'CacheMissError': 'cache',
+    'Checkpoint': 'checkpoint',
+    'ModelAffinity': 'concurrency',
+    'LLMEvaluator': 'evaluator',
+    'ScoringProtocol': 'judging',
+    'LLM': 'models',
+    'ModelRegistry': 'models',
+    'CallPolicy': 'policy',
+    'CircuitOpenError': 'policy',
+    'CallTimeoutError': 'policy',
+    'ClientPool': 'pool',
+    'Metrics': 'metrics',
+    'PairingScheduler': 'scheduling',
+    'AllPairsScheduler': 'scheduling',
+    'RoundRobinScheduler': 'scheduling',
+    'RandomRegularScheduler': 'scheduling',
+    'ActiveSamplingScheduler': 'scheduling',
+    'ScoreMatrix': 'scoring',
+    'SyntheticBackend': 'simulation',
+    'run_benchmark': 'simulation',
+    'synthetic_model_configs': 'simulation',
+    'EarlyStopping': 'stopping',
+    'LogSink': 'sinks',
+    'MemorySink': 'sinks',
+    'JSONLSink': 'sinks',
+    'SQLiteSink': 'sinks',
+    'Task': 'tasks',
+    'TaskSuite': 'tasks',
+    'SwissTournament': 'tournament',
+    'normalize_skill_levels': 'utils',
+    'rank_llms': 'utils',
+    'explainability_report': 'utils',
+    'iter_explainability_report': 'utils',
+    'write_explainability_report': 'utils',
+    'check_bias_and_fairness': 'utils',
+    'check_robustness': 'utils',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,249 @@
+# budget.py
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .policy import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = ' [...]'
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised without calling the backend once a TokenBudget's hard limit is spent."""
+
+
+def count_tokens(text: str, tokenizer: Optional[Any] = None) -> int:
+    """
+    :param tokenizer: A callable returning the tokens in a text, or an object with ``encode``
+        (default: estimate_tokens).
+    :return: Tokens in a text.
+    """
+    tokenizer = tokenizer if tokenizer is not None else estimate_tokens
+    if callable(getattr(tokenizer, 'encode', None)):
+        return len(tokenizer.encode(text))
+    return tokenizer(text)
+
+
+def _cut(text: str, limit: int, tokenizer: Any, from_end: bool) -> str:
+    """:return: The longest prefix (or suffix) of a text within a token limit."""
+    if callable(getattr(tokenizer, 'encode', None)):
+        tokens = tokenizer.encode(text)
+        return tokenizer.decode(tokens[len(tokens) - limit:] if from_end else tokens[:limit])
+    # Plain counters cannot decode: binary search the longest piece within the limit
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if tokenizer(text[len(text) - middle:] if from_end else text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return text[len(text) - low:] if from_end else text[:low]
+
+
+def truncate_tokens(text: str, limit: int, tokenizer: Optional[Any] = None, strategy: str = 'head') -> str:
+    """
+    Cut a text to a token limit, marking the cut with ' [...]'.
+    :param text: The text.
+    :param limit: Token limit.
+    :param tokenizer: Token counter as in count_tokens; objects with ``encode`` must also have ``decode``.
+    :param strategy: 'head' keeps the start of the text; 'middle' keeps its start and end.
+    :return: The text, truncated if it was over the limit.
+    """
+    tokenizer = tokenizer if tokenizer is not None else estimate_tokens
+    if count_tokens(text, tokenizer) <= limit:
+        return text
+    if strategy == 'middle' and limit > 1:
+        head = _cut(text, (limit + 1) // 2, tokenizer, False)
+        tail = _cut(text[len(head):], limit // 2, tokenizer, True)
+        return head.rstrip() + TRUNCATION_MARKER + ' ' + tail.lstrip()
+    return _cut(text, limit, tokenizer, False).rstrip() + TRUNCATION_MARKER
+
+
+class TokenBudget:
+    """
+    Token accounting and caps for a run. Generations are cut to ``max_tokens`` and every
+    response embedded in a judge prompt to ``max_judge_tokens``, so one verbose model cannot
+    inflate the prompts of every judge that scores it. Prompt and completion tokens of every
+    backend call (cache hits are free) are counted per model and priced; once the run has
+    spent ``max_run_tokens`` or ``max_cost``, further calls fail fast with
+    BudgetExceededError and the evaluator stops, ranking what has been scored so far.
+    Calls already in flight may finish past the limit.
+    """
+    STRATEGIES = ('head', 'middle')
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_judge_tokens: Optional[int] = None,
+        max_run_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        tokenizer: Optional[Union[Callable[[str], int], Any]] = None,
+        truncation: str = 'head',
+        degrade_at: Optional[float] = None
+    ) -> None:
+        """
+        :param max_tokens: Cap on the tokens of each generation (None for no cap). Backends that
+            know a max-tokens argument receive it; longer responses are truncated either way.
+        :param max_judge_tokens: Cap on the tokens of each response shown to a judge.
+        :param max_run_tokens: Hard limit on the prompt and completion tokens of a run.
+        :param max_cost: Hard limit on the cost of a run, in the currency of ``prices``.
+        :param prices: (prompt, completion) price per million tokens, keyed by model name or
+            model_name, e.g. {'gpt-4o': (2.5, 10.0)}; unpriced models cost nothing.
+        :param tokenizer: Token counter: a callable returning the tokens in a text, or an object
+            with ``encode`` and ``decode`` such as a tiktoken encoding (default: about four
+            characters per token).
+        :param truncation: 'head' keeps the start of a long text; 'middle' keeps its start and end.
+        :param degrade_at: Fraction of the hard limit after which both caps are halved, so the
+            rest of the run spends less per call (None to keep them).
+        :raises ValueError: If input is invalid.
+        """
+        for name, value in (('max_tokens', max_tokens), ('max_judge_tokens', max_judge_tokens),
+                            ('max_run_tokens', max_run_tokens)):
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ValueError(f"{name} must be a positive integer.")
+        if max_cost is not None and max_cost <= 0:
+            raise ValueError("max_cost must be positive.")
+        if truncation not in self.STRATEGIES:
+            raise ValueError(f"truncation must be one of {self.STRATEGIES}.")
+        if degrade_at is not None:
+            if not 0.0 < degrade_at < 1.0:
+                raise ValueError("degrade_at must be between 0 and 1.")
+            if max_run_tokens is None and max_cost is None:
+                raise ValueError("degrade_at needs max_run_tokens or max_cost.")
+        self.max_tokens: Optional[int] = max_tokens
+        self.max_judge_tokens: Optional[int] = max_judge_tokens
+        self.max_run_tokens: Optional[int] = max_run_tokens
+        self.max_cost: Optional[float] = max_cost
+        self.prices: Dict[str, Tuple[float, float]] = dict(prices or {})
+        self.tokenizer: Any = tokenizer if tokenizer is not None else estimate_tokens
+        self.truncation: str = truncation
+        self.degrade_at: Optional[float] = degrade_at
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the usage counters, e.g. at the start of a run."""
+        with self._lock:
+            self.usage: Dict[str, Dict[str, float]] = {}
+            self.truncated: Dict[str, int] = {'generations': 0, 'judge_inputs': 0}
+            self.skipped: int = 0
+            self.stopped: bool = False
+            self._warned: bool = False
+
+    def count(self, text: str) -> int:
+        """:return: Tokens in a text according to the tokenizer."""
+        return count_tokens(text, self.tokenizer)
+
+    def truncate(self, text: str, limit: Optional[int], kind: str = 'generations') -> str:
+        """
+        Cut a text to a token limit with the budget's tokenizer and strategy, counting the cut.
+        :param text: The text.
+        :param limit: Token limit (None leaves the text alone).
+        :param kind: Counter to increment when the text is cut: 'generations' or 'judge_inputs'.
+        :return: The text, truncated if it was over the limit.
+        """
+        if limit is None or not isinstance(text, str) or self.count(text) <= limit:
+            return text
+        with self._lock:
+            self.truncated[kind] += 1
+        return truncate_tokens(text, limit, self.tokenizer, self.truncation)
+
+    def _limit(self, cap: Optional[int]) -> Optional[int]:
+        if cap is None or not self.degraded:
+            return cap
+        return max(1, cap // 2)
+
+    @property
+    def generation_limit(self) -> Optional[int]:
+        """Token cap on generations, halved once the run is degraded."""
+        return self._limit(self.max_tokens)
+
+    @property
+    def judge_limit(self) -> Optional[int]:
+        """Token cap on the responses shown to judges, halved once the run is degraded."""
+        return self._limit(self.max_judge_tokens)
+
+    def _totals(self) -> Tuple[float, float]:
+        tokens = sum(entry['prompt_tokens'] + entry['completion_tokens'] for entry in self.usage.values())
+        return tokens, sum(entry['cost'] for entry in self.usage.values())
+
+    @property
+    def spent(self) -> float:
+        """Fraction of the hard limit spent (the larger of tokens and cost; 0.0 without limits)."""
+        with self._lock:
+            tokens, cost = self._totals()
+        fractions = [0.0]
+        if self.max_run_tokens is not None:
+            fractions.append(tokens / self.max_run_tokens)
+        if self.max_cost is not None:
+            fractions.append(cost / self.max_cost)
+        return max(fractions)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the hard limit is spent."""
+        return self.spent >= 1.0
+
+    @property
+    def degraded(self) -> bool:
+        """Whether the run has passed ``degrade_at`` and caps are halved."""
+        return self.degrade_at is not None and self.spent >= self.degrade_at
+
+    def check(self, name: str) -> None:
+        """
+        Called before each backend call.
+        :param name: Name of the calling model.
+        :raises BudgetExceededError: If the hard limit is spent.
+        """
+        if not self.exhausted:
+            return
+        with self._lock:
+            self.skipped += 1
+            warn, self._warned = not self._warned, True
+        if warn:
+            logger.warning("Token budget exhausted; skipping the remaining calls")
+        raise BudgetExceededError(f"Token budget exhausted; call to {name} skipped.")
+
+    def charge(self, name: str, model_name: str, prompt: str, response: Any) -> None:
+        """
+        Count one backend call against the budget.
+        :param name: Name of the model, keying its usage.
+        :param model_name: Backend model name, used to look up prices when the name has none.
+        :param prompt: The prompt sent.
+        :param response: The response, counted if it is a string.
+        """
+        prompt_tokens = self.count(prompt)
+        completion_tokens = self.count(response) if isinstance(response, str) else 0
+        prompt_price, completion_price = self.prices.get(name, self.prices.get(model_name, (0.0, 0.0)))
+        cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+        with self._lock:
+            entry = self.usage.setdefault(name, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0})
+            entry['calls'] += 1
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+            entry['cost'] += cost
+
+    def summary(self) -> Dict[str, Any]:
+        """:return: JSON-serializable usage of the run: totals, per-model usage, truncations and whether it stopped."""
+        with self._lock:
+            tokens, cost = self._totals()
+            models = {
+                name: {**entry, 'cost': round(entry['cost'], 6)} for name, entry in sorted(self.usage.items())
+            }
+            truncated, skipped, stopped = dict(self.truncated), self.skipped, self.stopped
+        # exhausted and degraded take the lock themselves
+        return {
+            'tokens': int(tokens),
+            'cost': round(cost, 6),
+            'max_run_tokens': self.max_run_tokens,
+            'max_cost': self.max_cost,
+            'exhausted': self.exhausted,
+            'degraded': self.degraded,
+            'stopped': stopped,
+            'skipped_calls': skipped,
+            'truncated': truncated,
+            'models': models,
+        }
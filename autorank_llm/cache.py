@@ -0,0 +1,213 @@
+# cache.py
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a prompt has no cached response."""
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for LLM generations and judgements, backed by SQLite.
+    Keys are SHA-256 digests of the backend, model name, prompt and sampling params.
+    Writes are group-committed: access times of hits are buffered in memory and stored
+    together with new responses at most every ``commit_interval`` seconds, on ``flush()``
+    and on ``close()``, so a fully cached rerun is not bound by one disk sync per call.
+    File-backed caches use SQLite's write-ahead log.
+    """
+    def __init__(
+        self,
+        path: str = ':memory:',
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        replay: bool = False,
+        commit_interval: float = 1.0
+    ) -> None:
+        """
+        :param path: SQLite database path (':memory:' for a process-local cache).
+        :param max_entries: Evict least recently used entries beyond this count.
+        :param max_age: Ignore and evict entries older than this many seconds.
+        :param replay: Read-only mode; misses raise CacheMissError instead of calling the model.
+        :param commit_interval: Seconds between commits of buffered writes (0 commits every write).
+        :raises ValueError: If input is invalid.
+        """
+        if max_entries is not None and (not isinstance(max_entries, int) or max_entries < 1):
+            raise ValueError("max_entries must be a positive integer.")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive.")
+        if commit_interval < 0:
+            raise ValueError("commit_interval must not be negative.")
+        self.path: str = path
+        self.max_entries: Optional[int] = max_entries
+        self.max_age: Optional[float] = max_age
+        self.replay: bool = replay
+        self.commit_interval: float = commit_interval
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        # Access times of hits not yet written, and whether writes await a commit
+        self._touched: Dict[str, float] = {}
+        self._dirty: bool = False
+        self._committed: float = time.monotonic()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._size: int = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if not replay:
+            self.evict()
+
+    @staticmethod
+    def make_key(backend: str, model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the content address for a call.
+        :param backend: Backend name.
+        :param model_name: Model name.
+        :param prompt: The exact prompt sent to the model.
+        :param params: Sampling params (and sample index) that influence the response.
+        :return: Hex digest key.
+        """
+        payload = json.dumps([backend, model_name, prompt, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response, updating the hit/miss counters.
+        :param key: Key from make_key.
+        :return: The cached response, or None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.replay:
+                self._touched[key] = now
+                self._commit_due_locked()
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Store a response. A no-op in replay mode.
+        :param key: Key from make_key.
+        :param value: The response text.
+        """
+        if self.replay:
+            return
+        with self._lock:
+            now = time.time()
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            if cursor.rowcount:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    "UPDATE responses SET value = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                    (value, now, now, key)
+                )
+            self._touched.pop(key, None)
+            self._dirty = True
+            if self.max_entries is not None and self._size > self.max_entries:
+                self._evict_locked()
+            self._commit_due_locked()
+
+    def get_or_call(self, key: str, func: Callable[[], str]) -> str:
+        """
+        Return the cached response for key, calling func and storing its result on a miss.
+        :param key: Key from make_key.
+        :param func: Zero-argument callable producing the response.
+        :return: The response text.
+        :raises CacheMissError: On a miss in replay mode.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        if self.replay:
+            raise CacheMissError(f"No cached response for key {key} in replay mode.")
+        value = func()
+        if isinstance(value, str):
+            self.put(key, value)
+        return value
+
+    def _store_touched_locked(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", [(at, key) for key, at in self._touched.items()]
+            )
+            self._touched.clear()
+            self._dirty = True
+
+    def _commit_locked(self) -> None:
+        self._store_touched_locked()
+        if self._dirty:
+            self._conn.commit()
+            self._dirty = False
+        self._committed = time.monotonic()
+
+    def _commit_due_locked(self) -> None:
+        if time.monotonic() - self._committed >= self.commit_interval:
+            self._commit_locked()
+
+    def flush(self) -> None:
+        """Store buffered access times and commit every pending write."""
+        with self._lock:
+            self._commit_locked()
+
+    def evict(self) -> None:
+        """Remove expired entries and, if over capacity, the least recently used ones."""
+        with self._lock:
+            self._evict_locked()
+            self._commit_locked()
+
+    def _evict_locked(self) -> None:
+        # Recency decides what goes, so buffered access times must be in the table first
+        self._store_touched_locked()
+        if self.max_age is not None:
+            cursor = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,))
+            self._size -= max(cursor.rowcount, 0)
+        if self.max_entries is not None and self._size > self.max_entries:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (self._size - self.max_entries,)
+            )
+            self._size -= max(cursor.rowcount, 0)
+
+    def stats(self) -> Dict[str, int]:
+        """:return: Dict with 'hits', 'misses' and 'entries'."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': self._size}
+
+    def clear(self) -> None:
+        """Delete every entry and reset the counters."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._dirty = True
+            self._commit_locked()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        with self._lock:
+            self._commit_locked()
+            self._conn.close()
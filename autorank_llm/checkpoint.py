@@ -0,0 +1,132 @@
+# checkpoint.py
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GenerationKey = Tuple[str, str, int]
+JudgementKey = Tuple[str, str, str, str]
+
+# SQLite builds before 3.32 reject statements with more than 999 bound parameters
+MAX_QUERY_IDS = 900
+
+
+class Checkpoint:
+    """
+    Durable record of a run's completed model calls, backed by SQLite.
+    Completed generations and judgements are appended in one transaction per batch,
+    so a crash loses at most the batch in flight and never leaves a partial write.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        :param path: SQLite database path; an existing checkpoint is reopened.
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "round INTEGER, task_id TEXT, model TEXT, sample INTEGER, response TEXT NOT NULL,"
+            " PRIMARY KEY (round, task_id, model, sample));"
+            "CREATE TABLE IF NOT EXISTS judgements ("
+            "round INTEGER, task_id TEXT, judge TEXT, candidate TEXT, response_hash TEXT, score REAL NOT NULL,"
+            " PRIMARY KEY (round, task_id, judge, candidate, response_hash));"
+            "CREATE TABLE IF NOT EXISTS assignments ("
+            "round INTEGER, task_id TEXT, pairs TEXT NOT NULL, PRIMARY KEY (round, task_id));"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """:return: The JSON value stored under a metadata key, or the default."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, **values: Any) -> None:
+        """Store JSON-serializable metadata values (config, skills, completed rounds, ...) atomically."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in values.items()]
+            )
+
+    def _select_tasks(self, query: str, round_number: int, task_ids: List[str]) -> List[Tuple[Any, ...]]:
+        """Run a query filtered on a round and task ids, in chunks that stay under SQLite's bound-parameter limit."""
+        rows: List[Tuple[Any, ...]] = []
+        with self._lock:
+            for start in range(0, len(task_ids), MAX_QUERY_IDS):
+                chunk = task_ids[start:start + MAX_QUERY_IDS]
+                rows.extend(self._conn.execute(
+                    f"{query} WHERE round = ? AND task_id IN ({', '.join('?' * len(chunk))})", [round_number, *chunk]
+                ).fetchall())
+        return rows
+
+    def generations(self, round_number: int, task_ids: List[str]) -> Dict[GenerationKey, str]:
+        """
+        :return: Completed generations for these tasks, keyed by (task_id, model, sample).
+        """
+        rows = self._select_tasks(
+            "SELECT task_id, model, sample, response FROM generations", round_number, task_ids
+        )
+        return {(task_id, model, sample): response for task_id, model, sample, response in rows}
+
+    def judgements(self, round_number: int, task_ids: List[str]) -> Dict[JudgementKey, float]:
+        """
+        :return: Completed judgements for these tasks, keyed by (task_id, judge, candidate, response_hash).
+        """
+        rows = self._select_tasks(
+            "SELECT task_id, judge, candidate, response_hash, score FROM judgements", round_number, task_ids
+        )
+        return {(task_id, judge, candidate, digest): score for task_id, judge, candidate, digest, score in rows}
+
+    def assignment(self, round_number: int, task_id: str) -> Optional[List[Tuple[str, str]]]:
+        """:return: The (judge, candidate) pairs scheduled for a task, if recorded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pairs FROM assignments WHERE round = ? AND task_id = ?", (round_number, task_id)
+            ).fetchone()
+        return [tuple(pair) for pair in json.loads(row[0])] if row else None
+
+    def record(
+        self,
+        round_number: int,
+        generations: Iterable[Tuple[str, str, int, str]] = (),
+        judgements: Iterable[Tuple[str, str, str, str, float]] = (),
+        assignments: Iterable[Tuple[str, List[Tuple[str, str]]]] = ()
+    ) -> None:
+        """
+        Append completed calls in a single transaction.
+        :param round_number: Round the calls belong to.
+        :param generations: (task_id, model, sample, response) tuples.
+        :param judgements: (task_id, judge, candidate, response_hash, score) tuples.
+        :param assignments: (task_id, [(judge, candidate), ...]) tuples.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?, ?)",
+                [(round_number, *row) for row in generations]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO judgements VALUES (?, ?, ?, ?, ?, ?)",
+                [(round_number, *row) for row in judgements]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO assignments VALUES (?, ?, ?)",
+                [(round_number, task_id, json.dumps(pairs)) for task_id, pairs in assignments]
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """:return: Dict with the number of stored 'generations' and 'judgements'."""
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('generations', 'judgements')
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
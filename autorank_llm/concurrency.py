@@ -0,0 +1,478 @@
+# concurrency.py
+import asyncio
+import logging
+import queue
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from .metrics import NULL_METRICS, Metrics
+from .pool import ClientPool
+
+logger = logging.getLogger(__name__)
+
+
+# Called with (call index, result) as each call of a batch completes
+ResultCallback = Callable[[int, Any], None]
+
+
+def _remap(on_result: Optional[ResultCallback], indices: List[int]) -> Optional[ResultCallback]:
+    """:return: A callback translating positions in a subset of calls back to the full batch's indices."""
+    if on_result is None:
+        return None
+    return lambda position, result: on_result(indices[position], result)
+
+
+class BatchSpec:
+    """
+    Describes how a Call can be coalesced with others into one batched backend call.
+    Calls sharing a key are merged, and ``func(items)`` returns one result per item.
+    """
+    def __init__(
+        self,
+        key: Hashable,
+        item: Any,
+        func: Callable[[List[Any]], List[Any]],
+        afunc: Optional[Callable[[List[Any]], Awaitable[List[Any]]]] = None
+    ) -> None:
+        """
+        :param key: Calls with equal keys may be batched together, e.g. (model, role).
+        :param item: This call's input to the batch function.
+        :param func: Callable running a list of items as one batch.
+        :param afunc: Optional coroutine function running the batch natively async.
+        """
+        self.key: Hashable = key
+        self.item: Any = item
+        self.func: Callable[[List[Any]], List[Any]] = func
+        self.afunc: Optional[Callable[[List[Any]], Awaitable[List[Any]]]] = afunc
+
+
+class Call:
+    """
+    A single unit of work for the ExecutionEngine.
+    """
+    def __init__(
+        self,
+        backend: str,
+        func: Callable[[], Any],
+        afunc: Optional[Callable[[], Awaitable[Any]]] = None,
+        labels: Optional[Dict[str, str]] = None,
+        batch: Optional[BatchSpec] = None,
+        unit: Any = None
+    ) -> None:
+        """
+        :param backend: Backend name, used to look up per-backend limits.
+        :param func: Zero-argument callable performing the call synchronously.
+        :param afunc: Optional zero-argument coroutine function performing the same call natively async.
+        :param labels: Metric labels for the call, e.g. {'model': ..., 'role': 'generate'}.
+        :param batch: Optional BatchSpec letting the engine merge this call with others of the same key.
+        :param unit: Optional picklable WorkUnit describing the call, letting a DistributedEngine run it on a worker.
+        """
+        self.backend: str = backend
+        self.func: Callable[[], Any] = func
+        self.afunc: Optional[Callable[[], Awaitable[Any]]] = afunc
+        self.labels: Dict[str, str] = labels or {}
+        self.batch: Optional[BatchSpec] = batch
+        self.unit: Any = unit
+
+
+class ModelAffinity:
+    """
+    Reorders a batch of calls so each model's calls run back to back, for hosts such as
+    Ollama that can only keep a few models loaded and pay a load for every switch. Calls
+    are grouped by their 'model' label, keeping each model's own call order, so results
+    do not change. Models still resident from the previous batch go first, and each wave
+    runs at most ``resident_models`` models per host at once. Loads and swaps (loads that
+    evict a resident model) are counted against an LRU model of every host, alongside the
+    counts the unordered batches would have caused.
+    """
+    def __init__(
+        self,
+        resident_models: int = 1,
+        hosts: Optional[Dict[str, str]] = None,
+        capacities: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        :param resident_models: Models a host keeps loaded at once (e.g. Ollama's OLLAMA_MAX_LOADED_MODELS).
+        :param hosts: Optional dict mapping model name to the host serving it (default: one host per backend).
+        :param capacities: Optional per-host override of resident_models.
+        :raises ValueError: If input is invalid.
+        """
+        if not isinstance(resident_models, int) or resident_models < 1:
+            raise ValueError("resident_models must be a positive integer.")
+        capacities = dict(capacities or {})
+        for host, capacity in capacities.items():
+            if not isinstance(capacity, int) or capacity < 1:
+                raise ValueError(f"Capacity of host '{host}' must be a positive integer.")
+        self.resident_models: int = resident_models
+        self.hosts: Dict[str, str] = dict(hosts or {})
+        self.capacities: Dict[str, int] = capacities
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the resident models and counts."""
+        self._resident: Dict[str, 'OrderedDict[str, None]'] = {}
+        self._naive: Dict[str, 'OrderedDict[str, None]'] = {}
+        self.counts: Dict[str, int] = {'loads': 0, 'swaps': 0, 'naive_loads': 0, 'naive_swaps': 0}
+
+    def _host(self, call: Call) -> Optional[str]:
+        model = call.labels.get('model')
+        return None if model is None else self.hosts.get(model, call.backend)
+
+    def _load(self, state: Dict[str, 'OrderedDict[str, None]'], host: str, model: str, prefix: str = '') -> None:
+        resident = state.setdefault(host, OrderedDict())
+        if model in resident:
+            resident.move_to_end(model)
+            return
+        self.counts[prefix + 'loads'] += 1
+        if len(resident) >= self.capacities.get(host, self.resident_models):
+            resident.popitem(last=False)
+            self.counts[prefix + 'swaps'] += 1
+        resident[model] = None
+
+    def plan(self, calls: List[Call]) -> List[List[int]]:
+        """
+        :param calls: The batch of calls.
+        :return: Waves of call indices to run one after another; calls without a 'model' label go first.
+        """
+        free: List[int] = []
+        groups: Dict[str, 'OrderedDict[str, List[int]]'] = {}
+        for index, call in enumerate(calls):
+            host = self._host(call)
+            if host is None:
+                free.append(index)
+                continue
+            model = call.labels['model']
+            self._load(self._naive, host, model, 'naive_')
+            groups.setdefault(host, OrderedDict()).setdefault(model, []).append(index)
+        per_host: Dict[str, List[List[int]]] = {}
+        for host, by_model in groups.items():
+            resident = self._resident.get(host, OrderedDict())
+            # Most recently used first, so the model loaded last keeps running without a switch
+            warm = [model for model in reversed(resident) if model in by_model]
+            order = warm + [model for model in by_model if model not in resident]
+            capacity = self.capacities.get(host, self.resident_models)
+            per_host[host] = [
+                [index for model in order[start:start + capacity] for index in by_model[model]]
+                for start in range(0, len(order), capacity)
+            ]
+            for model in order:
+                self._load(self._resident, host, model)
+        waves = [free] if free else []
+        for step in range(max((len(host_waves) for host_waves in per_host.values()), default=0)):
+            waves.append([index for host_waves in per_host.values() if step < len(host_waves) for index in host_waves[step]])
+        return waves
+
+    def stats(self) -> Dict[str, Any]:
+        """:return: Model loads and swaps, the counts without reordering, and the models resident per host."""
+        return {**self.counts, 'resident': {host: list(models) for host, models in self._resident.items()}}
+
+
+class ExecutionEngine:
+    """
+    Executes batches of backend calls serially, on a thread pool, or on an asyncio loop,
+    honouring a global concurrency limit and optional per-backend limits. Calls carrying a
+    BatchSpec are merged into batched backend calls of up to ``max_batch_size`` items. With a
+    ModelAffinity, each batch runs in waves that keep one model's calls together. With
+    metrics enabled, each call's queue wait (from batch submission to start) and latency are recorded.
+    """
+    MODES = ('serial', 'thread', 'async')
+
+    def __init__(
+        self,
+        mode: str = 'serial',
+        max_concurrency: Optional[int] = None,
+        backend_limits: Optional[Dict[str, int]] = None,
+        metrics: Optional[Metrics] = None,
+        max_batch_size: int = 1,
+        affinity: Optional[ModelAffinity] = None,
+        client_pool: Optional[ClientPool] = None
+    ) -> None:
+        """
+        :param mode: One of 'serial', 'thread' or 'async'.
+        :param max_concurrency: Maximum number of calls in flight at once (None for one worker per call, capped at 32).
+        :param backend_limits: Optional dict mapping backend name to its maximum number of calls in flight.
+        :param metrics: Optional Metrics receiving per-call queue wait and latency.
+        :param max_batch_size: Maximum calls merged into one batched call (1 disables batching).
+        :param affinity: Optional ModelAffinity grouping each batch's calls by model.
+        :param client_pool: ClientPool whose async sessions are closed before each batch's event loop
+            ends in async mode (default: the process-wide pool).
+        :raises ValueError: If input is invalid.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}.")
+        if max_concurrency is not None and (not isinstance(max_concurrency, int) or max_concurrency < 1):
+            raise ValueError("max_concurrency must be a positive integer.")
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        backend_limits = dict(backend_limits or {})
+        for backend, limit in backend_limits.items():
+            if not isinstance(limit, int) or limit < 1:
+                raise ValueError(f"Limit for backend '{backend}' must be a positive integer.")
+        self.mode: str = mode
+        self.max_concurrency: Optional[int] = max_concurrency
+        self.backend_limits: Dict[str, int] = backend_limits
+        self.metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+        self.max_batch_size: int = max_batch_size
+        self.affinity: Optional[ModelAffinity] = affinity
+        self.client_pool: Optional[ClientPool] = client_pool
+
+    def _workers(self, num_calls: int) -> int:
+        if self.max_concurrency is not None:
+            return self.max_concurrency
+        return max(1, min(32, num_calls))
+
+    def check_loop(self) -> None:
+        """
+        Async mode runs each batch on its own event loop, which cannot start inside a running one.
+        :raises RuntimeError: If the engine is in async mode and called from a running event loop, e.g. in Jupyter.
+        """
+        if self.mode != 'async':
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        raise RuntimeError(
+            "An async ExecutionEngine cannot block inside a running event loop; "
+            "await ExecutionEngine.amap or LLMEvaluator.aevaluate_llms instead."
+        )
+
+    def map(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        """
+        Run all calls and return their results in submission order.
+        :param calls: List of Call objects.
+        :param on_result: Optional callable (call index, result) invoked as each call completes, one at a
+            time and on the calling thread (or the event loop in async mode).
+        :return: List of results, one per call.
+        :raises RuntimeError: In async mode, if called from a running event loop.
+        """
+        if not calls:
+            return []
+        if self.mode == 'async':
+            self.check_loop()
+            return asyncio.run(self._run_loop(calls, on_result))
+        if self.affinity is None:
+            return self._map(calls, on_result)
+        results: List[Any] = [None] * len(calls)
+        for wave in self.affinity.plan(calls):
+            for index, result in zip(wave, self._map([calls[index] for index in wave], _remap(on_result, wave))):
+                results[index] = result
+        return results
+
+    async def _run_loop(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        """Run a batch on a fresh event loop, closing the pool's sessions on it before the loop ends."""
+        try:
+            return await self.amap(calls, on_result)
+        finally:
+            await (self.client_pool or ClientPool.default()).aclose_loop()
+
+    def _map(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        merged, spans = self._coalesce(calls)
+        if self.mode == 'serial':
+            submitted = time.perf_counter() if self.metrics.enabled else None
+            results = []
+            for call, span in zip(merged, spans):
+                result = call.func() if submitted is None else self._run_timed(call, submitted)
+                self._emit(on_result, span, result)
+                results.append(result)
+            return self._scatter(results, spans, len(calls))
+        return self._scatter(self._map_threads(merged, spans, on_result), spans, len(calls))
+
+    def _coalesce(self, calls: List[Call]) -> Tuple[List[Call], List[List[int]]]:
+        """
+        Merge calls sharing a batch key into batched calls of up to ``max_batch_size`` items.
+        :return: Tuple of (calls to run, indices of the original calls each one covers).
+        """
+        if self.max_batch_size == 1 or all(call.batch is None for call in calls):
+            return calls, [[index] for index in range(len(calls))]
+        spans: List[List[int]] = []
+        open_spans: Dict[Hashable, List[int]] = {}
+        for index, call in enumerate(calls):
+            if call.batch is None:
+                spans.append([index])
+                continue
+            span = open_spans.get(call.batch.key)
+            if span is None or len(span) == self.max_batch_size:
+                span = open_spans[call.batch.key] = []
+                spans.append(span)
+            span.append(index)
+        merged = []
+        for span in spans:
+            first = calls[span[0]]
+            if len(span) == 1:
+                merged.append(first)
+                continue
+            spec = first.batch
+            items = [calls[index].batch.item for index in span]
+            merged.append(Call(
+                first.backend,
+                partial(spec.func, items),
+                partial(spec.afunc, items) if spec.afunc is not None else None,
+                dict(first.labels, batched='true')
+            ))
+        return merged, spans
+
+    @staticmethod
+    def _emit(on_result: Optional[ResultCallback], span: List[int], result: Any) -> None:
+        """Report a finished (possibly coalesced) call as the results of the original calls it covers."""
+        if on_result is None:
+            return
+        if len(span) == 1:
+            on_result(span[0], result)
+            return
+        for index, value in zip(span, result):
+            on_result(index, value)
+
+    @staticmethod
+    def _scatter(results: List[Any], spans: List[List[int]], total: int) -> List[Any]:
+        """Spread the results of coalesced calls back over the original call positions."""
+        if len(spans) == total:
+            return results
+        out: List[Any] = [None] * total
+        for span, result in zip(spans, results):
+            if len(span) == 1:
+                out[span[0]] = result
+            else:
+                for index, value in zip(span, result):
+                    out[index] = value
+        return out
+
+    def _record(self, call: Call, submitted: float, started: float) -> None:
+        finished = time.perf_counter()
+        self.metrics.observe('autorank_queue_wait_seconds', started - submitted, role=call.labels.get('role', 'call'))
+        self.metrics.observe('autorank_call_latency_seconds', finished - started, **call.labels)
+        self.metrics.inc('autorank_calls_total', **call.labels)
+
+    def _run_timed(self, call: Call, submitted: float) -> Any:
+        started = time.perf_counter()
+        try:
+            return call.func()
+        finally:
+            self._record(call, submitted, started)
+
+    def _run_call(self, call: Call, submitted: Optional[float] = None) -> Any:
+        return call.func() if submitted is None else self._run_timed(call, submitted)
+
+    def _map_threads(
+        self,
+        calls: List[Call],
+        spans: List[List[int]],
+        on_result: Optional[ResultCallback] = None
+    ) -> List[Any]:
+        submitted = time.perf_counter() if self.metrics.enabled else None
+        with ThreadPoolExecutor(max_workers=self._workers(len(calls))) as pool:
+            if any(call.backend in self.backend_limits for call in calls):
+                return self._map_limited(pool, calls, spans, on_result, submitted)
+            if on_result is None:
+                return list(pool.map(lambda call: self._run_call(call, submitted), calls))
+            futures = {pool.submit(self._run_call, call, submitted): position for position, call in enumerate(calls)}
+            results: List[Any] = [None] * len(calls)
+            for future in as_completed(futures):
+                position = futures[future]
+                results[position] = future.result()
+                self._emit(on_result, spans[position], results[position])
+            return results
+
+    def _map_limited(
+        self,
+        pool: ThreadPoolExecutor,
+        calls: List[Call],
+        spans: List[List[int]],
+        on_result: Optional[ResultCallback],
+        submitted: Optional[float]
+    ) -> List[Any]:
+        """
+        Run calls on the pool, holding calls to a backend at its limit back on this thread until one of
+        its calls finishes, so pool workers never sit blocked on a backend limit while other backends wait.
+        """
+        results: List[Any] = [None] * len(calls)
+        finished: 'queue.SimpleQueue[Tuple[int, Future]]' = queue.SimpleQueue()
+        free: Dict[str, int] = dict(self.backend_limits)
+        held: Dict[str, Deque[int]] = {backend: deque() for backend in free}
+
+        def submit(position: int) -> None:
+            future = pool.submit(self._run_call, calls[position], submitted)
+            future.add_done_callback(lambda future: finished.put((position, future)))
+
+        for position, call in enumerate(calls):
+            if call.backend not in free:
+                submit(position)
+            elif free[call.backend]:
+                free[call.backend] -= 1
+                submit(position)
+            else:
+                held[call.backend].append(position)
+        for _ in range(len(calls)):
+            position, future = finished.get()
+            backend = calls[position].backend
+            if backend in free:
+                if held[backend]:
+                    submit(held[backend].popleft())
+                else:
+                    free[backend] += 1
+            results[position] = future.result()
+            self._emit(on_result, spans[position], results[position])
+        return results
+
+    async def amap(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        """
+        Run all calls on the running event loop and return their results in submission order.
+        Calls with a native coroutine are awaited directly; the rest run in a thread pool.
+        :param calls: List of Call objects.
+        :param on_result: Optional callable (call index, result) invoked on the loop as each call completes.
+        :return: List of results, one per call.
+        """
+        if not calls:
+            return []
+        if self.affinity is None:
+            return await self._amap(calls, on_result)
+        results: List[Any] = [None] * len(calls)
+        for wave in self.affinity.plan(calls):
+            for index, result in zip(wave, await self._amap([calls[index] for index in wave], _remap(on_result, wave))):
+                results[index] = result
+        return results
+
+    async def _amap(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        calls, spans = self._coalesce(calls)
+        total = sum(len(span) for span in spans)
+        loop = asyncio.get_running_loop()
+        workers = self._workers(len(calls))
+        global_limit = asyncio.Semaphore(workers)
+        backend_limits = {backend: asyncio.Semaphore(limit) for backend, limit in self.backend_limits.items()}
+        submitted = time.perf_counter() if self.metrics.enabled else None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            async def timed(call: Call) -> Any:
+                if submitted is None:
+                    return await self._dispatch(loop, pool, call)
+                started = time.perf_counter()
+                try:
+                    return await self._dispatch(loop, pool, call)
+                finally:
+                    self._record(call, submitted, started)
+
+            async def limited(call: Call) -> Any:
+                # Wait for the backend first so calls queued on a busy backend do not hold global slots
+                backend_limit = backend_limits.get(call.backend)
+                if backend_limit is None:
+                    async with global_limit:
+                        return await timed(call)
+                async with backend_limit, global_limit:
+                    return await timed(call)
+
+            async def run(call: Call, span: List[int]) -> Any:
+                result = await limited(call)
+                self._emit(on_result, span, result)
+                return result
+
+            results = await asyncio.gather(*(run(call, span) for call, span in zip(calls, spans)))
+            return self._scatter(list(results), spans, total)
+
+    @staticmethod
+    async def _dispatch(loop: asyncio.AbstractEventLoop, pool: ThreadPoolExecutor, call: Call) -> Any:
+        if call.afunc is not None:
+            return await call.afunc()
+        return await loop.run_in_executor(pool, call.func)
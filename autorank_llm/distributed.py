@@ -0,0 +1,436 @@
+# distributed.py
+import argparse
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .cache import ResponseCache
+from .concurrency import Call, ExecutionEngine, ResultCallback
+from .judging import ScoringProtocol
+from .metrics import NULL_METRICS, Metrics
+from .models import LLM, LLMEvaluationHelper
+
+logger = logging.getLogger(__name__)
+
+Address = Tuple[str, int]
+
+
+class WorkUnit:
+    """
+    Picklable description of one backend call: a generation, one judge prompt scoring a
+    group of responses, or a pairwise comparison. Workers rebuild the model from its spec
+    and run the unit near it.
+    """
+    def __init__(self, kind: str, model: Dict[str, Any], payload: Tuple[Any, ...]) -> None:
+        """
+        :param kind: 'generate', 'judge' or 'compare'.
+        :param model: Model spec with 'name', 'model_name', 'backend', 'params' and optional 'cache' (path, replay).
+        :param payload: (prompt, sample) for generations, (prompt, responses, protocol) for judgements,
+            (prompt, response_a, response_b) for pairwise comparisons.
+        """
+        self.kind: str = kind
+        self.model: Dict[str, Any] = model
+        self.payload: Tuple[Any, ...] = payload
+
+    @staticmethod
+    def model_spec(llm: LLM) -> Dict[str, Any]:
+        """:return: What a worker needs to rebuild an LLM; file-backed caches are shared by path."""
+        cache = llm.cache
+        return {
+            'name': llm.name,
+            'model_name': llm.model_name,
+            'backend': llm.backend,
+            'params': llm.params,
+            'cache': (cache.path, cache.replay) if cache is not None and cache.path != ':memory:' else None,
+        }
+
+    @classmethod
+    def generate(cls, llm: LLM, prompt: str, sample: int) -> 'WorkUnit':
+        return cls('generate', cls.model_spec(llm), (prompt, sample))
+
+    @classmethod
+    def judge(cls, llm: LLM, prompt: str, responses: List[str], protocol: Optional[ScoringProtocol]) -> 'WorkUnit':
+        return cls('judge', cls.model_spec(llm), (prompt, responses, protocol))
+
+    @classmethod
+    def compare(cls, llm: LLM, prompt: str, response_a: str, response_b: str) -> 'WorkUnit':
+        return cls('compare', cls.model_spec(llm), (prompt, response_a, response_b))
+
+    def run(self, llm: LLM) -> Any:
+        if self.kind == 'generate':
+            return llm.perform_task(*self.payload)
+        if self.kind == 'compare':
+            return LLMEvaluationHelper.compare(llm, *self.payload)
+        return LLMEvaluationHelper.evaluate_batch(llm, *self.payload)
+
+    def failure(self) -> Any:
+        """:return: The result of this unit when it could not be run, matching a failed local call."""
+        return [None] * len(self.payload[1]) if self.kind == 'judge' else None
+
+
+def _build_llm(model: Dict[str, Any]) -> LLM:
+    cache = ResponseCache(model['cache'][0], replay=model['cache'][1]) if model.get('cache') else None
+    return LLM(model['name'], model['model_name'], model['backend'], params=model['params'], cache=cache)
+
+
+def serve(tasks: Any, results: Any, concurrency: int = 4) -> None:
+    """
+    Worker loop: take (unit id, WorkUnit) messages from ``tasks``, run them and put
+    (unit id, result) on ``results`` until a None sentinel arrives. Each model is built
+    once and reused, so its client and connections stay warm.
+    :param tasks: Queue of work messages for this shard.
+    :param results: Queue shared with the coordinator.
+    :param concurrency: Number of units run at once.
+    """
+    llms: Dict[str, LLM] = {}
+    lock = threading.Lock()
+
+    def model(spec: Dict[str, Any]) -> LLM:
+        with lock:
+            if spec['name'] not in llms:
+                llms[spec['name']] = _build_llm(spec)
+            return llms[spec['name']]
+
+    def loop() -> None:
+        while True:
+            try:
+                message = tasks.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                # Leave the sentinel for the other threads
+                tasks.put(None)
+                return
+            unit_id, unit = message
+            try:
+                result = unit.run(model(unit.model))
+            except Exception as e:
+                logger.exception(f"Error running {unit.kind} unit for {unit.model.get('name')}: {e}")
+                result = unit.failure()
+            try:
+                results.put((unit_id, result))
+            except (EOFError, OSError):
+                return
+
+    threads = [threading.Thread(target=loop, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for llm in llms.values():
+        if llm.cache is not None:
+            llm.cache.close()
+
+
+def _manager_class() -> type:
+    return type('ClusterManager', (BaseManager,), {})
+
+
+def run_worker(address: Address, authkey: Union[str, bytes], shard: str, concurrency: int = 4) -> None:
+    """
+    Serve one shard of a coordinator from another host, until the coordinator shuts down.
+    :param address: (host, port) the coordinator listens on.
+    :param authkey: The coordinator's authentication key.
+    :param shard: Name of the shard to serve, as in the coordinator's 'hosts' config.
+    :param concurrency: Number of units run at once.
+    """
+    manager_class = _manager_class()
+    manager_class.register('tasks')
+    manager_class.register('results')
+    manager = manager_class(address=tuple(address), authkey=_authkey(authkey))
+    manager.connect()
+    logger.info(f"Serving shard '{shard}' of {address[0]}:{address[1]}")
+    serve(manager.tasks(shard), manager.results(), concurrency)
+
+
+def _authkey(authkey: Union[str, bytes]) -> bytes:
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+class Coordinator:
+    """
+    Partitions work units across worker shards and collects their results. Every model is
+    pinned to one shard, so a model's calls always run on the same worker. Local shards are
+    worker processes; remote shards are served by ``run_worker`` on other hosts, connecting
+    through a socket broker. If a local worker dies, its models and outstanding units move to
+    the remaining local workers.
+    """
+    def __init__(
+        self,
+        workers: int = 2,
+        hosts: Optional[Dict[str, List[str]]] = None,
+        address: Optional[Address] = None,
+        authkey: Optional[Union[str, bytes]] = None,
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+        start_method: Optional[str] = None,
+        metrics: Optional[Metrics] = None
+    ) -> None:
+        """
+        :param workers: Number of local worker processes.
+        :param hosts: Optional dict mapping remote shard name to the model names it serves.
+        :param address: (host, port) to accept remote workers on (port 0 picks a free port); required with hosts.
+        :param authkey: Key remote workers authenticate with. The broker exchanges pickles, so anyone
+            holding the key can run code here; without one, a random key is generated and exposed
+            as ``authkey`` next to ``address``.
+        :param concurrency: Units each local worker runs at once.
+        :param timeout: Seconds to wait without any result before failing the outstanding units (None waits forever).
+        :param start_method: multiprocessing start method for local workers (default: the platform's).
+            With 'spawn' or 'forkserver', custom backends must be registered on import or via entry points.
+        :param metrics: Optional Metrics counting units and failures per shard.
+        :raises ValueError: If input is invalid.
+        """
+        hosts = dict(hosts or {})
+        if not isinstance(workers, int) or workers < 0:
+            raise ValueError("workers must be a non-negative integer.")
+        if not workers and not hosts:
+            raise ValueError("A cluster needs local workers or remote hosts.")
+        if hosts and address is None:
+            raise ValueError("address is required for remote hosts.")
+        if authkey is not None and not authkey:
+            raise ValueError("authkey must not be empty.")
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError("concurrency must be a positive integer.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive.")
+        self.local_shards: List[str] = [f'local-{index}' for index in range(workers)]
+        self.hosts: Dict[str, List[str]] = hosts
+        self.concurrency: int = concurrency
+        self.timeout: Optional[float] = timeout
+        self.metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+        self.address: Optional[Address] = None
+        # Remote workers pass this key to run_worker; None without an address
+        self.authkey: Optional[Union[str, bytes]] = None
+        if address is not None:
+            self.authkey = authkey if authkey is not None else secrets.token_hex(32)
+        self._context = multiprocessing.get_context(start_method)
+        self._tasks: Dict[str, Any] = {shard: self._context.Queue() for shard in self.local_shards + list(hosts)}
+        self._results: Any = self._context.Queue()
+        self._affinity: Dict[str, str] = {name: shard for shard, names in hosts.items() for name in names}
+        self._next_local = itertools.cycle(range(workers)) if workers else None
+        self._ids = itertools.count()
+        self._stats: Dict[str, Dict[str, int]] = {shard: {'units': 0, 'failed': 0} for shard in self._tasks}
+        self._processes: Dict[str, Any] = {}
+        self._server: Any = None
+        self.closed: bool = False
+        # Start processes before the broker thread, so forked workers inherit no threads
+        for shard in self.local_shards:
+            process = self._context.Process(
+                target=serve, args=(self._tasks[shard], self._results, concurrency), name=shard, daemon=True
+            )
+            process.start()
+            self._processes[shard] = process
+        if address is not None:
+            self._serve_remote(address, self.authkey)
+
+    def _serve_remote(self, address: Address, authkey: Union[str, bytes]) -> None:
+        tasks, results = self._tasks, self._results
+        manager_class = _manager_class()
+        manager_class.register('tasks', callable=lambda shard: tasks[shard])
+        manager_class.register('results', callable=lambda: results)
+        self._server = manager_class(address=tuple(address), authkey=_authkey(authkey)).get_server()
+        self.address = self._server.address
+        threading.Thread(target=self._run_broker, name='autorank-broker', daemon=True).start()
+        logger.info(f"Accepting remote workers on {self.address[0]}:{self.address[1]}")
+
+    def _run_broker(self) -> None:
+        try:
+            self._server.serve_forever()
+        except SystemExit:
+            # serve_forever exits through sys.exit once close() sets its stop event
+            pass
+
+    def shard_for(self, name: str) -> str:
+        """:return: The shard running a model's calls, pinning unseen models to local shards in turn."""
+        shard = self._affinity.get(name)
+        if shard is None:
+            if self._next_local is None:
+                raise ValueError(f"Model '{name}' is not served by any host and there are no local workers.")
+            shard = self._affinity[name] = self.local_shards[next(self._next_local)]
+        return shard
+
+    def _submit(self, unit_id: int, unit: WorkUnit) -> str:
+        shard = self.shard_for(unit.model['name'])
+        self._tasks[shard].put((unit_id, unit))
+        self._stats[shard]['units'] += 1
+        if self.metrics.enabled:
+            self.metrics.inc('autorank_distributed_units_total', shard=shard, kind=unit.kind)
+        return shard
+
+    def _fail(self, shard: str, unit: WorkUnit) -> Any:
+        self._stats[shard]['failed'] += 1
+        if self.metrics.enabled:
+            self.metrics.inc('autorank_distributed_failures_total', shard=shard, kind=unit.kind)
+        return unit.failure()
+
+    def _reassign(self, dead: str) -> bool:
+        """Move a dead local shard's models to the live local shards. :return: False if none are left."""
+        live = [shard for shard in self.local_shards if shard != dead and self._processes[shard].is_alive()]
+        logger.error(f"Worker {dead} died; {len(live)} local workers left")
+        self.local_shards = [shard for shard in self.local_shards if shard != dead]
+        self._next_local = itertools.cycle(range(len(self.local_shards))) if self.local_shards else None
+        for name, shard in list(self._affinity.items()):
+            if shard == dead:
+                del self._affinity[name]
+        return bool(live)
+
+    def run(self, units: List[WorkUnit], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        """
+        Run units on their shards and wait for all results.
+        :param units: Units to run.
+        :param on_result: Optional callable (unit index, result) invoked as each result arrives;
+            failed or lost units are reported once all others are in.
+        :return: One result per unit, in order; failed or lost units yield their failure value.
+        :raises RuntimeError: If the coordinator is closed.
+        """
+        if self.closed:
+            raise RuntimeError("The coordinator is closed.")
+        results: List[Any] = [None] * len(units)
+        pending: Dict[int, Tuple[int, str]] = {}
+        for index, unit in enumerate(units):
+            unit_id = next(self._ids)
+            pending[unit_id] = (index, self._submit(unit_id, unit))
+        last_result = time.monotonic()
+        reported: set = set()
+        while pending:
+            try:
+                unit_id, result = self._results.get(timeout=0.5)
+            except queue.Empty:
+                self._recover(units, results, pending)
+                if pending and self.timeout is not None and time.monotonic() - last_result > self.timeout:
+                    logger.error(f"No worker result for {self.timeout}s; failing {len(pending)} units")
+                    for index, shard in pending.values():
+                        results[index] = self._fail(shard, units[index])
+                    pending.clear()
+                continue
+            last_result = time.monotonic()
+            # Results of units already failed or resubmitted elsewhere are ignored
+            entry = pending.pop(unit_id, None)
+            if entry is not None:
+                results[entry[0]] = result
+                reported.add(entry[0])
+                if on_result is not None:
+                    on_result(entry[0], result)
+        if on_result is not None:
+            for index in range(len(units)):
+                if index not in reported:
+                    on_result(index, results[index])
+        return results
+
+    def _recover(self, units: List[WorkUnit], results: List[Any], pending: Dict[int, Tuple[int, str]]) -> None:
+        """Resubmit the pending units of dead local workers, or fail them if no local worker is left."""
+        dead = {shard for _, shard in pending.values() if shard in self._processes and not self._processes[shard].is_alive()}
+        for shard in dead:
+            survivors = self._reassign(shard)
+            for unit_id, (index, unit_shard) in list(pending.items()):
+                if unit_shard != shard:
+                    continue
+                del pending[unit_id]
+                if not survivors:
+                    results[index] = self._fail(shard, units[index])
+                    continue
+                new_id = next(self._ids)
+                pending[new_id] = (index, self._submit(new_id, units[index]))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """:return: Per-shard models, units sent and units failed."""
+        return {
+            shard: {
+                'models': sorted(name for name, pinned in self._affinity.items() if pinned == shard),
+                'alive': self._processes[shard].is_alive() if shard in self._processes else None,
+                **counts
+            }
+            for shard, counts in self._stats.items()
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the workers and the broker. Remote workers exit once their connection closes."""
+        if self.closed:
+            return
+        self.closed = True
+        for task_queue in self._tasks.values():
+            task_queue.put(None)
+        for process in self._processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._server is not None:
+            self._server.stop_event.set()
+
+
+class DistributedEngine:
+    """
+    Drop-in replacement for ExecutionEngine that sends calls carrying a WorkUnit to a
+    Coordinator and runs any others on a local engine.
+    """
+    def __init__(self, coordinator: Coordinator, local: ExecutionEngine) -> None:
+        self.coordinator: Coordinator = coordinator
+        self.local: ExecutionEngine = local
+        self.mode: str = local.mode
+        self.metrics: Metrics = local.metrics
+        # Batched backend calls are a local optimisation; shipped units run one by one
+        self.max_batch_size: int = 1
+
+    def check_loop(self) -> None:
+        """:raises RuntimeError: If the local engine cannot run from the current thread."""
+        self.local.check_loop()
+
+    def map(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        """
+        Run all calls and return their results in submission order, reporting each to ``on_result`` as it completes.
+        Remote units are submitted straight away and local calls run in a helper thread meanwhile.
+        """
+        remote = [index for index, call in enumerate(calls) if call.unit is not None]
+        if not remote:
+            return self.local.map(calls, on_result)
+        results: List[Any] = [None] * len(calls)
+        local = [index for index, call in enumerate(calls) if call.unit is None]
+        # Local and remote results arrive on different threads; callers expect one at a time
+        lock = threading.Lock()
+
+        def report(indices: List[int]) -> Optional[ResultCallback]:
+            if on_result is None:
+                return None
+
+            def forward(position: int, result: Any) -> None:
+                with lock:
+                    on_result(indices[position], result)
+            return forward
+
+        units = [calls[index].unit for index in remote]
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='autorank-local') as pool:
+            pending = pool.submit(self.local.map, [calls[index] for index in local], report(local)) if local else None
+            for index, result in zip(remote, self.coordinator.run(units, report(remote))):
+                results[index] = result
+            if pending is not None:
+                for index, result in zip(local, pending.result()):
+                    results[index] = result
+        return results
+
+    async def amap(self, calls: List[Call], on_result: Optional[ResultCallback] = None) -> List[Any]:
+        """Async variant of map; waits for the workers in a thread."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.map, calls, on_result)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a shard of a distributed autorank-llm evaluation.")
+    parser.add_argument('--address', required=True, help="Coordinator address as host:port")
+    parser.add_argument('--authkey', required=True, help="Coordinator authentication key")
+    parser.add_argument('--shard', required=True, help="Name of the shard to serve")
+    parser.add_argument('--concurrency', type=int, default=4, help="Units run at once")
+    args = parser.parse_args(argv)
+    host, _, port = args.address.rpartition(':')
+    logging.basicConfig(level=logging.INFO)
+    run_worker((host, int(port)), args.authkey, args.shard, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
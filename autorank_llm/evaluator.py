@@ -1,47 +1,238 @@
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
+from .budget import TokenBudget
+from .cache import ResponseCache
+from .checkpoint import Checkpoint
+from .concurrency import BatchSpec, Call, ExecutionEngine, ModelAffinity
+from .distributed import Coordinator, DistributedEngine, WorkUnit
+from .metrics import NULL_METRICS, Metrics
+from .judging import ScoringProtocol
 from .models import LLM, LLMEvaluationHelper
-from .utils import normalize_skill_levels, rank_llms
+from .policy import CallPolicy
+from .pool import ClientPool
+from .scheduling import PairingScheduler
+from .scoring import AGGREGATORS, ScoreMatrix, aggregate
+from .sinks import LogSink, MemorySink, response_hash
+from .stopping import EarlyStopping
+from .tasks import Task, TaskSuite
+from .tournament import SwissTournament
+from .utils import rank_llms
 
 # Set up a specific logger for this module
 logger = logging.getLogger(__name__)
 
 
+def _generate_batch(llm: LLM, items: List[Tuple[str, int]]) -> List[Optional[str]]:
+    """Run (prompt, sample) generation items through one backend batch call."""
+    return llm.perform_batch([prompt for prompt, _ in items], [sample for _, sample in items])
+
+
+async def _agenerate_batch(llm: LLM, items: List[Tuple[str, int]]) -> List[Optional[str]]:
+    return await llm.aperform_batch([prompt for prompt, _ in items], [sample for _, sample in items])
+
+
+def _run_plugin(plugin: Any, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """Call a plugin's ``run`` method, or the plugin itself; module-level so process pools can pickle it."""
+    if hasattr(plugin, 'run'):
+        return plugin.run(*args, **kwargs)
+    return plugin(*args, **kwargs)
+
+
+def _same(first: Any, second: Any) -> bool:
+    try:
+        return bool(first == second)
+    except Exception:
+        # e.g. numpy arrays, whose comparison has no single truth value
+        return False
+
+
 class PluginManager:
     """
-    Manages plugins for custom evaluation tasks or metrics.
+    Manages plugins for custom evaluation tasks or metrics. Plugins run one after another
+    or concurrently on a thread or process pool, each under a timeout; a plugin that fails
+    or times out yields None. When run with a state version, each result is memoized until
+    the version or the arguments change, so polling an unchanged evaluation re-runs nothing.
+    Plugins with a true ``incremental`` attribute receive, as the ``entries`` keyword
+    argument, only the explainability entries logged since their last successful run.
     """
-    def __init__(self) -> None:
+    EXECUTORS = ('serial', 'thread', 'process')
+
+    def __init__(self, executor: str = 'serial', max_workers: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        """
+        :param executor: How plugins run: 'serial', 'thread' or 'process' (plugins and their
+            arguments must then be picklable, and incremental plugins are not allowed).
+        :param max_workers: Pool size (default: the executor's default).
+        :param timeout: Seconds each plugin may take from the start of a run, unless the plugin sets
+            its own ``timeout`` attribute. A timed-out plugin is abandoned, not interrupted; the
+            'serial' executor cannot enforce timeouts.
+        :raises ValueError: If input is invalid.
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"executor must be one of {self.EXECUTORS}.")
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+            raise ValueError("max_workers must be a positive integer.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive.")
+        self.executor: str = executor
+        self.max_workers: Optional[int] = max_workers
+        self.timeout: Optional[float] = timeout
         self.plugins: List[Any] = []
+        self.stats: Dict[str, int] = {'runs': 0, 'memo_hits': 0, 'failures': 0, 'timeouts': 0}
+        # Per plugin index: (state version, args, kwargs, result) of the last successful run
+        self._memo: Dict[int, Tuple[int, tuple, Dict[str, Any], Any]] = {}
+        # Per incremental plugin index: number of log entries already delivered
+        self._positions: Dict[int, int] = {}
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._lock = threading.Lock()
 
     def register(self, plugin: Any) -> None:
+        """
+        :param plugin: Object with a ``run`` method, or a callable.
+        :raises ValueError: If an incremental plugin is registered with the 'process' executor.
+        """
+        if self.executor == 'process' and getattr(plugin, 'incremental', False):
+            raise ValueError("Incremental plugins keep state between runs and cannot use the 'process' executor.")
         self.plugins.append(plugin)
 
-    def run(self, *args, **kwargs) -> List[Any]:
-        results = []
-        for plugin in self.plugins:
-            if hasattr(plugin, 'run'):
-                results.append(plugin.run(*args, **kwargs))
-            else:
-                results.append(plugin(*args, **kwargs))
-        return results
+    def run(
+        self,
+        *args: Any,
+        state_version: Optional[int] = None,
+        log: Optional['EvaluationLogger'] = None,
+        **kwargs: Any
+    ) -> List[Any]:
+        """
+        Run every plugin, reusing memoized results where the state has not changed.
+        :param args: Positional arguments for every plugin.
+        :param state_version: Version of the evaluation state (None to run every plugin).
+        :param log: EvaluationLogger whose new entries are passed to incremental plugins.
+        :param kwargs: Keyword arguments for every plugin.
+        :return: One result per plugin, in registration order; None for plugins that failed or timed out.
+        """
+        with self._lock:
+            results: List[Any] = [None] * len(self.plugins)
+            pending = []
+            for index, plugin in enumerate(self.plugins):
+                memo = self._memo.get(index)
+                if (state_version is not None and memo is not None and memo[0] == state_version
+                        and _same(memo[1], args) and _same(memo[2], kwargs)):
+                    results[index] = memo[3]
+                    self.stats['memo_hits'] += 1
+                    continue
+                call_kwargs, position = kwargs, None
+                if getattr(plugin, 'incremental', False):
+                    entries, position = log.entries_since(self._positions.get(index, 0)) if log is not None else ([], 0)
+                    call_kwargs = {**kwargs, 'entries': entries}
+                pending.append((index, plugin, call_kwargs, position))
+            for (index, plugin, _, position), (ok, value) in zip(pending, self._execute(pending, args)):
+                self.stats['runs'] += 1
+                if not ok:
+                    continue
+                results[index] = value
+                if position is not None:
+                    self._positions[index] = position
+                if state_version is not None:
+                    self._memo[index] = (state_version, args, kwargs, value)
+            return results
+
+    def _execute(self, pending: List[Tuple[int, Any, Dict[str, Any], Optional[int]]], args: tuple) -> List[Tuple[bool, Any]]:
+        """:return: One (succeeded, result) pair per pending plugin."""
+        if self.executor == 'serial':
+            outcomes = []
+            for _, plugin, kwargs, _ in pending:
+                try:
+                    outcomes.append((True, _run_plugin(plugin, args, kwargs)))
+                except Exception as e:
+                    outcomes.append(self._failed(plugin, e))
+            return outcomes
+        if self._pool is None:
+            pool_class = concurrent.futures.ThreadPoolExecutor if self.executor == 'thread' else (
+                concurrent.futures.ProcessPoolExecutor)
+            self._pool = pool_class(max_workers=self.max_workers)
+        started = time.monotonic()
+        futures = [self._pool.submit(_run_plugin, plugin, args, kwargs) for _, plugin, kwargs, _ in pending]
+        outcomes = []
+        for (_, plugin, _, _), future in zip(pending, futures):
+            timeout = getattr(plugin, 'timeout', self.timeout)
+            remaining = None if timeout is None else max(0.0, started + timeout - time.monotonic())
+            try:
+                outcomes.append((True, future.result(remaining)))
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                self.stats['timeouts'] += 1
+                logger.warning(f"Plugin {type(plugin).__name__} timed out after {timeout}s")
+                outcomes.append((False, None))
+            except Exception as e:
+                outcomes.append(self._failed(plugin, e))
+        return outcomes
+
+    def _failed(self, plugin: Any, error: Exception) -> Tuple[bool, Any]:
+        self.stats['failures'] += 1
+        logger.exception(f"Plugin {type(plugin).__name__} failed: {error}")
+        return False, None
+
+    def close(self) -> None:
+        """Shut down the pool without waiting for abandoned plugins."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
 
 
 class EvaluationLogger:
     """
     Handles explainability, fairness, and robustness logs.
     """
-    def __init__(self) -> None:
-        self.explainability_log: List[Dict[str, Any]] = []
+    def __init__(self, sink: Optional[LogSink] = None, max_recent: int = 1000) -> None:
+        """
+        :param sink: Where explainability entries go (default: unbounded MemorySink).
+        :param max_recent: Number of most recent entries returned in results and dashboard data.
+        :raises ValueError: If max_recent is not positive.
+        """
+        if not isinstance(max_recent, int) or max_recent < 1:
+            raise ValueError("max_recent must be a positive integer.")
+        self.sink: LogSink = sink if sink is not None else MemorySink()
+        self.max_recent: int = max_recent
         self.fairness_log: List[Any] = []
         self.robustness_log: List[Any] = []
+        # Entries written through this logger, so readers can ask for the ones they have not seen
+        self.entries_written: int = 0
+
+    @property
+    def explainability_log(self) -> List[Dict[str, Any]]:
+        """The ``max_recent`` most recent explainability entries, oldest first; iterate ``sink`` for all of them."""
+        return list(collections.deque(self.sink, maxlen=self.max_recent))
 
     def log_explainability(self, entry: Dict[str, Any]) -> None:
-        self.explainability_log.append(entry)
+        self.sink.write(entry)
+        self.entries_written += 1
+
+    def entries_since(self, position: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        :param position: Number of entries already seen, as returned by an earlier call (0 at first).
+        :return: Tuple of (entries logged since then, oldest first, and the new position). Entries a
+            bounded sink has already dropped, or that were in the sink before this logger, are skipped.
+        """
+        written = self.entries_written
+        first = written - len(self.sink)
+        if position < first:
+            logger.warning(f"{first - position} explainability entries were dropped before they were read")
+        start = max(position, first)
+        skip = start - first
+        return list(itertools.islice(iter(self.sink), skip, skip + written - start)), written
 
     def get_logs(self) -> Dict[str, Any]:
         return {
             'explainability_log': self.explainability_log,
+            'explainability_count': len(self.sink),
             'fairness_log': self.fairness_log,
             'robustness_log': self.robustness_log
         }
@@ -51,12 +242,73 @@ class LLMEvaluator:
     """
     Orchestrates the evaluation and ranking of LLMs.
     """
-    def __init__(self, model_configs: List[Dict[str, Any]], task: str, threshold: float = 0.5, debug: bool = False) -> None:
+    def __init__(
+        self,
+        model_configs: List[Dict[str, Any]],
+        task: Union[str, List[str], TaskSuite],
+        threshold: float = 0.5,
+        debug: bool = False,
+        num_samples: int = 1,
+        execution_mode: str = 'serial',
+        max_concurrency: Optional[int] = None,
+        backend_limits: Optional[Dict[str, int]] = None,
+        cache: Optional[ResponseCache] = None,
+        task_chunk_size: int = 16,
+        judge_batch_size: int = 1,
+        rounds: int = 1,
+        aggregator: str = 'weighted',
+        max_iterations: int = 1000,
+        pairing: Optional[PairingScheduler] = None,
+        log_sink: Optional[LogSink] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        client_pool: Optional[ClientPool] = None,
+        call_policies: Optional[Dict[str, CallPolicy]] = None,
+        metrics: Optional[Metrics] = None,
+        backend_batch_size: int = 1,
+        early_stopping: Optional[EarlyStopping] = None,
+        scoring_protocol: Optional[ScoringProtocol] = None,
+        tournament: Optional[SwissTournament] = None,
+        model_affinity: Optional[ModelAffinity] = None,
+        token_budget: Optional[TokenBudget] = None,
+        plugin_manager: Optional[PluginManager] = None
+    ) -> None:
         """
-        :param model_configs: List of dicts, each with 'name', 'model_name', and 'backend'.
-        :param task: The task to be performed by the LLMs.
+        :param model_configs: List of dicts, each with 'name', 'model_name', and 'backend',
+            plus optional sampling 'params'.
+        :param task: The task to be performed by the LLMs: a prompt string, a list of prompts, or a TaskSuite.
         :param threshold: The convergence threshold for the evaluation process.
-        :param debug: Flag to run in debug mode.
+        :param debug: Flag to run in debug mode (a single convergence iteration).
+        :param num_samples: Number of responses generated per model in each round.
+        :param execution_mode: How backend calls are issued: 'serial', 'thread' or 'async'.
+        :param max_concurrency: Global limit on backend calls in flight.
+        :param backend_limits: Optional per-backend limits on calls in flight, keyed by backend name.
+        :param cache: Optional ResponseCache for generations and judgements.
+        :param task_chunk_size: Number of suite tasks streamed and scheduled together.
+        :param judge_batch_size: Number of peer responses a judge scores in one prompt (1 for one prompt per pair).
+        :param rounds: Number of generation and judging sweeps whose scores are pooled before convergence.
+        :param aggregator: How skills are computed from the scores: 'weighted', 'pagerank' or 'bradley_terry'.
+        :param max_iterations: Upper bound on in-memory convergence iterations.
+        :param pairing: Optional PairingScheduler assigning a subset of judges to each candidate (default: all pairs).
+        :param log_sink: Optional LogSink for explainability entries (default: unbounded in-memory).
+        :param checkpoint: Optional Checkpoint recording completed calls; calls already in it are not re-issued.
+        :param client_pool: Optional ClientPool for backend clients and HTTP sessions (default: the process-wide pool).
+        :param call_policies: Optional CallPolicy per backend name (rate limits, retries, timeouts, circuit breaking).
+        :param metrics: Optional Metrics collecting call latency, queue wait, tokens and phase timings (default: disabled).
+        :param backend_batch_size: Maximum prompts sent to one model in a single backend ``batch`` call,
+            for backends that provide one (default 1: every prompt is sent on its own; set e.g. 8 to enable batching).
+        :param early_stopping: Optional EarlyStopping that stops judging candidates whose ranking is
+            settled and ends the run once the (top-k) ordering is settled.
+        :param scoring_protocol: Optional ScoringProtocol setting how judges are asked for a score and how
+            their answers are parsed (default: a final 'Score: N' line).
+        :param tournament: Optional SwissTournament: rank with pairwise comparisons by neutral judges in
+            O(N log N) calls per task instead of scoring every response. ``rounds`` and ``judge_batch_size``
+            do not apply; it cannot be combined with pairing, early_stopping or checkpoint.
+        :param model_affinity: Optional ModelAffinity running each model's pending calls back to back,
+            so hosts that keep few models loaded (e.g. Ollama) swap models less often.
+        :param token_budget: Optional TokenBudget capping generations and the responses shown to judges,
+            counting tokens and cost per model, and stopping the run once its hard limit is spent.
+        :param plugin_manager: Optional PluginManager running the registered plugins, e.g. concurrently with
+            timeouts (default: one after another).
         :raises ValueError: If input is invalid.
         """
         if not isinstance(model_configs, list) or not model_configs:
@@ -64,99 +316,880 @@ class LLMEvaluator:
         for cfg in model_configs:
             if not isinstance(cfg, dict) or 'name' not in cfg or 'model_name' not in cfg:
                 raise ValueError("Each model config must be a dict with 'name' and 'model_name'.")
-        if not task or not isinstance(task, str):
-            raise ValueError("task must be a non-empty string.")
+        if isinstance(task, TaskSuite):
+            suite = task
+        elif isinstance(task, list):
+            suite = TaskSuite.from_list(task)
+        elif task and isinstance(task, str):
+            suite = TaskSuite.from_list([task])
+        else:
+            raise ValueError("task must be a non-empty string, a list of prompts, or a TaskSuite.")
+        if not isinstance(num_samples, int) or num_samples < 1:
+            raise ValueError("num_samples must be a positive integer.")
+        if not isinstance(task_chunk_size, int) or task_chunk_size < 1:
+            raise ValueError("task_chunk_size must be a positive integer.")
+        if not isinstance(judge_batch_size, int) or judge_batch_size < 1:
+            raise ValueError("judge_batch_size must be a positive integer.")
+        if not isinstance(rounds, int) or rounds < 1:
+            raise ValueError("rounds must be a positive integer.")
+        if aggregator not in AGGREGATORS:
+            raise ValueError(f"aggregator must be one of {AGGREGATORS}.")
+        if not isinstance(max_iterations, int) or max_iterations < 1:
+            raise ValueError("max_iterations must be a positive integer.")
+        if not isinstance(backend_batch_size, int) or backend_batch_size < 1:
+            raise ValueError("backend_batch_size must be a positive integer.")
+        if tournament is not None:
+            if pairing is not None or early_stopping is not None or checkpoint is not None:
+                raise ValueError("tournament cannot be combined with pairing, early_stopping or checkpoint.")
+            if len(model_configs) < 3:
+                raise ValueError("tournament needs at least three models.")
         self.model_configs: List[Dict[str, Any]] = model_configs
-        self.task: str = task
+        self.task: Union[str, List[str], TaskSuite] = task
+        self.suite: TaskSuite = suite
+        self.task_chunk_size: int = task_chunk_size
+        self.judge_batch_size: int = judge_batch_size
+        self.rounds: int = rounds
+        self.aggregator: str = aggregator
+        self.max_iterations: int = max_iterations
+        self.pairing: Optional[PairingScheduler] = pairing
         self.threshold: float = threshold
         self.debug: bool = debug
-        self.llms: List[LLM] = [LLM(cfg['name'], cfg['model_name'], cfg.get('backend', 'ollama')) for cfg in model_configs]
-        self.logger: EvaluationLogger = EvaluationLogger()
-        self.plugin_manager: PluginManager = PluginManager()
+        self.num_samples: int = num_samples
+        self.cache: Optional[ResponseCache] = cache
+        self.client_pool: Optional[ClientPool] = client_pool
+        self.call_policies: Dict[str, CallPolicy] = dict(call_policies or {})
+        self.failures: Dict[str, int] = {'generations': 0, 'judgements': 0}
+        self.metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+        self.token_budget: Optional[TokenBudget] = token_budget
+        self.llms: List[LLM] = [self._build_llm(cfg) for cfg in model_configs]
+        self.scores: ScoreMatrix = ScoreMatrix([llm.name for llm in self.llms])
+        # Responses of completed rounds, kept so models added later can be judged against them
+        self.responses: Dict[int, Dict[str, Dict[str, List[str]]]] = {}
+        self.logger: EvaluationLogger = EvaluationLogger(log_sink)
+        self.plugin_manager: PluginManager = plugin_manager if plugin_manager is not None else PluginManager()
+        # Bumped whenever scores, skills or logs change; plugin results are memoized against it
+        self.state_version: int = 0
+        self.engine: Union[ExecutionEngine, DistributedEngine] = ExecutionEngine(
+            execution_mode, max_concurrency, backend_limits, self.metrics, backend_batch_size, model_affinity,
+            client_pool
+        )
+        self.model_affinity: Optional[ModelAffinity] = model_affinity
+        self.options: Dict[str, Any] = {
+            'threshold': threshold,
+            'debug': debug,
+            'num_samples': num_samples,
+            'execution_mode': execution_mode,
+            'max_concurrency': max_concurrency,
+            'backend_limits': backend_limits,
+            'task_chunk_size': task_chunk_size,
+            'judge_batch_size': judge_batch_size,
+            'rounds': rounds,
+            'aggregator': aggregator,
+            'max_iterations': max_iterations,
+            'backend_batch_size': backend_batch_size,
+        }
+        self.early_stopping: Optional[EarlyStopping] = early_stopping
+        self.scoring_protocol: Optional[ScoringProtocol] = scoring_protocol
+        self.coordinator: Optional[Coordinator] = None
+        self.tournament: Optional[SwissTournament] = tournament
+        self._tournament_deltas: List[float] = []
+        self.checkpoint: Optional[Checkpoint] = checkpoint
+        if checkpoint is not None:
+            self._open_checkpoint(checkpoint)
 
-    def evaluate_llms(self) -> Dict[str, Any]:
+    def _build_llm(self, cfg: Dict[str, Any]) -> LLM:
+        return LLM(
+            cfg['name'], cfg['model_name'], cfg.get('backend', 'ollama'),
+            params=cfg.get('params'), cache=self.cache, pool=self.client_pool,
+            policy=self.call_policies.get(cfg.get('backend', 'ollama')), metrics=self.metrics,
+            budget=self.token_budget
+        )
+
+    def _model_identity(self) -> List[List[str]]:
+        return [[cfg['name'], cfg['model_name'], cfg.get('backend', 'ollama')] for cfg in self.model_configs]
+
+    def _open_checkpoint(self, checkpoint: Checkpoint) -> None:
+        identity = self._model_identity()
+        stored = checkpoint.get('models')
+        if stored is not None and stored != identity:
+            raise ValueError(f"Checkpoint '{checkpoint.path}' was written for different models.")
+        if stored is not None and checkpoint.get('options', {}).get('num_samples') != self.num_samples:
+            raise ValueError(f"Checkpoint '{checkpoint.path}' was written with a different num_samples.")
+        try:
+            task = self.task if isinstance(self.task, (str, list)) else None
+            checkpoint.set(
+                models=identity,
+                model_configs=json.loads(json.dumps(self.model_configs)),
+                options=self.options,
+                task=task
+            )
+        except TypeError:
+            raise ValueError("model_configs and task must be JSON-serializable to be checkpointed.")
+        skills = checkpoint.get('skills')
+        if skills:
+            # Start from the last converged skills so a resumed run converges to the same point
+            for llm in self.llms:
+                llm.skill_level = skills.get(llm.name, llm.skill_level)
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        path: str,
+        model_configs: Optional[List[Dict[str, Any]]] = None,
+        task: Optional[Union[str, List[str], TaskSuite]] = None,
+        **kwargs: Any
+    ) -> 'LLMEvaluator':
+        """
+        Rebuild an evaluator from a checkpoint written by an earlier run.
+        :param path: Checkpoint path.
+        :param model_configs: Model configs (default: the ones stored in the checkpoint).
+        :param task: Task or suite (default: the prompts stored in the checkpoint; required for TaskSuite runs).
+        :param kwargs: Other LLMEvaluator arguments; stored options are used for any not given.
+        :return: LLMEvaluator bound to the checkpoint.
+        :raises ValueError: If the checkpoint is empty or lacks the task.
+        """
+        checkpoint = Checkpoint(path)
+        model_configs = model_configs or checkpoint.get('model_configs')
+        task = task or checkpoint.get('task')
+        if not model_configs:
+            raise ValueError(f"Checkpoint '{path}' has no model configs.")
+        if not task:
+            raise ValueError(f"Checkpoint '{path}' does not store its task suite; pass task explicitly.")
+        options = {**(checkpoint.get('options') or {}), **kwargs}
+        return cls(model_configs, task, checkpoint=checkpoint, **options)
+
+    @classmethod
+    def resume(cls, path: str, **kwargs: Any) -> Dict[str, Any]:
         """
-        Evaluate and rank the LLMs based on their performance on the specified task.
-        :return: Dictionary with rankings and logs.
+        Continue an interrupted run: only generations and judgements missing from the checkpoint
+        are issued, and everything recorded is reused.
+        :param path: Checkpoint path.
+        :param kwargs: Arguments for from_checkpoint.
+        :return: The evaluate_llms results.
         """
-        converged = False
-        iteration = 0
+        return cls.from_checkpoint(path, **kwargs).evaluate_llms()
 
-        while not converged:
-            iteration += 1
-            max_change = 0.0
+    def _generation_calls(
+        self,
+        tasks: List[Task],
+        round_number: int = 1,
+        llms: Optional[List[LLM]] = None
+    ) -> Tuple[List[Tuple[Task, LLM, int]], List[Call], List[Tuple[Tuple[Task, LLM, int], str]]]:
+        """
+        :param llms: Models to generate with (default: all).
+        :return: Tuple of (keys, calls) for the generations still to run, aligned by index,
+            and the (key, response) pairs restored from the checkpoint.
+        """
+        done = self.checkpoint.generations(round_number, [task.task_id for task in tasks]) if self.checkpoint else {}
+        keys, calls, restored = [], [], []
+        for task in tasks:
+            for llm in llms or self.llms:
+                for sample in range(self.num_samples):
+                    stored = done.get((task.task_id, llm.name, sample))
+                    if stored is not None:
+                        restored.append(((task, llm, sample), stored))
+                        continue
+                    keys.append((task, llm, sample))
+                    calls.append(Call(
+                        llm.backend,
+                        partial(llm.perform_task, task.prompt, sample),
+                        partial(llm.aperform_task, task.prompt, sample) if llm.supports_async else None,
+                        {'model': llm.name, 'role': 'generate'},
+                        self._batch_spec(llm, 'generate', (task.prompt, sample)),
+                        WorkUnit.generate(llm, task.prompt, sample) if self.coordinator is not None else None
+                    ))
+        return keys, calls, restored
 
-            try:
-                for evaluator in self.llms:
-                    for evaluatee in self.llms:
-                        if evaluator != evaluatee:
-                            task_response = evaluatee.perform_task(self.task)
-                            if task_response:
-                                score = LLMEvaluationHelper.evaluate(evaluator, self.task, task_response)
-                                weighted_score = score * evaluator.skill_level
-                                evaluatee.evaluations.append(weighted_score)
-                                # Explainability hook
-                                self.logger.log_explainability({
-                                    'iteration': iteration,
-                                    'evaluator': evaluator.name,
-                                    'evaluatee': evaluatee.name,
-                                    'task': self.task,
-                                    'response': task_response,
-                                    'score': score,
-                                    'weighted_score': weighted_score
-                                })
-                                # Fairness/robustness hooks (placeholder)
-                                # self.logger.fairness_log.append(...)
-                                # self.logger.robustness_log.append(...)
-
-                # Normalize skill levels
-                normalize_skill_levels(self.llms)
-
-                # Check for convergence
-                changes = [LLMEvaluationHelper.update_skill_level(llm) for llm in self.llms]
-                max_change = max(changes)
-                converged = max_change < self.threshold or self.debug
-
-                if self.debug:
-                    logger.info(f"Debug mode: Completed iteration {iteration}")
-                    break
+    @staticmethod
+    def _collect_responses(
+        tasks: List[Task],
+        llms: List[LLM],
+        samples: List[Tuple[Tuple[Task, LLM, int], Optional[str]]]
+    ) -> Dict[str, Dict[str, List[str]]]:
+        responses: Dict[str, Dict[str, List[str]]] = {task.task_id: {llm.name: [] for llm in llms} for task in tasks}
+        for (task, llm, _), response in sorted(samples, key=lambda item: item[0][2]):
+            if response:
+                responses[task.task_id][llm.name].append(response)
+        return responses
+
+    def _judgement_calls(
+        self,
+        tasks: List[Task],
+        responses: Dict[str, Dict[str, List[str]]],
+        round_number: int = 1,
+        involving: Optional[LLM] = None
+    ) -> Tuple[List[List[Dict[str, Any]]], List[Call], List[Dict[str, Any]]]:
+        """
+        Build the judge calls for a set of tasks. Each call scores a group of up to
+        ``judge_batch_size`` responses from one judge on one task and returns a list of scores.
+        :param involving: Only build the pairs where this model is the judge or the candidate.
+        :return: Tuple of (judgement groups, calls), aligned by index, and the judgements
+            restored from the checkpoint with their scores already set.
+        """
+        groups: List[List[Dict[str, Any]]] = []
+        restored: List[Dict[str, Any]] = []
+        names = [llm.name for llm in self.llms]
+        done = self.checkpoint.judgements(round_number, [task.task_id for task in tasks]) if self.checkpoint else {}
+        for task in tasks:
+            pairs = self._pairs(task, names, round_number) if involving is None else None
+            for evaluator in self.llms:
+                items = [
+                    {'task': task, 'evaluator': evaluator, 'evaluatee': evaluatee, 'response': task_response}
+                    for evaluatee in self.llms if evaluator != evaluatee
+                    if pairs is None or (evaluator.name, evaluatee.name) in pairs
+                    if involving is None or involving in (evaluator, evaluatee)
+                    for task_response in responses[task.task_id].get(evaluatee.name, [])
+                ]
+                if done:
+                    pending = []
+                    for item in items:
+                        key = (task.task_id, evaluator.name, item['evaluatee'].name, response_hash(item['response']))
+                        if key in done:
+                            item['score'] = done[key]
+                            restored.append(item)
+                        else:
+                            pending.append(item)
+                    items = pending
+                for start in range(0, len(items), self.judge_batch_size):
+                    groups.append(items[start:start + self.judge_batch_size])
+        calls = []
+        for group in groups:
+            evaluator, prompt = group[0]['evaluator'], group[0]['task'].prompt
+            batch = [self._judge_input(item['response']) for item in group]
+            calls.append(Call(
+                evaluator.backend,
+                partial(LLMEvaluationHelper.evaluate_batch, evaluator, prompt, batch, self.scoring_protocol),
+                partial(LLMEvaluationHelper.aevaluate_batch, evaluator, prompt, batch, self.scoring_protocol)
+                if evaluator.supports_async else None,
+                {'model': evaluator.name, 'role': 'judge'},
+                self._batch_spec(evaluator, 'judge', (prompt, batch)),
+                WorkUnit.judge(evaluator, prompt, batch, self.scoring_protocol) if self.coordinator is not None else None
+            ))
+        return groups, calls, restored
+
+    def _judge_input(self, response: str) -> str:
+        """:return: A response as shown to judges: cut to the token budget's judge cap, if any."""
+        if self.token_budget is None:
+            return response
+        return self.token_budget.truncate(response, self.token_budget.judge_limit, 'judge_inputs')
+
+    def _batch_spec(self, llm: LLM, role: str, item: Tuple[str, Any]) -> Optional[BatchSpec]:
+        """
+        :return: How the engine may merge this call into a backend ``batch`` call, or None
+            when batching is off or the model's backend has no ``batch`` method.
+        """
+        if self.engine.max_batch_size == 1 or not llm.supports_batch:
+            return None
+        if role == 'judge':
+            return BatchSpec(
+                (llm.name, role), item,
+                partial(LLMEvaluationHelper.evaluate_many, llm, protocol=self.scoring_protocol),
+                partial(LLMEvaluationHelper.aevaluate_many, llm, protocol=self.scoring_protocol)
+                if llm.supports_async_batch else None
+            )
+        return BatchSpec(
+            (llm.name, role), item, partial(_generate_batch, llm),
+            partial(_agenerate_batch, llm) if llm.supports_async_batch else None
+        )
 
+    def _pairs(self, task: Task, names: List[str], round_number: int) -> Optional[set]:
+        """
+        :return: The (judge, candidate) pairs to score for a task, or None for all pairs.
+            With early stopping, settled candidates are left out. Assignments are
+            checkpointed so a resumed run judges the same pairs.
+        """
+        stopping = self.early_stopping
+        if self.pairing is None and (stopping is None or stopping.active is None):
+            return None
+        if self.checkpoint is not None:
+            stored = self.checkpoint.assignment(round_number, task.task_id)
+            if stored is not None:
+                return set(stored)
+        if self.pairing is None:
+            assignment = {candidate: [judge for judge in names if judge != candidate] for candidate in names}
+        else:
+            assignment = self.pairing.assign(names, self.scores)
+        pairs = sorted(
+            (judge, candidate)
+            for candidate, judges in assignment.items()
+            if stopping is None or stopping.is_active(candidate)
+            for judge in judges
+        )
+        if stopping is not None:
+            dropped = sum(len(judges) for judges in assignment.values()) - len(pairs)
+            stopping.skipped['judgements'] += dropped * self.num_samples
+        if self.checkpoint is not None:
+            self.checkpoint.record(round_number, assignments=[(task.task_id, pairs)])
+        return set(pairs)
+
+    def _record(
+        self,
+        round_number: int,
+        keys: List[Tuple[Task, LLM, int]],
+        samples: List[Optional[str]],
+        judged: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Count one batch's failed generations and append its completed calls to the checkpoint.
+        Failed calls are not recorded, so a resumed run retries them.
+        """
+        self.failures['generations'] += sum(1 for response in samples if not response)
+        if self.checkpoint is None:
+            return
+        self.checkpoint.record(
+            round_number,
+            generations=[
+                (task.task_id, llm.name, sample, response)
+                for (task, llm, sample), response in zip(keys, samples) if response
+            ],
+            judgements=[
+                (item['task'].task_id, item['evaluator'].name, item['evaluatee'].name,
+                 response_hash(item['response']), item['score'])
+                for item in judged
+            ]
+        )
+
+    def _assign_scores(
+        self,
+        groups: List[List[Dict[str, Any]]],
+        results: List[List[Optional[float]]]
+    ) -> List[Dict[str, Any]]:
+        """Attach scores to their judgements. Failed judgements (None) are counted and left unscored."""
+        judged = []
+        for group, scores in zip(groups, results):
+            for item, score in zip(group, scores):
+                if score is None:
+                    self.failures['judgements'] += 1
+                    continue
+                item['score'] = score
+                judged.append(item)
+        return judged
+
+    def generate_responses(self, tasks: List[Task], round_number: int = 1) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Generation phase: collect ``num_samples`` responses from every LLM for every task.
+        Failed generations are dropped, so a model may end up with fewer samples.
+        :param tasks: Tasks to generate responses for.
+        :param round_number: Round the generations belong to, for checkpointing.
+        :return: Dict mapping task id to a dict mapping LLM name to its list of responses.
+        """
+        keys, calls, restored = self._generation_calls(tasks, round_number)
+        samples = self.engine.map(calls)
+        self._record(round_number, keys, samples, [])
+        return self._collect_responses(tasks, self.llms, restored + list(zip(keys, samples)))
+
+    def judge_responses(
+        self,
+        tasks: List[Task],
+        responses: Dict[str, Dict[str, List[str]]],
+        round_number: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Judging phase: every LLM scores every response of every other LLM, in batches
+        of ``judge_batch_size`` responses per judge prompt.
+        :param tasks: Tasks the responses belong to.
+        :param responses: Output of generate_responses.
+        :param round_number: Round the judgements belong to, for checkpointing.
+        :return: List of dicts with 'task', 'evaluator', 'evaluatee', 'response' and 'score'; failed judgements are left out.
+        """
+        groups, calls, restored = self._judgement_calls(tasks, responses, round_number)
+        judged = self._assign_scores(groups, self.engine.map(calls))
+        self._record(round_number, [], [], judged)
+        return restored + judged
+
+    def _run_round(self, round_number: int = 1) -> List[Dict[str, Any]]:
+        """
+        Run generation and judging over the whole suite. Tasks are streamed in chunks and
+        each chunk's judging is submitted together with the next chunk's generation, so the
+        execution engine always has work for every model. With a checkpoint, each batch of
+        completed calls is recorded as soon as it returns. Scores are added to the score
+        matrix as they arrive, so early stopping can skip settled candidates in later
+        chunks and end the round once the ranking is settled; the round also ends once the
+        token budget is spent.
+        :param round_number: Round being run.
+        :return: List of scored judgements.
+        """
+        judged: List[Dict[str, Any]] = []
+        pending: Optional[Tuple[List[Task], Dict[str, Dict[str, List[str]]]]] = None
+        for chunk in self.suite.chunks(self.task_chunk_size):
+            keys, generation_calls, restored = self._generation_calls(chunk, round_number, self._candidates(chunk))
+            groups, judgement_calls, rejudged = (
+                self._judgement_calls(*pending, round_number) if pending else ([], [], [])
+            )
+            results = self.engine.map(generation_calls + judgement_calls)
+            samples = results[:len(generation_calls)]
+            scored = self._assign_scores(groups, results[len(generation_calls):])
+            self._record(round_number, keys, samples, scored)
+            self._add_scores(rejudged + scored)
+            judged.extend(rejudged + scored)
+            pending = (chunk, self._collect_responses(chunk, self.llms, restored + list(zip(keys, samples))))
+            self.responses.setdefault(round_number, {}).update(pending[1])
+            if self._settled() or self._out_of_budget():
+                return judged
+        if pending:
+            final = self.judge_responses(*pending, round_number)
+            self._add_scores(final)
+            judged.extend(final)
+            self._settled()
+        return judged
+
+    def _run_tournament(self) -> List[Dict[str, Any]]:
+        """
+        Generate one set of responses over the suite, then play Swiss rounds: every pair is
+        compared on every task by neutral judges, and each verdict updates the ratings as
+        soon as its call completes, so the next round is paired on ratings that already
+        include every verdict. Every verdict is also stored as two scores (winner 9, loser 1,
+        tie 5) so the per-task breakdown and logs read as in scoring mode.
+        :return: Judgement entries, two per verdict.
+        """
+        tournament = self.tournament
+        tournament.reset([llm.name for llm in self.llms])
+        self._tournament_deltas = []
+        tasks: List[Task] = []
+        responses: Dict[str, Dict[str, List[str]]] = {}
+        for chunk in self.suite.chunks(self.task_chunk_size):
+            tasks.extend(chunk)
+            responses.update(self.generate_responses(chunk))
+            if self._out_of_budget():
+                break
+        self.responses[1] = responses
+        by_name = {llm.name: llm for llm in self.llms}
+        judged: List[Dict[str, Any]] = []
+        for swiss_round in range(tournament.num_rounds()):
+            if self._out_of_budget():
+                break
+            before = tournament.skills()
+            pairs, bye = tournament.pairings()
+            if bye is not None:
+                logger.debug("Swiss round %d: %s sits out", swiss_round + 1, bye)
+            matches, calls = self._comparison_calls(tasks, responses, pairs, swiss_round, by_name)
+            verdicts: List[Dict[str, Any]] = []
+
+            def apply(index: int, outcome: Optional[float]) -> None:
+                match = matches[index]
+                if outcome is None:
+                    self.failures['judgements'] += 1
+                    return
+                if match['swapped']:
+                    outcome = 1.0 - outcome
+                tournament.update(match['a'].name, match['b'].name, outcome)
+                verdicts.extend(self._verdict_entries(match, outcome))
+
+            self.engine.map(calls, on_result=apply)
+            tournament.rounds_played += 1
+            self._add_scores(verdicts)
+            judged.extend(verdicts)
+            self._tournament_deltas.append(float(np.abs(tournament.skills() - before).max()))
+        return judged
+
+    def _comparison_calls(
+        self,
+        tasks: List[Task],
+        responses: Dict[str, Dict[str, List[str]]],
+        pairs: List[Tuple[str, str]],
+        swiss_round: int,
+        by_name: Dict[str, LLM]
+    ) -> Tuple[List[Dict[str, Any]], List[Call]]:
+        """
+        Build one Swiss round's comparison calls. The sample compared rotates with the round,
+        and the order the two responses are shown in alternates, so neither position is favoured.
+        :return: Tuple of (matches, calls), aligned by index.
+        """
+        matches, calls = [], []
+        for a, b in pairs:
+            for task in tasks:
+                first, second = responses[task.task_id].get(a, []), responses[task.task_id].get(b, [])
+                if not first or not second:
+                    continue
+                for judge_name in self.tournament.judges(a, b):
+                    judge = by_name[judge_name]
+                    match = {
+                        'task': task, 'evaluator': judge, 'a': by_name[a], 'b': by_name[b],
+                        'response_a': first[swiss_round % len(first)],
+                        'response_b': second[swiss_round % len(second)],
+                        'swapped': len(matches) % 2 == 1,
+                    }
+                    shown = tuple(self._judge_input(response) for response in (
+                        (match['response_b'], match['response_a']) if match['swapped'] else
+                        (match['response_a'], match['response_b'])
+                    ))
+                    matches.append(match)
+                    calls.append(Call(
+                        judge.backend,
+                        partial(LLMEvaluationHelper.compare, judge, task.prompt, *shown),
+                        partial(LLMEvaluationHelper.acompare, judge, task.prompt, *shown) if judge.supports_async else None,
+                        {'model': judge.name, 'role': 'compare'},
+                        unit=WorkUnit.compare(judge, task.prompt, *shown) if self.coordinator is not None else None
+                    ))
+        return matches, calls
+
+    @staticmethod
+    def _verdict_entries(match: Dict[str, Any], outcome: float) -> List[Dict[str, Any]]:
+        """:return: A verdict as one judgement entry per side, scored 1 (lost) to 9 (won)."""
+        return [
+            {'task': match['task'], 'evaluator': match['evaluator'], 'evaluatee': match['a'],
+             'response': match['response_a'], 'score': 1.0 + 8.0 * outcome},
+            {'task': match['task'], 'evaluator': match['evaluator'], 'evaluatee': match['b'],
+             'response': match['response_b'], 'score': 1.0 + 8.0 * (1.0 - outcome)},
+        ]
+
+    def _candidates(self, tasks: List[Task]) -> Optional[List[LLM]]:
+        """:return: The models still to generate with under early stopping, or None for all."""
+        if self.early_stopping is None or self.early_stopping.active is None:
+            return None
+        active = [llm for llm in self.llms if self.early_stopping.is_active(llm.name)]
+        self.early_stopping.skipped['generations'] += (len(self.llms) - len(active)) * len(tasks) * self.num_samples
+        return active
+
+    def _out_of_budget(self) -> bool:
+        """:return: True once the token budget's hard limit is spent, marking the run as stopped."""
+        if self.token_budget is None or not self.token_budget.exhausted:
+            return False
+        if not self.token_budget.stopped:
+            logger.warning("Token budget spent; ranking on the scores collected so far")
+            self.token_budget.stopped = True
+        return True
+
+    def _settled(self) -> bool:
+        """Update early stopping from the scores so far; :return: True once the run can stop."""
+        if self.early_stopping is None:
+            return False
+        stopped = self.early_stopping.update(self.scores, self.aggregator, sparse=self.pairing is not None)
+        if self.metrics.enabled:
+            self.metrics.set('autorank_undecided_candidates', len(self.early_stopping.active or ()))
+        return stopped
+
+    def converge(self) -> Dict[str, Any]:
+        """
+        Recompute skill levels from the stored scores, without any model calls.
+        :return: Dict with 'iterations', 'convergence_deltas' and 'converged'.
+        """
+        if self.tournament is not None:
+            return self._tournament_convergence()
+        max_iterations = 1 if self.debug else self.max_iterations
+        skill_levels = {llm.name: llm.skill_level for llm in self.llms}
+        skills, deltas = aggregate(
+            self.scores,
+            self.aggregator,
+            skills=np.array([skill_levels[name] for name in self.scores.names]),
+            threshold=self.threshold,
+            max_iterations=max_iterations,
+            sparse=self.pairing is not None
+        )
+        for llm in self.llms:
+            llm.skill_level = float(skills[self.scores.index[llm.name]])
+        if self.debug:
+            logger.info(f"Debug mode: Completed iteration {len(deltas)}")
+        return {
+            'iterations': len(deltas),
+            'convergence_deltas': deltas,
+            'converged': bool(deltas) and deltas[-1] < self.threshold
+        }
+
+    def _tournament_convergence(self) -> Dict[str, Any]:
+        """Take skills from the tournament ratings; each Swiss round counts as one iteration."""
+        skills = self.tournament.skills()
+        for llm in self.llms:
+            llm.skill_level = float(skills[self.tournament.index[llm.name]])
+        deltas = list(self._tournament_deltas)
+        return {
+            'iterations': len(deltas),
+            'convergence_deltas': deltas,
+            'converged': bool(deltas) and deltas[-1] < self.threshold
+        }
+
+    def evaluate_llms(self) -> Dict[str, Any]:
+        """
+        Evaluate and rank the LLMs based on their performance on the specified tasks.
+        Responses are generated and judged ``rounds`` times; skill levels then converge
+        in memory over the collected scores. In tournament mode responses are generated
+        once and ranked by Swiss rounds of pairwise comparisons instead.
+        :return: Dictionary with rankings, per-task score breakdown, failed call counts, convergence details and logs.
+            With a model_affinity, 'model_affinity' holds the model loads and swaps so far; with a
+            token_budget, 'token_budget' holds the run's tokens, cost and whether it stopped early.
+        :raises RuntimeError: With execution_mode='async', if called from a running event loop; use aevaluate_llms.
+        """
+        self.engine.check_loop()
+        self.scores = ScoreMatrix([llm.name for llm in self.llms])
+        self.responses = {}
+        self.failures = {'generations': 0, 'judgements': 0}
+        if self.early_stopping is not None:
+            self.early_stopping.reset()
+        if self.token_budget is not None:
+            self.token_budget.reset()
+        if self.tournament is not None:
+            return self._finish([(1, item) for item in self._run_tournament()])
+        judged: List[Tuple[int, Dict[str, Any]]] = []
+        for round_number in range(1, self.rounds + 1):
+            started = time.perf_counter()
+            try:
+                judgements = self._run_round(round_number)
             except Exception as e:
                 logger.exception("An error occurred during the evaluation process: %s", e)
                 break
+            elapsed = time.perf_counter() - started
+            self.metrics.set('autorank_round_seconds', elapsed, round=round_number)
+            self.metrics.observe('autorank_phase_seconds', elapsed, phase='round')
+            judged.extend((round_number, item) for item in judgements)
+            if self.checkpoint is not None:
+                self.checkpoint.set(completed_rounds=round_number)
+            if self.early_stopping is not None and self.early_stopping.stopped:
+                logger.info(f"Ranking settled after round {round_number}; stopping early")
+                break
+            if self._out_of_budget():
+                break
+        return self._finish(judged)
+
+    async def aevaluate_llms(self) -> Dict[str, Any]:
+        """
+        Awaitable evaluate_llms for callers already running an event loop, such as Jupyter
+        notebooks. The evaluation runs on a worker thread, where the execution engine is free
+        to start its own event loops, so the caller's loop is not blocked.
+        :return: Results dict as returned by evaluate_llms.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.evaluate_llms)
+
+    def _add_scores(self, judgements: List[Dict[str, Any]]) -> None:
+        if judgements:
+            self.state_version += 1
+        self.scores.add_many(
+            [item['evaluator'].name for item in judgements],
+            [item['evaluatee'].name for item in judgements],
+            [item['task'].task_id for item in judgements],
+            [item['score'] for item in judgements]
+        )
+
+    def _finish(self, judged: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Converge, log the new judgements and rank."""
+        if self.cache is not None:
+            self.cache.flush()
+        with self.metrics.timer('autorank_phase_seconds', phase='converge'):
+            convergence = self.converge()
+        self.metrics.set('autorank_convergence_iterations', convergence['iterations'])
+        if self.checkpoint is not None:
+            self.checkpoint.set(
+                skills={llm.name: llm.skill_level for llm in self.llms},
+                convergence={key: convergence[key] for key in ('iterations', 'converged')}
+            )
+
+        with self.metrics.timer('autorank_phase_seconds', phase='log'):
+            for round_number, judgement in judged:
+                task, evaluator, evaluatee = judgement['task'], judgement['evaluator'], judgement['evaluatee']
+                # Explainability hook
+                self.logger.log_explainability({
+                    'iteration': round_number,
+                    'evaluator': evaluator.name,
+                    'evaluatee': evaluatee.name,
+                    'task_id': task.task_id,
+                    'task': task.prompt,
+                    'response': judgement['response'],
+                    'score': judgement['score'],
+                    'weighted_score': judgement['score'] * evaluator.skill_level
+                })
+                # Fairness/robustness hooks (placeholder)
+                # self.logger.fairness_log.append(...)
+                # self.logger.robustness_log.append(...)
 
         # Rank the LLMs based on their final skill levels
         rank_llms(self.llms)
+        self.state_version += 1
         # Optionally return explainability/fairness/robustness logs
         logs = self.logger.get_logs()
         return {
             'rankings': self.llms,
+            'task_breakdown': self.scores.task_breakdown(),
+            'failures': dict(self.failures),
+            'early_stopping': self.early_stopping.summary() if self.early_stopping is not None else None,
+            'tournament': self.tournament.summary() if self.tournament is not None else None,
+            'model_affinity': self.model_affinity.stats() if self.model_affinity is not None else None,
+            'token_budget': self.token_budget.summary() if self.token_budget is not None else None,
+            **convergence,
             **logs
         }
 
+    def add_model(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add a model to an evaluated pool. Only the new model's generations and the judgements
+        involving it (new judge × stored responses, stored judges × new responses) are computed,
+        for every completed round; skill levels then re-converge over all stored scores. The calls
+        count against the token budget of the last run.
+        With a pairing scheduler the new model still meets every other model, which is O(N) calls per task.
+        :param config: Model config dict with 'name', 'model_name' and 'backend'.
+        :return: Results dict as returned by evaluate_llms.
+        :raises ValueError: If the config is invalid, the name is taken or the evaluator runs a tournament.
+        :raises RuntimeError: With execution_mode='async', if called from a running event loop.
+        """
+        self.engine.check_loop()
+        if not isinstance(config, dict) or 'name' not in config or 'model_name' not in config:
+            raise ValueError("Model config must be a dict with 'name' and 'model_name'.")
+        if config['name'] in self.scores.index:
+            raise ValueError(f"Model '{config['name']}' is already in the pool.")
+        if self.tournament is not None:
+            raise ValueError("add_model is not supported in tournament mode; run evaluate_llms again.")
+        llm = self._build_llm(config)
+        self.model_configs = self.model_configs + [config]
+        self.llms.append(llm)
+        self.scores.add_model(llm.name)
+        self._checkpoint_models()
+        judged: List[Tuple[int, Dict[str, Any]]] = []
+        for round_number in sorted(self.responses):
+            try:
+                judgements = self._extend_round(round_number, llm)
+            except Exception as e:
+                logger.exception("An error occurred while adding model %s: %s", llm.name, e)
+                break
+            self._add_scores(judgements)
+            judged.extend((round_number, item) for item in judgements)
+        return self._finish(judged)
+
+    def _extend_round(self, round_number: int, llm: LLM) -> List[Dict[str, Any]]:
+        """Generate with one model over the suite and run every judgement involving it."""
+        stored = self.responses[round_number]
+        judged: List[Dict[str, Any]] = []
+        for chunk in self.suite.chunks(self.task_chunk_size):
+            keys, calls, restored = self._generation_calls(chunk, round_number, [llm])
+            samples = self.engine.map(calls)
+            self._record(round_number, keys, samples, [])
+            fresh = self._collect_responses(chunk, [llm], restored + list(zip(keys, samples)))
+            for task in chunk:
+                stored.setdefault(task.task_id, {}).update(fresh[task.task_id])
+            groups, calls, rejudged = self._judgement_calls(
+                chunk, {task.task_id: stored[task.task_id] for task in chunk}, round_number, involving=llm
+            )
+            scored = self._assign_scores(groups, self.engine.map(calls))
+            self._record(round_number, [], [], scored)
+            judged.extend(rejudged + scored)
+            if self._out_of_budget():
+                break
+        return judged
+
+    def retire_model(self, name: str) -> Dict[str, Any]:
+        """
+        Remove a model and every score it gave or received, then re-converge without any model calls.
+        :param name: Name of the model to remove.
+        :return: Results dict as returned by evaluate_llms.
+        :raises ValueError: If the model is unknown or is the last one.
+        """
+        if name not in self.scores.index:
+            raise ValueError(f"Model '{name}' is not in the pool.")
+        self.scores.remove_model(name)
+        if self.tournament is not None:
+            self.tournament.remove(name)
+        self.llms = [llm for llm in self.llms if llm.name != name]
+        self.model_configs = [cfg for cfg in self.model_configs if cfg['name'] != name]
+        for by_task in self.responses.values():
+            for by_model in by_task.values():
+                by_model.pop(name, None)
+        self._checkpoint_models()
+        return self._finish([])
+
+    def _checkpoint_models(self) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.set(models=self._model_identity(), model_configs=self.model_configs)
+
+    @property
+    def log_sink(self) -> LogSink:
+        """The sink holding every explainability entry; results carry only the most recent ones."""
+        return self.logger.sink
+
     def register_plugin(self, plugin: Any) -> None:
         self.plugin_manager.register(plugin)
 
     def run_plugins(self, *args, **kwargs) -> List[Any]:
-        return self.plugin_manager.run(*args, **kwargs)
+        """
+        Run the registered plugins. Results are reused until new scores arrive or the arguments change,
+        and incremental plugins receive the explainability entries logged since their last run.
+        :return: One result per plugin; None for plugins that failed or timed out.
+        """
+        return self.plugin_manager.run(*args, state_version=self.state_version, log=self.logger, **kwargs)
 
-    def enable_distributed(self, cluster_config: Optional[Dict[str, Any]] = None) -> None:
+    def enable_distributed(self, cluster_config: Optional[Dict[str, Any]] = None) -> Coordinator:
         """
-        Enable distributed evaluation (future feature).
+        Run generations and judgements on worker processes or hosts. Each call is shipped as a
+        (task, evaluator, evaluatee) work unit to the shard its model is pinned to, and the
+        results are merged into the score matrix here, so aggregation, checkpoints, early
+        stopping and logs work as in a single process. Workers build their own clients; call
+        policies and per-call metrics of this evaluator do not apply to their calls, and only
+        a file-backed cache is shared with them. A token budget still caps the responses shown to
+        judges, but worker calls are neither capped nor counted against it.
+
+        With an 'address', the coordinator accepts remote workers over a socket that exchanges
+        pickles: anyone who can reach it and knows the authkey can run code in this process.
+        Pass a secret 'authkey', or read the random one generated for you from the returned
+        coordinator's ``authkey``, and keep the port off untrusted networks.
 
-        :param cluster_config: Configuration for distributed cluster
-        :raises NotImplementedError: This feature is not yet implemented
+        :param cluster_config: Coordinator arguments: 'workers' (local processes, default 2),
+            'hosts' (remote shard name to model names), 'address' and 'authkey' for remote workers,
+            'concurrency', 'timeout' and 'start_method'.
+        :return: The Coordinator, e.g. for its ``address``, ``authkey`` and ``stats()``.
+        :raises ValueError: If the config is invalid or distribution is already enabled.
         """
-        raise NotImplementedError(
-            "Distributed evaluation is planned for a future release. "
-            "Follow https://github.com/acebot712/autorank-llm for updates."
-        )
+        if self.coordinator is not None:
+            raise ValueError("Distributed evaluation is already enabled.")
+        self.coordinator = Coordinator(**(cluster_config or {}), metrics=self.metrics)
+        self.engine = DistributedEngine(self.coordinator, self.engine)
+        return self.coordinator
+
+    def disable_distributed(self) -> None:
+        """Stop the workers and run calls in this process again."""
+        if self.coordinator is None:
+            return
+        self.coordinator.close()
+        self.coordinator = None
+        self.engine = self.engine.local
+
+    def metrics_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Refresh the gauges derived from the cache, call policies, model affinity, token budget and failure counts,
+        and snapshot every metric.
+        :return: JSON-serializable metrics, or None when metrics are disabled.
+        """
+        if not self.metrics.enabled:
+            return None
+        if self.cache is not None:
+            stats = self.cache.stats()
+            self.metrics.set('autorank_cache_hits', stats['hits'])
+            self.metrics.set('autorank_cache_misses', stats['misses'])
+        for backend, policy in self.call_policies.items():
+            stats = policy.stats()
+            self.metrics.set('autorank_retries', stats['retries'], backend=backend)
+            self.metrics.set('autorank_throttled_seconds', stats['throttled_seconds'], backend=backend)
+        for role, count in self.failures.items():
+            self.metrics.set('autorank_failed_calls', count, role=role)
+        if self.model_affinity is not None:
+            self.metrics.set('autorank_model_loads', self.model_affinity.counts['loads'])
+            self.metrics.set('autorank_model_swaps', self.model_affinity.counts['swaps'])
+        if self.token_budget is not None:
+            for name, usage in self.token_budget.summary()['models'].items():
+                self.metrics.set('autorank_budget_tokens', usage['prompt_tokens'] + usage['completion_tokens'], model=name)
+                self.metrics.set('autorank_budget_cost', usage['cost'], model=name)
+        return self.metrics.to_dict()
+
+    def export_metrics(self, path: str) -> None:
+        """
+        Write the metrics to a file: JSON for '.json' paths, Prometheus text otherwise.
+        :param path: Output path.
+        :raises ValueError: If metrics are disabled.
+        """
+        if not self.metrics.enabled:
+            raise ValueError("Metrics are disabled; pass metrics=Metrics() to LLMEvaluator.")
+        self.metrics_snapshot()
+        self.metrics.write(path)
 
     def get_dashboard_data(self) -> Dict[str, Any]:
         logs = self.logger.get_logs()
         return {
             'rankings': [llm.name for llm in self.llms],
             **logs,
-            'plugin_results': self.run_plugins()
+            'cache_stats': self.cache.stats() if self.cache is not None else None,
+            'client_pool_stats': (self.client_pool or ClientPool.default()).stats(),
+            'call_policy_stats': {backend: policy.stats() for backend, policy in self.call_policies.items()},
+            'metrics': self.metrics_snapshot(),
+            'early_stopping': self.early_stopping.summary() if self.early_stopping is not None else None,
+            'tournament': self.tournament.summary() if self.tournament is not None else None,
+            'model_affinity': self.model_affinity.stats() if self.model_affinity is not None else None,
+            'token_budget': self.token_budget.summary() if self.token_budget is not None else None,
+            'cluster_stats': self.coordinator.stats() if self.coordinator is not None else None,
+            'plugin_results': self.run_plugins(),
+            'plugin_stats': dict(self.plugin_manager.stats)
         }
-
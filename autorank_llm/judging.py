@@ -0,0 +1,226 @@
+# judging.py
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_SCORE = 1.0
+MAX_SCORE = 10.0
+
+_JSON_OBJECT = re.compile(r'\{.*\}', re.S)
+_JSON_ARRAY = re.compile(r'\[[\d\s.,]*\]')
+_SCORE_LINE = re.compile(r'^\W*(?:response\s*)?#?\[?(\d+)\]?\s*[:=)\-]\s*(\d+(?:\.\d+)?)', re.I | re.M)
+# Single-score fast paths: the whole answer is exactly the requested tag or JSON object
+_TAG_EXACT = re.compile(r'\s*\**score\**\s*[:=]\s*\**(\d+(?:\.\d+)?)\**\s*(?:/\s*(?:9|10))?\s*\.?\s*', re.I)
+_JSON_EXACT = re.compile(r'\s*\{\s*"score"\s*:\s*"?(\d+(?:\.\d+)?)"?\s*\}\s*')
+_TAG = re.compile(r'\bscore\b\W{0,3}[:=]\s*\**\s*(\d+(?:\.\d+)?)', re.I)
+# Mentions of the scale itself ("1 to 9", "between 1 and 10", "out of 10", "/10") are not scores
+_SCALE = re.compile(r'\b\d+(?:\.\d+)?\s*(?:-|\u2013|to|and)\s*\d+(?:\.\d+)?\b|(?:\bout\s+of|/)\s*\d+(?:\.\d+)?', re.I)
+_NUMBER = re.compile(r'(?<![\d.])(?:10|[1-9])(?:\.\d+)?(?!\.?\d)')
+_WINNER = re.compile(r'\bwinner\b\W{0,3}\s*(?:response\s*)?\**\s*(A|B|tie)\b', re.I)
+_BARE_VERDICT = re.compile(r'\W*(?:response\s*)?(A|B|tie)\W*', re.I)
+_VERDICTS = {'a': 1.0, 'b': 0.0, 'tie': 0.5}
+
+SCORE_FORMATS = ('tag', 'json', 'plain')
+
+
+def build_batch_prompt(original_task: str, task_responses: List[str]) -> str:
+    """
+    Build a single judge prompt that scores several responses to the same task.
+    :param original_task: The task the responses answer.
+    :param task_responses: Responses to score, numbered from 1 in the prompt.
+    :return: The prompt string.
+    :raises ValueError: If input is invalid.
+    """
+    if not original_task or not isinstance(original_task, str):
+        raise ValueError("original_task must be a non-empty string.")
+    if not task_responses or not all(isinstance(r, str) and r for r in task_responses):
+        raise ValueError("task_responses must be a non-empty list of non-empty strings.")
+    numbered = '\n'.join(f"Response {i}: '{response}'" for i, response in enumerate(task_responses, start=1))
+    return (
+        f"Task: '{original_task}'.\n{numbered}\n"
+        "Rate each response numerically between 1 and 9. "
+        "Answer only with a JSON object mapping each response number to its score, "
+        'for example {"1": 7, "2": 4}.'
+    )
+
+
+def build_pairwise_prompt(original_task: str, response_a: str, response_b: str) -> str:
+    """
+    Build a judge prompt asking which of two responses to the same task is better.
+    :param original_task: The task both responses answer.
+    :param response_a: Response shown first.
+    :param response_b: Response shown second.
+    :return: The prompt string.
+    :raises ValueError: If input is invalid.
+    """
+    if not original_task or not isinstance(original_task, str):
+        raise ValueError("original_task must be a non-empty string.")
+    if not all(isinstance(response, str) and response for response in (response_a, response_b)):
+        raise ValueError("Both responses must be non-empty strings.")
+    return (
+        f"Task: '{original_task}'.\nResponse A: '{response_a}'\nResponse B: '{response_b}'\n"
+        "Which response is better? End your answer with a line of the form "
+        "'Winner: A', 'Winner: B' or 'Winner: tie'."
+    )
+
+
+def parse_pairwise_verdict(response_text: str) -> Optional[float]:
+    """
+    Read the verdict of a pairwise judge answer: the last "Winner: ..." line, or a bare "A", "B" or "tie".
+    :param response_text: Raw judge output.
+    :return: 1.0 if A won, 0.0 if B won, 0.5 for a tie, or None if there is no verdict.
+    """
+    if not isinstance(response_text, str):
+        return None
+    matches = _WINNER.findall(response_text)
+    if matches:
+        return _VERDICTS[matches[-1].lower()]
+    match = _BARE_VERDICT.fullmatch(response_text)
+    return _VERDICTS[match.group(1).lower()] if match else None
+
+
+def _valid(scores: Dict[int, float], count: int) -> Optional[List[float]]:
+    if set(scores) != set(range(1, count + 1)):
+        return None
+    if not all(MIN_SCORE <= score <= MAX_SCORE for score in scores.values()):
+        return None
+    return [scores[i] for i in range(1, count + 1)]
+
+
+def parse_batch_scores(response_text: str, count: int) -> Optional[List[float]]:
+    """
+    Map a batched judge answer back to one score per response.
+    Tries a JSON object or array first, then "N: score" lines.
+    :param response_text: Raw judge output.
+    :param count: Number of responses that were judged.
+    :return: Scores in response order, or None if the answer cannot be mapped unambiguously.
+    """
+    if not isinstance(response_text, str):
+        return None
+    match = _JSON_OBJECT.search(response_text)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            if isinstance(data, dict):
+                scores = _valid({int(key): float(value) for key, value in data.items()}, count)
+                if scores is not None:
+                    return scores
+        except (ValueError, TypeError):
+            pass
+    match = _JSON_ARRAY.search(response_text)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            if len(data) == count:
+                scores = _valid({i: float(value) for i, value in enumerate(data, start=1)}, count)
+                if scores is not None:
+                    return scores
+        except (ValueError, TypeError):
+            pass
+    lines: Dict[int, float] = {}
+    for index, score in _SCORE_LINE.findall(response_text):
+        if int(index) in lines:
+            return None
+        lines[int(index)] = float(score)
+    return _valid(lines, count)
+
+
+def _in_range(value: str) -> Optional[float]:
+    score = float(value)
+    return score if MIN_SCORE <= score <= MAX_SCORE else None
+
+
+def heuristic_score(response_text: str) -> Optional[float]:
+    """
+    Last-resort score extraction from free text: mentions of the scale ("on a 1 to 9 scale",
+    "out of 10") are dropped and the last remaining number between 1 and 10 is taken,
+    since judges usually end with their verdict.
+    :param response_text: Raw judge output.
+    :return: The score, or None if no candidate number is left.
+    """
+    numbers = _NUMBER.findall(_SCALE.sub(' ', response_text))
+    return _in_range(numbers[-1]) if numbers else None
+
+
+class ScoringProtocol:
+    """
+    How judges are asked for a single score and how their answers are parsed.
+    The 'tag' format asks for a final "Score: N" line and 'json' for {"score": N};
+    'plain' keeps the bare rating request. Answers are parsed with precompiled
+    fast paths first (the exact requested form, then the tag or JSON anywhere in the
+    answer) and fall back to heuristic_score. Unparsable answers yield None, never 0.
+    """
+    def __init__(self, score_format: str = 'tag', heuristic: bool = True) -> None:
+        """
+        :param score_format: One of 'tag', 'json' or 'plain'.
+        :param heuristic: Fall back to heuristic_score when no structured score is found.
+        :raises ValueError: If the format is unknown.
+        """
+        if score_format not in SCORE_FORMATS:
+            raise ValueError(f"score_format must be one of {SCORE_FORMATS}.")
+        self.score_format: str = score_format
+        self.heuristic: bool = heuristic
+
+    def prompt(self, original_task: str, task_response: str) -> str:
+        """
+        Build the judge prompt for one response.
+        :raises ValueError: If input is invalid.
+        """
+        if not original_task or not isinstance(original_task, str):
+            raise ValueError("original_task must be a non-empty string.")
+        if not task_response or not isinstance(task_response, str):
+            raise ValueError("task_response must be a non-empty string.")
+        prompt = (
+            f"Task: '{original_task}'. Response: '{task_response}'. "
+            "Rate the response numerically between 1 and 9."
+        )
+        if self.score_format == 'tag':
+            return prompt + " End your answer with a line of the form 'Score: N'."
+        if self.score_format == 'json':
+            return prompt + ' Answer only with a JSON object of the form {"score": N}.'
+        return prompt
+
+    def _json(self, response_text: str) -> Optional[float]:
+        match = _JSON_OBJECT.search(response_text)
+        if not match:
+            return None
+        try:
+            data = json.loads(match.group(0))
+            return _in_range(data['score']) if isinstance(data, dict) and 'score' in data else None
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    def _tag(self, response_text: str) -> Optional[float]:
+        matches = _TAG.findall(response_text)
+        return _in_range(matches[-1]) if matches else None
+
+    def parse(self, response_text: str) -> Tuple[Optional[float], str]:
+        """
+        Extract the score from a judge's answer.
+        :param response_text: Raw judge output.
+        :return: Tuple of (score or None, method), where method is 'json', 'tag', 'heuristic' or 'failed'.
+        """
+        if not isinstance(response_text, str):
+            return None, 'failed'
+        exact, exact_method = (_JSON_EXACT, 'json') if self.score_format == 'json' else (_TAG_EXACT, 'tag')
+        match = exact.fullmatch(response_text)
+        if match:
+            score = _in_range(match.group(1))
+            if score is not None:
+                return score, exact_method
+        # A JSON object is the more specific form; its "score": N would also match the tag pattern
+        for method, parser in (('json', self._json), ('tag', self._tag)):
+            score = parser(response_text)
+            if score is not None:
+                return score, method
+        if self.heuristic:
+            score = heuristic_score(response_text)
+            if score is not None:
+                return score, 'heuristic'
+        return None, 'failed'
+
+
+DEFAULT_PROTOCOL = ScoringProtocol()
@@ -1,75 +1,214 @@
 import re
+import time
 import random
+import asyncio
 import logging
-from typing import Dict, Callable, Optional
-
-# Backend imports (import only if available)
-try:
-    from langchain_community.llms import Ollama
-except ImportError:
-    Ollama = None
-try:
-    from langchain_openai import OpenAI
-except ImportError:
-    OpenAI = None
-try:
-    from langchain_huggingface import HuggingFaceHub
-except ImportError:
-    HuggingFaceHub = None
+import importlib
+from typing import Any, AsyncIterator, Dict, Callable, Iterator, List, Optional, Tuple, Union
+
+from .budget import BudgetExceededError, TokenBudget, truncate_tokens
+from .cache import CacheMissError, ResponseCache
+from .judging import (
+    DEFAULT_PROTOCOL, ScoringProtocol, build_batch_prompt, build_pairwise_prompt, parse_batch_scores, parse_pairwise_verdict
+)
+from .metrics import NULL_METRICS, Metrics
+from .policy import CallPolicy, estimate_tokens
+from .pool import ClientPool
 
 logger = logging.getLogger(__name__)
 
+ENTRY_POINT_GROUP = 'autorank_llm.backends'
+
+_LEGACY_NUMBER = re.compile(r'\b(?:[1-9](?:\.\d+)?|10)\b')
+
+
+def _log_call_error(where: str, name: str, error: Exception) -> None:
+    """Log a failed call; calls skipped by an exhausted TokenBudget are expected and get no traceback."""
+    if isinstance(error, BudgetExceededError):
+        logger.debug(f"Skipped {where} for {name}: {error}")
+    else:
+        logger.exception(f"Error in {where} for {name}: {error}")
+
+
+def _import_object(path: str) -> Any:
+    """Import ``'package.module:attribute'`` and return the attribute."""
+    module_name, _, attribute = path.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f"Backend path '{path}' must look like 'package.module:ClassName'.")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _entry_point(name: str) -> Optional[Any]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return None
+    found = entry_points()
+    if hasattr(found, 'select'):
+        matches = found.select(group=ENTRY_POINT_GROUP, name=name)
+    else:
+        matches = [ep for ep in found.get(ENTRY_POINT_GROUP, []) if ep.name == name]
+    return next(iter(matches), None)
+
 
 class ModelRegistry:
     """
     Registry for model backends, allowing model-agnostic LLM support.
+    Backends may be registered as classes or as ``'package.module:ClassName'`` strings,
+    which are only imported on first use. Names not registered here are looked up in
+    the ``autorank_llm.backends`` entry point group.
+
+    A backend is constructed as ``backend_class(model_name, **params)`` and must be callable
+    as ``backend(prompt) -> str``. It may also provide any of these optional methods, which
+    the evaluator detects and prefers when present:
+
+    - ``async ainvoke(prompt) -> str``: native async call, used in 'async' execution mode.
+    - ``batch(prompts) -> list``: one response per prompt, in order, submitted together;
+      an entry may be an exception instance for a prompt that failed on its own.
+    - ``async abatch(prompts) -> list``: async variant of ``batch``.
+    - ``stream(prompt) -> Iterator[str]`` / ``astream(prompt) -> AsyncIterator[str]``:
+      yield the response in chunks.
     """
-    _registry: Dict[str, Callable] = {}
+    _registry: Dict[str, Union[Callable, str]] = {}
 
     @classmethod
-    def register(cls, backend_name: str, backend_class: Callable) -> None:
-        """Register a backend class under a given name."""
+    def register(cls, backend_name: str, backend_class: Union[Callable, str]) -> None:
+        """Register a backend class, or an import path to one, under a given name."""
         cls._registry[backend_name] = backend_class
 
+    @classmethod
+    def is_registered(cls, backend_name: str) -> bool:
+        """Check whether a backend name can be resolved, without importing it."""
+        return backend_name in cls._registry or _entry_point(backend_name) is not None
+
     @classmethod
     def get_backend(cls, backend_name: str) -> Callable:
-        """Retrieve a backend class by name."""
+        """Retrieve a backend class by name, importing it if it was registered lazily."""
         if backend_name not in cls._registry:
-            raise ValueError(f"Backend '{backend_name}' is not registered.")
-        return cls._registry[backend_name]
+            entry_point = _entry_point(backend_name)
+            if entry_point is None:
+                raise ValueError(f"Backend '{backend_name}' is not registered.")
+            cls._registry[backend_name] = entry_point.load()
+        backend = cls._registry[backend_name]
+        if isinstance(backend, str):
+            backend = _import_object(backend)
+            cls._registry[backend_name] = backend
+        return backend
 
 
-class OllamaBackend:
-    """Wrapper for the Ollama backend."""
-    def __init__(self, model_name: str) -> None:
-        if Ollama is None:
-            raise ImportError("Ollama backend not available.")
-        self.llm = Ollama(model=model_name)
+class LangChainBackend:
+    """
+    Base wrapper for LangChain LLM clients. The LangChain package is imported and the
+    client constructed on first use, so creating a backend costs nothing. Clients come
+    from a ClientPool, so backends with the same model and params share one client, and
+    clients that accept an HTTP session share keep-alive connections per endpoint. Async
+    sessions only work on the event loop they were opened on, so clients that take one are
+    built once per loop for async calls.
+    """
+    client_path: str = ''
+    model_arg: str = 'model'
+    display_name: str = 'LangChain'
+    pool_name: str = 'langchain'
+    endpoint_arg: str = 'base_url'
+    # Constructor arguments taking shared (sync, async) HTTP sessions, if the client supports them
+    session_args: Tuple[str, ...] = ()
+    # Constructor argument capping the tokens of a generation, if the client has one
+    max_tokens_arg: Optional[str] = None
 
-    def __call__(self, prompt: str) -> str:
-        return self.llm(prompt)
+    def __init__(self, model_name: str, pool: Optional[ClientPool] = None, **kwargs: Any) -> None:
+        """
+        :param model_name: Model name passed to the client.
+        :param pool: ClientPool to share clients and sessions through (default: the process-wide pool).
+        :param kwargs: Extra client constructor arguments.
+        """
+        self.model_name: str = model_name
+        self.pool: ClientPool = pool if pool is not None else ClientPool.default()
+        self.kwargs: Dict[str, Any] = kwargs
+        self._llm: Any = None
+        # Set once a client is assigned explicitly; it then serves async calls too
+        self._assigned: bool = False
 
+    def _build_client(self, kwargs: Dict[str, Any], asynchronous: bool = False) -> Any:
+        try:
+            client_class = _import_object(self.client_path)
+        except ImportError as e:
+            raise ImportError(f"{self.display_name} backend not available.") from e
+        endpoint = kwargs.get(self.endpoint_arg)
+        sessions = {}
+        for arg, session_async in zip(self.session_args, (False, True)):
+            if arg not in kwargs and (asynchronous or not session_async):
+                session = self.pool.session(self.pool_name, endpoint, session_async)
+                if session is not None:
+                    sessions[arg] = session
+        return client_class(**kwargs, **sessions)
 
-class OpenAIBackend:
-    """Wrapper for the OpenAI backend."""
-    def __init__(self, model_name: str) -> None:
-        if OpenAI is None:
-            raise ImportError("OpenAI backend not available.")
-        self.llm = OpenAI(model=model_name)
+    @property
+    def llm(self) -> Any:
+        """The LangChain client, taken from the pool on first access."""
+        if self._llm is None:
+            kwargs = {self.model_arg: self.model_name, **self.kwargs}
+            self._llm = self.pool.client(
+                ClientPool.client_key(self.client_path, kwargs), lambda: self._build_client(kwargs)
+            )
+        return self._llm
+
+    @llm.setter
+    def llm(self, client: Any) -> None:
+        self._llm = client
+        self._assigned = True
+
+    @property
+    def async_llm(self) -> Any:
+        """The client for async calls: with a shared async session, the running event loop's own client."""
+        if self._assigned or len(self.session_args) < 2 or self.session_args[1] in self.kwargs:
+            return self.llm
+        kwargs = {self.model_arg: self.model_name, **self.kwargs}
+        return self.pool.client(
+            ClientPool.client_key(self.client_path, kwargs), lambda: self._build_client(kwargs, True), asynchronous=True
+        )
 
     def __call__(self, prompt: str) -> str:
         return self.llm(prompt)
 
+    async def ainvoke(self, prompt: str) -> str:
+        return await self.async_llm.ainvoke(prompt)
 
-class HuggingFaceBackend:
-    """Wrapper for the HuggingFace backend."""
-    def __init__(self, model_name: str) -> None:
-        if HuggingFaceHub is None:
-            raise ImportError("HuggingFace backend not available.")
-        self.llm = HuggingFaceHub(repo_id=model_name)
+    def batch(self, prompts: List[str]) -> List[Any]:
+        return self.llm.batch(prompts, return_exceptions=True)
 
-    def __call__(self, prompt: str) -> str:
-        return self.llm(prompt)
+    async def abatch(self, prompts: List[str]) -> List[Any]:
+        return await self.async_llm.abatch(prompts, return_exceptions=True)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return self.llm.stream(prompt)
+
+    def astream(self, prompt: str) -> AsyncIterator[str]:
+        return self.async_llm.astream(prompt)
+
+
+class OllamaBackend(LangChainBackend):
+    """Wrapper for the Ollama backend."""
+    client_path = 'langchain_community.llms:Ollama'
+    display_name = 'Ollama'
+    pool_name = 'ollama'
+    max_tokens_arg = 'num_predict'
+
+
+class OpenAIBackend(LangChainBackend):
+    """Wrapper for the OpenAI backend."""
+    client_path = 'langchain_openai:OpenAI'
+    display_name = 'OpenAI'
+    pool_name = 'openai'
+    session_args = ('http_client', 'http_async_client')
+    max_tokens_arg = 'max_tokens'
+
+
+class HuggingFaceBackend(LangChainBackend):
+    """Wrapper for the HuggingFace backend."""
+    client_path = 'langchain_huggingface:HuggingFaceHub'
+    model_arg = 'repo_id'
+    display_name = 'HuggingFace'
+    pool_name = 'huggingface'
 
 
 def _register_default_backends() -> None:
@@ -77,6 +216,8 @@ def _register_default_backends() -> None:
     ModelRegistry.register('ollama', OllamaBackend)
     ModelRegistry.register('openai', OpenAIBackend)
     ModelRegistry.register('huggingface', HuggingFaceBackend)
+    ModelRegistry.register('synthetic', 'autorank_llm.simulation:SyntheticBackend')
+    ModelRegistry.register('synthetic_batched', 'autorank_llm.simulation:BatchedSyntheticBackend')
 
 
 _register_default_backends()
@@ -91,13 +232,26 @@ class LLM:
         self,
         name: str,
         model_name: str,
-        backend: str = 'ollama'
+        backend: str = 'ollama',
+        params: Optional[Dict[str, Any]] = None,
+        cache: Optional[ResponseCache] = None,
+        pool: Optional[ClientPool] = None,
+        policy: Optional[CallPolicy] = None,
+        metrics: Optional[Metrics] = None,
+        budget: Optional[TokenBudget] = None
     ) -> None:
         """
         :param name: The name of the LLM instance.
         :param model_name: The model name for the LLM instance.
         :param backend: The backend to use (e.g., 'ollama', 'openai',
             'huggingface').
+        :param params: Optional sampling params passed to the backend
+            constructor as keyword arguments.
+        :param cache: Optional ResponseCache shared across LLM instances.
+        :param pool: Optional ClientPool for LangChain backends (default: the process-wide pool).
+        :param policy: Optional CallPolicy applying rate limits, retries, timeouts and circuit breaking.
+        :param metrics: Optional Metrics receiving prompt and completion token counts.
+        :param budget: Optional TokenBudget capping generations and counting the tokens and cost of every call.
         :raises ValueError: If any input is invalid.
         """
         if not name or not isinstance(name, str):
@@ -106,56 +260,568 @@ class LLM:
             raise ValueError("model_name must be a non-empty string.")
         if not backend or not isinstance(backend, str):
             raise ValueError("backend must be a non-empty string.")
+        if not ModelRegistry.is_registered(backend):
+            raise ValueError(f"Backend '{backend}' is not registered.")
         self.name: str = name
         self.model_name: str = model_name
         self.backend: str = backend
         self.skill_level: float = random.uniform(50, 100)
         self.evaluations: list = []
-        self.llm = ModelRegistry.get_backend(backend)(model_name)
+        self.params: Dict[str, Any] = dict(params or {})
+        self.cache: Optional[ResponseCache] = cache
+        self.pool: Optional[ClientPool] = pool
+        self.policy: Optional[CallPolicy] = policy
+        self.metrics: Metrics = metrics if metrics is not None else NULL_METRICS
+        self.budget: Optional[TokenBudget] = budget
+        self._llm: Any = None
+
+    @property
+    def llm(self) -> Any:
+        """The backend instance, resolved and constructed on first use."""
+        if self._llm is None:
+            backend_class = ModelRegistry.get_backend(self.backend)
+            params = dict(self.params)
+            if isinstance(backend_class, type) and issubclass(backend_class, LangChainBackend):
+                if self.pool is not None:
+                    params['pool'] = self.pool
+                if self.budget is not None and self.budget.max_tokens and backend_class.max_tokens_arg:
+                    params.setdefault(backend_class.max_tokens_arg, self.budget.max_tokens)
+            self._llm = backend_class(self.model_name, **params)
+        return self._llm
+
+    @llm.setter
+    def llm(self, backend_instance: Any) -> None:
+        self._llm = backend_instance
+
+    def _cache_key(self, prompt: str, sample: int) -> str:
+        return ResponseCache.make_key(self.backend, self.model_name, prompt, {'params': self.params, 'sample': sample})
 
-    def perform_task(self, task: str) -> Optional[str]:
+    def _call(self, prompt: str) -> str:
+        if self.budget is not None:
+            self.budget.check(self.name)
+        if self.policy is None:
+            response = self.llm(prompt)
+        else:
+            response = self.policy.call(self.model_name, prompt, lambda: self.llm(prompt))
+        self._count_tokens(prompt, response)
+        return response
+
+    async def _acall(self, prompt: str) -> str:
+        if self.budget is not None:
+            self.budget.check(self.name)
+        if self.policy is None:
+            response = await self.llm.ainvoke(prompt)
+        else:
+            response = await self.policy.acall(self.model_name, prompt, lambda: self.llm.ainvoke(prompt))
+        self._count_tokens(prompt, response)
+        return response
+
+    def _count_tokens(self, prompt: str, response: Any) -> None:
+        if self.budget is not None:
+            self.budget.charge(self.name, self.model_name, prompt, response)
+        if not self.metrics.enabled:
+            return
+        self.metrics.inc('autorank_tokens_total', estimate_tokens(prompt), model=self.name, kind='prompt')
+        if isinstance(response, str):
+            self.metrics.inc('autorank_tokens_total', estimate_tokens(response), model=self.name, kind='completion')
+
+    def invoke(self, prompt: str, sample: int = 0) -> str:
+        """
+        Send a prompt to the backend, going through the cache and call policy when set.
+        :param prompt: The prompt to send.
+        :param sample: Sample index, so repeated samples of one prompt are cached separately.
+        :return: The raw backend response.
+        """
+        if self.cache is None:
+            return self._call(prompt)
+        return self.cache.get_or_call(self._cache_key(prompt, sample), lambda: self._call(prompt))
+
+    async def ainvoke(self, prompt: str, sample: int = 0) -> str:
+        """
+        Async variant of invoke using the backend's ``ainvoke``.
+        :param prompt: The prompt to send.
+        :param sample: Sample index, so repeated samples of one prompt are cached separately.
+        :return: The raw backend response.
+        """
+        if self.cache is None:
+            return await self._acall(prompt)
+        key = self._cache_key(prompt, sample)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if self.cache.replay:
+            raise CacheMissError(f"No cached response for key {key} in replay mode.")
+        response = await self._acall(prompt)
+        if isinstance(response, str):
+            self.cache.put(key, response)
+        return response
+
+    @property
+    def supports_async(self) -> bool:
+        """Whether the backend provides a native ``ainvoke`` coroutine."""
+        return callable(getattr(self.llm, 'ainvoke', None))
+
+    @property
+    def supports_batch(self) -> bool:
+        """Whether the backend accepts a list of prompts in one ``batch`` call."""
+        return callable(getattr(self.llm, 'batch', None))
+
+    @property
+    def supports_async_batch(self) -> bool:
+        """Whether the backend provides a native ``abatch`` coroutine."""
+        return callable(getattr(self.llm, 'abatch', None))
+
+    @property
+    def capabilities(self) -> Dict[str, bool]:
+        """:return: Which optional backend protocol methods are available."""
+        backend = self.llm
+        return {
+            method: callable(getattr(backend, method, None))
+            for method in ('ainvoke', 'batch', 'abatch', 'stream', 'astream')
+        }
+
+    def _call_batch(self, prompts: List[str]) -> List[Any]:
+        if self.budget is not None:
+            self.budget.check(self.name)
+        if self.policy is None:
+            responses = self.llm.batch(prompts)
+        else:
+            responses = self.policy.call(self.model_name, '\n'.join(prompts), lambda: self.llm.batch(prompts))
+        return self._check_batch(prompts, responses)
+
+    async def _acall_batch(self, prompts: List[str]) -> List[Any]:
+        if self.budget is not None:
+            self.budget.check(self.name)
+        if self.policy is None:
+            responses = await self.llm.abatch(prompts)
+        else:
+            responses = await self.policy.acall(self.model_name, '\n'.join(prompts), lambda: self.llm.abatch(prompts))
+        return self._check_batch(prompts, responses)
+
+    def _check_batch(self, prompts: List[str], responses: List[Any]) -> List[Any]:
+        responses = list(responses)
+        if len(responses) != len(prompts):
+            raise ValueError(f"Backend of {self.name} returned {len(responses)} responses for {len(prompts)} prompts.")
+        for prompt, response in zip(prompts, responses):
+            self._count_tokens(prompt, response)
+        return responses
+
+    def _batch_lookup(self, prompts: List[str], samples: List[int]) -> Tuple[List[Any], List[Optional[str]], List[int]]:
+        """:return: Tuple of (cache keys, responses found in the cache, indices still to call)."""
+        if self.cache is None:
+            return [], [None] * len(prompts), list(range(len(prompts)))
+        keys = [self._cache_key(prompt, sample) for prompt, sample in zip(prompts, samples)]
+        responses = [self.cache.get(key) for key in keys]
+        pending = [index for index, response in enumerate(responses) if response is None]
+        if pending and self.cache.replay:
+            logger.error(f"No cached response for {len(pending)} prompts of {self.name} in replay mode.")
+            pending = []
+        return keys, responses, pending
+
+    def _batch_store(
+        self,
+        keys: List[Any],
+        responses: List[Optional[str]],
+        pending: List[int],
+        fresh: List[Any]
+    ) -> List[Optional[str]]:
+        for index, response in zip(pending, fresh):
+            if isinstance(response, BaseException):
+                logger.error(f"Batched call to {self.name} failed for one prompt: {response}")
+                continue
+            responses[index] = response
+            if self.cache is not None and isinstance(response, str):
+                self.cache.put(keys[index], response)
+        return responses
+
+    def invoke_batch(self, prompts: List[str], samples: Optional[List[int]] = None) -> List[Optional[str]]:
+        """
+        Send several prompts in one backend ``batch`` call, going through the cache and call
+        policy when set. Cached prompts are not resent.
+        :param prompts: The prompts to send.
+        :param samples: Sample index of each prompt (default: 0 for all).
+        :return: One response per prompt; None where that prompt failed.
+        :raises Exception: If the batch call itself fails.
+        """
+        keys, responses, pending = self._batch_lookup(prompts, samples or [0] * len(prompts))
+        if not pending:
+            return responses
+        fresh = self._call_batch([prompts[index] for index in pending])
+        return self._batch_store(keys, responses, pending, fresh)
+
+    async def ainvoke_batch(self, prompts: List[str], samples: Optional[List[int]] = None) -> List[Optional[str]]:
+        """Async variant of invoke_batch using the backend's ``abatch``."""
+        keys, responses, pending = self._batch_lookup(prompts, samples or [0] * len(prompts))
+        if not pending:
+            return responses
+        fresh = await self._acall_batch([prompts[index] for index in pending])
+        return self._batch_store(keys, responses, pending, fresh)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Yield the response to a prompt in chunks, using the backend's ``stream`` when present
+        and falling back to one chunk from invoke. Streamed calls skip the call policy's
+        retries, since a half-delivered stream cannot be replayed; the full response is cached.
+        :param prompt: The prompt to send.
+        :return: Iterator over response chunks.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(prompt, 0))
+            if cached is not None:
+                yield cached
+                return
+        if not callable(getattr(self.llm, 'stream', None)):
+            yield self.invoke(prompt)
+            return
+        if self.budget is not None:
+            self.budget.check(self.name)
+        start = time.perf_counter()
+        chunks: List[str] = []
+        for chunk in self.llm.stream(prompt):
+            if not chunks and self.metrics.enabled:
+                self.metrics.observe('autorank_first_token_seconds', time.perf_counter() - start, model=self.name)
+            chunks.append(chunk)
+            yield chunk
+        self._finish_stream(prompt, ''.join(chunks))
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Async variant of stream using the backend's ``astream``."""
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(prompt, 0))
+            if cached is not None:
+                yield cached
+                return
+        if not callable(getattr(self.llm, 'astream', None)):
+            yield await self.ainvoke(prompt)
+            return
+        if self.budget is not None:
+            self.budget.check(self.name)
+        start = time.perf_counter()
+        chunks: List[str] = []
+        async for chunk in self.llm.astream(prompt):
+            if not chunks and self.metrics.enabled:
+                self.metrics.observe('autorank_first_token_seconds', time.perf_counter() - start, model=self.name)
+            chunks.append(chunk)
+            yield chunk
+        self._finish_stream(prompt, ''.join(chunks))
+
+    def _finish_stream(self, prompt: str, response: str) -> None:
+        self._count_tokens(prompt, response)
+        if self.cache is not None:
+            self.cache.put(self._cache_key(prompt, 0), response)
+
+    def _cap(self, response: Any, max_tokens: Optional[int]) -> Any:
+        """Truncate a generation to max_tokens, or to the budget's generation cap when not given."""
+        if self.budget is None:
+            return truncate_tokens(response, max_tokens) if max_tokens is not None and isinstance(response, str) else response
+        return self.budget.truncate(response, max_tokens if max_tokens is not None else self.budget.generation_limit)
+
+    def perform_task(self, task: str, sample: int = 0, max_tokens: Optional[int] = None) -> Optional[str]:
         """
         Perform a given task using the LLM.
         :param task: The task to be performed by the LLM.
+        :param sample: Sample index when several responses are drawn for one task.
+        :param max_tokens: Token cap on the response (default: the budget's generation cap, if any).
         :return: The response from the LLM or None if an error occurs.
         """
         if not task or not isinstance(task, str):
             raise ValueError("Task must be a non-empty string.")
         try:
-            response = self.llm(task)
-            logger.info(f"Response from {self.name}: {response}")
+            response = self._cap(self.invoke(task, sample), max_tokens)
+            logger.debug("Response from %s: %s", self.name, response)
             return response
         except Exception as e:
-            logger.exception(f"Error in perform_task for {self.name}: {e}")
+            _log_call_error('perform_task', self.name, e)
             return None
 
+    async def aperform_task(self, task: str, sample: int = 0, max_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Async variant of perform_task using the backend's ``ainvoke``.
+        :param task: The task to be performed by the LLM.
+        :param sample: Sample index when several responses are drawn for one task.
+        :param max_tokens: Token cap on the response (default: the budget's generation cap, if any).
+        :return: The response from the LLM or None if an error occurs.
+        """
+        if not task or not isinstance(task, str):
+            raise ValueError("Task must be a non-empty string.")
+        try:
+            response = self._cap(await self.ainvoke(task, sample), max_tokens)
+            logger.debug("Response from %s: %s", self.name, response)
+            return response
+        except Exception as e:
+            _log_call_error('aperform_task', self.name, e)
+            return None
+
+    def perform_batch(self, tasks: List[str], samples: Optional[List[int]] = None) -> List[Optional[str]]:
+        """
+        Perform several tasks with one backend ``batch`` call.
+        :param tasks: The tasks to be performed by the LLM.
+        :param samples: Sample index of each task (default: 0 for all).
+        :return: One response per task, capped to the budget's generation cap; None where a task failed,
+            or for every task if the batch failed.
+        """
+        try:
+            responses = [self._cap(response, None) for response in self.invoke_batch(tasks, samples)]
+            logger.debug("Batched responses from %s: %s", self.name, responses)
+            return responses
+        except Exception as e:
+            _log_call_error('perform_batch', self.name, e)
+            return [None] * len(tasks)
+
+    async def aperform_batch(self, tasks: List[str], samples: Optional[List[int]] = None) -> List[Optional[str]]:
+        """Async variant of perform_batch using the backend's ``abatch``."""
+        try:
+            responses = [self._cap(response, None) for response in await self.ainvoke_batch(tasks, samples)]
+            logger.debug("Batched responses from %s: %s", self.name, responses)
+            return responses
+        except Exception as e:
+            _log_call_error('aperform_batch', self.name, e)
+            return [None] * len(tasks)
+
 
 class LLMEvaluationHelper:
     """
     Handles evaluation, score extraction, and skill updating for LLMs.
     """
     @staticmethod
-    def evaluate(llm: LLM, original_task: str, task_response: str) -> float:
-        if not original_task or not isinstance(original_task, str):
-            raise ValueError("original_task must be a non-empty string.")
-        if not task_response or not isinstance(task_response, str):
-            raise ValueError("task_response must be a non-empty string.")
+    def build_scoring_prompt(original_task: str, task_response: str) -> str:
+        """:return: The bare rating prompt, without a requested score format."""
+        return ScoringProtocol('plain').prompt(original_task, task_response)
+
+    @staticmethod
+    def parse_score(llm: LLM, answer: str, protocol: Optional[ScoringProtocol] = None) -> Optional[float]:
+        """
+        Parse a judge's single-score answer, counting how it was parsed in the judge's metrics.
+        :return: The score, or None if no score could be found.
+        """
+        score, method = (protocol or DEFAULT_PROTOCOL).parse(answer)
+        if llm.metrics.enabled:
+            llm.metrics.inc('autorank_score_parse_total', model=llm.name, method=method)
+        if score is None:
+            logger.warning(f"Could not parse a score from {llm.name}'s answer")
+        return score
+
+    @staticmethod
+    def evaluate(
+        llm: LLM,
+        original_task: str,
+        task_response: str,
+        protocol: Optional[ScoringProtocol] = None
+    ) -> Optional[float]:
+        """
+        Ask a judge to score one response.
+        :param protocol: ScoringProtocol for the prompt and parsing (default: a 'Score: N' tag).
+        :return: The score, or None if the call failed or the answer held no score,
+            so failures never count as low scores.
+        """
+        scoring_prompt = (protocol or DEFAULT_PROTOCOL).prompt(original_task, task_response)
         try:
-            scoring_prompt = (
-                f"Task: '{original_task}'. Response: '{task_response}'. "
-                "Rate the response numerically between 1 and 9."
-            )
-            score_response = llm.llm(scoring_prompt)
-            logger.info(f"Evaluation by {llm.name}: {score_response}")
-            return LLMEvaluationHelper.extract_numerical_score(score_response)
+            score_response = llm.invoke(scoring_prompt)
+            logger.debug("Evaluation by %s: %s", llm.name, score_response)
+            return LLMEvaluationHelper.parse_score(llm, score_response, protocol)
         except Exception as e:
-            logger.exception(f"Error in evaluate for {llm.name}: {e}")
-            return 0.0
+            _log_call_error('evaluate', llm.name, e)
+            return None
+
+    @staticmethod
+    async def aevaluate(
+        llm: LLM,
+        original_task: str,
+        task_response: str,
+        protocol: Optional[ScoringProtocol] = None
+    ) -> Optional[float]:
+        """Async variant of evaluate."""
+        scoring_prompt = (protocol or DEFAULT_PROTOCOL).prompt(original_task, task_response)
+        try:
+            score_response = await llm.ainvoke(scoring_prompt)
+            logger.debug("Evaluation by %s: %s", llm.name, score_response)
+            return LLMEvaluationHelper.parse_score(llm, score_response, protocol)
+        except Exception as e:
+            _log_call_error('aevaluate', llm.name, e)
+            return None
+
+    @staticmethod
+    def _verdict(llm: LLM, answer: str) -> Optional[float]:
+        outcome = parse_pairwise_verdict(answer)
+        if llm.metrics.enabled:
+            method = 'pairwise' if outcome is not None else 'failed'
+            llm.metrics.inc('autorank_score_parse_total', model=llm.name, method=method)
+        if outcome is None:
+            logger.warning(f"Could not parse a verdict from {llm.name}'s answer")
+        return outcome
+
+    @staticmethod
+    def compare(llm: LLM, original_task: str, response_a: str, response_b: str) -> Optional[float]:
+        """
+        Ask a judge which of two responses is better.
+        :return: 1.0 if the first response won, 0.0 if the second did, 0.5 for a tie,
+            or None if the call failed or the answer held no verdict.
+        """
+        prompt = build_pairwise_prompt(original_task, response_a, response_b)
+        try:
+            answer = llm.invoke(prompt)
+            logger.debug("Comparison by %s: %s", llm.name, answer)
+            return LLMEvaluationHelper._verdict(llm, answer)
+        except Exception as e:
+            _log_call_error('compare', llm.name, e)
+            return None
+
+    @staticmethod
+    async def acompare(llm: LLM, original_task: str, response_a: str, response_b: str) -> Optional[float]:
+        """Async variant of compare."""
+        prompt = build_pairwise_prompt(original_task, response_a, response_b)
+        try:
+            answer = await llm.ainvoke(prompt)
+            logger.debug("Comparison by %s: %s", llm.name, answer)
+            return LLMEvaluationHelper._verdict(llm, answer)
+        except Exception as e:
+            _log_call_error('acompare', llm.name, e)
+            return None
+
+    @staticmethod
+    def _batch_scores(llm: LLM, answer: str, count: int) -> Optional[List[float]]:
+        scores = parse_batch_scores(answer, count)
+        if llm.metrics.enabled:
+            llm.metrics.inc('autorank_score_parse_total', model=llm.name, method='batch' if scores else 'batch_failed')
+        if scores is None:
+            logger.warning(f"Falling back to per-response judging for {llm.name}")
+        return scores
+
+    @staticmethod
+    def evaluate_batch(
+        llm: LLM,
+        original_task: str,
+        task_responses: List[str],
+        protocol: Optional[ScoringProtocol] = None
+    ) -> List[Optional[float]]:
+        """
+        Score several responses to one task with a single judge prompt.
+        Falls back to one evaluate call per response if the batched answer cannot be parsed.
+        :param llm: The judge.
+        :param original_task: The task the responses answer.
+        :param task_responses: Responses to score.
+        :param protocol: ScoringProtocol for single-response prompts.
+        :return: One score per response, in order; None for every response if the call failed.
+        """
+        if len(task_responses) == 1:
+            return [LLMEvaluationHelper.evaluate(llm, original_task, task_responses[0], protocol)]
+        batch_prompt = build_batch_prompt(original_task, task_responses)
+        try:
+            score_response = llm.invoke(batch_prompt)
+        except Exception as e:
+            _log_call_error('evaluate_batch', llm.name, e)
+            return [None] * len(task_responses)
+        logger.debug("Batched evaluation by %s: %s", llm.name, score_response)
+        scores = LLMEvaluationHelper._batch_scores(llm, score_response, len(task_responses))
+        if scores is not None:
+            return scores
+        return [LLMEvaluationHelper.evaluate(llm, original_task, response, protocol) for response in task_responses]
+
+    @staticmethod
+    async def aevaluate_batch(
+        llm: LLM,
+        original_task: str,
+        task_responses: List[str],
+        protocol: Optional[ScoringProtocol] = None
+    ) -> List[Optional[float]]:
+        """Async variant of evaluate_batch."""
+        if len(task_responses) == 1:
+            return [await LLMEvaluationHelper.aevaluate(llm, original_task, task_responses[0], protocol)]
+        batch_prompt = build_batch_prompt(original_task, task_responses)
+        try:
+            score_response = await llm.ainvoke(batch_prompt)
+        except Exception as e:
+            _log_call_error('aevaluate_batch', llm.name, e)
+            return [None] * len(task_responses)
+        logger.debug("Batched evaluation by %s: %s", llm.name, score_response)
+        scores = LLMEvaluationHelper._batch_scores(llm, score_response, len(task_responses))
+        if scores is not None:
+            return scores
+        return [
+            await LLMEvaluationHelper.aevaluate(llm, original_task, response, protocol) for response in task_responses
+        ]
+
+    @staticmethod
+    def _judge_prompt(original_task: str, task_responses: List[str], protocol: Optional[ScoringProtocol]) -> str:
+        if len(task_responses) == 1:
+            return (protocol or DEFAULT_PROTOCOL).prompt(original_task, task_responses[0])
+        return build_batch_prompt(original_task, task_responses)
+
+    @staticmethod
+    def _parse_judgement(
+        llm: LLM,
+        answer: Optional[str],
+        task_responses: List[str],
+        protocol: Optional[ScoringProtocol]
+    ) -> Optional[List[Optional[float]]]:
+        """:return: The scores in a judge's answer, or None if a batched answer needs per-response fallback."""
+        if answer is None:
+            return [None] * len(task_responses)
+        if len(task_responses) == 1:
+            return [LLMEvaluationHelper.parse_score(llm, answer, protocol)]
+        return LLMEvaluationHelper._batch_scores(llm, answer, len(task_responses))
+
+    @staticmethod
+    def evaluate_many(
+        llm: LLM,
+        requests: List[Tuple[str, List[str]]],
+        protocol: Optional[ScoringProtocol] = None
+    ) -> List[List[Optional[float]]]:
+        """
+        Send several judge prompts to one judge in a single backend ``batch`` call.
+        :param llm: The judge.
+        :param requests: List of (original_task, task_responses) pairs, each becoming one
+            judge prompt as in evaluate_batch.
+        :param protocol: ScoringProtocol for single-response prompts.
+        :return: One list of scores per request; None for every score of a failed prompt.
+        """
+        prompts = [LLMEvaluationHelper._judge_prompt(task, responses, protocol) for task, responses in requests]
+        try:
+            answers = llm.invoke_batch(prompts)
+        except Exception as e:
+            _log_call_error('evaluate_many', llm.name, e)
+            return [[None] * len(responses) for _, responses in requests]
+        logger.debug("Batched evaluations by %s: %s", llm.name, answers)
+        results = []
+        for (task, responses), answer in zip(requests, answers):
+            scores = LLMEvaluationHelper._parse_judgement(llm, answer, responses, protocol)
+            if scores is None:
+                scores = [LLMEvaluationHelper.evaluate(llm, task, response, protocol) for response in responses]
+            results.append(scores)
+        return results
+
+    @staticmethod
+    async def aevaluate_many(
+        llm: LLM,
+        requests: List[Tuple[str, List[str]]],
+        protocol: Optional[ScoringProtocol] = None
+    ) -> List[List[Optional[float]]]:
+        """Async variant of evaluate_many using the backend's ``abatch``."""
+        prompts = [LLMEvaluationHelper._judge_prompt(task, responses, protocol) for task, responses in requests]
+        try:
+            answers = await llm.ainvoke_batch(prompts)
+        except Exception as e:
+            _log_call_error('aevaluate_many', llm.name, e)
+            return [[None] * len(responses) for _, responses in requests]
+        logger.debug("Batched evaluations by %s: %s", llm.name, answers)
+        results = []
+        for (task, responses), answer in zip(requests, answers):
+            scores = LLMEvaluationHelper._parse_judgement(llm, answer, responses, protocol)
+            if scores is None:
+                scores = list(await asyncio.gather(
+                    *(LLMEvaluationHelper.aevaluate(llm, task, response, protocol) for response in responses)
+                ))
+            results.append(scores)
+        return results
 
     @staticmethod
     def extract_numerical_score(response_text: str) -> float:
+        """
+        Legacy heuristic averaging every number between 1 and 10 in the text (0.0 if none).
+        Evaluation uses ScoringProtocol.parse, which does not mistake scale mentions for scores.
+        """
         try:
-            matches = re.findall(r'\b(?:[1-9](?:\.\d+)?|10)\b', response_text)
+            matches = _LEGACY_NUMBER.findall(response_text)
             if matches:
                 scores = [float(match) for match in matches]
                 average_score = sum(scores) / len(scores)
@@ -0,0 +1,361 @@
+# policy.py
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+TRANSIENT_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+_TRANSIENT_NAMES = ('ratelimit', 'timeout', 'connection', 'unavailable', 'overloaded', 'internalserver')
+
+
+class CallTimeoutError(TimeoutError):
+    """Raised when a backend call exceeds the policy timeout."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the backend while a model's circuit breaker is open."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Decide whether a failed call is worth retrying.
+    :param error: The exception raised by the backend.
+    :return: True for timeouts, connection errors, rate limits and 5xx responses.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    status = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is not None:
+        return status in TRANSIENT_STATUS
+    name = type(error).__name__.lower()
+    return any(part in name for part in _TRANSIENT_NAMES)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the server's retry hint from a failed call: a ``retry_after`` attribute, or the
+    ``Retry-After`` (seconds or HTTP date) or ``retry-after-ms`` header of ``error.response``,
+    as carried by OpenAI and httpx errors.
+    :param error: The exception raised by the backend.
+    :return: Seconds to wait, or None without a usable hint.
+    """
+    value = getattr(error, 'retry_after', None)
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    headers = {str(name).lower(): value for name, value in headers.items()}
+    try:
+        if 'retry-after-ms' in headers:
+            seconds = float(headers['retry-after-ms']) / 1000
+        elif 'retry-after' in headers:
+            value = str(headers['retry-after']).strip()
+            try:
+                seconds = float(value)
+            except ValueError:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        else:
+            return None
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+    return seconds if seconds > 0 else None
+
+
+def estimate_tokens(text: str) -> int:
+    """:return: Rough token count of a text (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at a fixed rate per minute. Callers reserve tokens
+    and are told how long to wait, so sync and async callers share one bucket without
+    holding a lock while they sleep.
+    """
+    def __init__(self, per_minute: float, capacity: Optional[float] = None) -> None:
+        """
+        :param per_minute: Refill rate in tokens per minute.
+        :param capacity: Burst size (default: one minute's worth).
+        :raises ValueError: If the rate is not positive.
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive.")
+        self.rate: float = per_minute / 60.0
+        self.capacity: float = capacity if capacity is not None else float(per_minute)
+        self._tokens: float = self.capacity
+        self._updated: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take tokens, going into debt if the bucket is short.
+        :param amount: Tokens to take.
+        :return: Seconds the caller must wait before proceeding.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing model. After ``failure_threshold`` consecutive failures the
+    circuit opens and calls fail fast; after ``reset_timeout`` seconds one trial call is
+    let through, and its outcome closes or re-opens the circuit.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'."""
+        if self.opened_at is None:
+            return 'closed'
+        return 'half_open' if time.monotonic() - self.opened_at >= self.reset_timeout else 'open'
+
+    def allow(self) -> None:
+        """:raises CircuitOpenError: If the circuit is open."""
+        with self._lock:
+            if self.state == 'open':
+                raise CircuitOpenError("Circuit open after repeated failures.")
+            if self.state == 'half_open':
+                # Let this one trial call through; others fail fast until it reports back
+                self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class CallPolicy:
+    """
+    Rate limits, retries, timeouts and circuit breaking around backend calls.
+    One policy is usually shared by every model of a backend; token buckets and
+    circuit breakers are kept per model name.
+    """
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        model_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        retry_if: Callable[[BaseException], bool] = is_transient,
+        token_counter: Callable[[str], int] = estimate_tokens,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        :param requests_per_minute: Request rate limit per model (None for unlimited).
+        :param tokens_per_minute: Token rate limit per model, counting prompt and response tokens.
+        :param model_limits: Per-model overrides, e.g. {'gpt-4': {'requests_per_minute': 500}}.
+        :param max_retries: Retries of a transient failure before giving up.
+        :param backoff_base: First backoff delay in seconds; doubles on every retry.
+        :param backoff_max: Upper bound on a single backoff delay.
+        :param timeout: Seconds before a call is abandoned with CallTimeoutError (None for no timeout).
+        :param failure_threshold: Consecutive transient failures that open a model's circuit breaker.
+        :param reset_timeout: Seconds an open circuit waits before letting a trial call through.
+        :param retry_if: Predicate deciding whether an exception is transient.
+        :param token_counter: Callable estimating the tokens in a text.
+        :param seed: Optional seed for the backoff jitter.
+        :raises ValueError: If input is invalid.
+        """
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise ValueError("max_retries must be a non-negative integer.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive.")
+        if not isinstance(failure_threshold, int) or failure_threshold < 1:
+            raise ValueError("failure_threshold must be a positive integer.")
+        self.requests_per_minute: Optional[float] = requests_per_minute
+        self.tokens_per_minute: Optional[float] = tokens_per_minute
+        self.model_limits: Dict[str, Dict[str, float]] = dict(model_limits or {})
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.timeout: Optional[float] = timeout
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.retry_if: Callable[[BaseException], bool] = retry_if
+        self.token_counter: Callable[[str], int] = token_counter
+        self.retries: int = 0
+        self.throttled_seconds: float = 0.0
+        self._rng = random.Random(seed)
+        self._buckets: Dict[tuple, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, model: str, kind: str) -> Optional[TokenBucket]:
+        key = (model, kind)
+        with self._lock:
+            if key not in self._buckets:
+                rate = self.model_limits.get(model, {}).get(kind, getattr(self, kind))
+                self._buckets[key] = TokenBucket(rate) if rate else None
+            return self._buckets[key]
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        """:return: The circuit breaker of a model."""
+        with self._lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[model]
+
+    def _throttle(self, model: str, prompt: str) -> float:
+        delay = 0.0
+        requests = self._bucket(model, 'requests_per_minute')
+        if requests is not None:
+            delay = max(delay, requests.reserve(1))
+        tokens = self._bucket(model, 'tokens_per_minute')
+        if tokens is not None:
+            delay = max(delay, tokens.reserve(self.token_counter(prompt)))
+        if delay:
+            with self._lock:
+                self.throttled_seconds += delay
+        return delay
+
+    def _charge_response(self, model: str, response: Any) -> None:
+        tokens = self._bucket(model, 'tokens_per_minute')
+        if tokens is None:
+            return
+        # Batched calls return one response per prompt
+        texts = response if isinstance(response, list) else [response]
+        amount = sum(self.token_counter(text) for text in texts if isinstance(text, str))
+        if amount:
+            tokens.reserve(amount)
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        with self._lock:
+            self.retries += 1
+            hint = retry_after(error)
+            if hint is not None:
+                return min(hint, self.backoff_max)
+            # Full jitter: spread retries uniformly below the exponential ceiling
+            return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _record_error(self, breaker: CircuitBreaker, error: BaseException) -> None:
+        # Only transient errors say the model is unhealthy; any other error means it answered
+        if self.retry_if(error):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _should_retry(self, attempt: int, error: BaseException) -> bool:
+        return attempt < self.max_retries and self.retry_if(error)
+
+    def _with_timeout(self, func: Callable[[], Any]) -> Any:
+        if self.timeout is None:
+            return func()
+        outcome: Dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                outcome['value'] = func()
+            except BaseException as e:
+                outcome['error'] = e
+
+        # A hung call cannot be interrupted; it is abandoned on a daemon thread
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            raise CallTimeoutError(f"Call timed out after {self.timeout}s.")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['value']
+
+    def call(self, model: str, prompt: str, func: Callable[[], Any]) -> Any:
+        """
+        Run a backend call under the policy.
+        :param model: Model name, selecting the rate limits and circuit breaker.
+        :param prompt: The prompt, used to count tokens.
+        :param func: Zero-argument callable performing the call.
+        :return: The call's result.
+        :raises CircuitOpenError: If the model's circuit is open.
+        :raises Exception: The last error once retries are exhausted or the error is not transient.
+        """
+        breaker = self.breaker(model)
+        attempt = 0
+        while True:
+            breaker.allow()
+            delay = self._throttle(model, prompt)
+            if delay:
+                time.sleep(delay)
+            try:
+                response = self._with_timeout(func)
+            except Exception as e:
+                self._record_error(breaker, e)
+                if not self._should_retry(attempt, e):
+                    raise
+                wait = self._backoff(attempt, e)
+                logger.warning(f"Transient error from {model} ({e}); retrying in {wait:.2f}s")
+                time.sleep(wait)
+                attempt += 1
+                continue
+            breaker.record_success()
+            self._charge_response(model, response)
+            return response
+
+    async def acall(self, model: str, prompt: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of call; ``func`` returns a coroutine and timeouts cancel it."""
+        breaker = self.breaker(model)
+        attempt = 0
+        while True:
+            breaker.allow()
+            delay = self._throttle(model, prompt)
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                if self.timeout is None:
+                    response = await func()
+                else:
+                    try:
+                        response = await asyncio.wait_for(func(), self.timeout)
+                    except asyncio.TimeoutError:
+                        raise CallTimeoutError(f"Call timed out after {self.timeout}s.")
+            except Exception as e:
+                self._record_error(breaker, e)
+                if not self._should_retry(attempt, e):
+                    raise
+                wait = self._backoff(attempt, e)
+                logger.warning(f"Transient error from {model} ({e}); retrying in {wait:.2f}s")
+                await asyncio.sleep(wait)
+                attempt += 1
+                continue
+            breaker.record_success()
+            self._charge_response(model, response)
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        """:return: Dict with total 'retries', 'throttled_seconds' and the 'open_circuits' by model."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            'retries': self.retries,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'open_circuits': sorted(model for model, breaker in breakers.items() if breaker.state != 'closed'),
+        }
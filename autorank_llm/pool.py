@@ -0,0 +1,174 @@
+# pool.py
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _httpx_session(asynchronous: bool, max_connections: int, keepalive_expiry: float) -> Optional[Any]:
+    # httpx ships with the OpenAI SDK; without it each client keeps its own connections
+    try:
+        import httpx
+    except ImportError:
+        return None
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+    return httpx.AsyncClient(limits=limits) if asynchronous else httpx.Client(limits=limits)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _close_async(loop: Optional[asyncio.AbstractEventLoop], session: Any) -> None:
+    """Close an async session from synchronous code, on its own loop when that is still usable."""
+    try:
+        if loop is not None and not loop.is_closed():
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.aclose(), loop)
+            else:
+                loop.run_until_complete(session.aclose())
+        else:
+            asyncio.run(session.aclose())
+    except Exception as e:
+        logger.debug("Could not close an async HTTP session: %s", e)
+
+
+class ClientPool:
+    """
+    Shares backend clients and keep-alive HTTP sessions across LLM instances and evaluators.
+    LangChain clients are reused for identical (client class, model, params) configs, and
+    one sync HTTP session is kept per (backend, endpoint), so many logical models talking to
+    the same server share its connections. Async sessions and the clients using them are bound
+    to the event loop they were opened on, so they are kept per (backend, endpoint, loop) and
+    closed with ``aclose_loop`` before that loop ends.
+    """
+    _default: Optional['ClientPool'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_size: int = 20,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        keepalive_expiry: float = 30.0,
+        session_factory: Optional[Callable[[bool, int, float], Any]] = None
+    ) -> None:
+        """
+        :param pool_size: Maximum connections per session.
+        :param pool_sizes: Optional per-backend overrides of pool_size, keyed by backend name.
+        :param keepalive_expiry: Seconds an idle connection is kept open.
+        :param session_factory: Callable (asynchronous, max_connections, keepalive_expiry) returning
+            an HTTP session, or None if sessions are unavailable (default: httpx clients).
+        :raises ValueError: If a pool size is not positive.
+        """
+        sizes = dict(pool_sizes or {})
+        if any(not isinstance(size, int) or size < 1 for size in [pool_size, *sizes.values()]):
+            raise ValueError("Pool sizes must be positive integers.")
+        self.pool_size: int = pool_size
+        self.pool_sizes: Dict[str, int] = sizes
+        self.keepalive_expiry: float = keepalive_expiry
+        self.session_factory: Callable[[bool, int, float], Any] = session_factory or _httpx_session
+        self.hits: int = 0
+        self.misses: int = 0
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._sessions: Dict[Tuple[str, Optional[str]], Any] = {}
+        # Per event loop (None outside one): async sessions by (backend, endpoint), and the clients built on them
+        self._loop_sessions: Dict[Optional[asyncio.AbstractEventLoop], Dict[Tuple[str, Optional[str]], Any]] = {}
+        self._loop_clients: Dict[Optional[asyncio.AbstractEventLoop], Dict[Tuple[str, str], Any]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def default(cls) -> 'ClientPool':
+        """:return: The process-wide pool used when none is given."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def size(self, backend: str) -> int:
+        """:return: Maximum connections per session for a backend."""
+        return self.pool_sizes.get(backend, self.pool_size)
+
+    def session(self, backend: str, endpoint: Optional[str] = None, asynchronous: bool = False) -> Optional[Any]:
+        """
+        :param backend: Backend name.
+        :param endpoint: Server URL the session talks to (None for the backend's default).
+        :param asynchronous: Return the async session of the running event loop instead of the sync one.
+        :return: The shared HTTP session, or None if sessions are unavailable.
+        """
+        with self._lock:
+            sessions = self._loop_sessions.setdefault(_running_loop(), {}) if asynchronous else self._sessions
+            if (backend, endpoint) not in sessions:
+                sessions[backend, endpoint] = self.session_factory(asynchronous, self.size(backend), self.keepalive_expiry)
+            return sessions[backend, endpoint]
+
+    def client(self, key: Tuple[str, str], build: Callable[[], Any], asynchronous: bool = False) -> Any:
+        """
+        Return the client stored under a key, building it on first request.
+        :param key: Hashable client identity, e.g. (client path, serialized params).
+        :param build: Zero-argument callable constructing the client.
+        :param asynchronous: Keep the client with the running event loop, for clients holding its async session.
+        :return: The shared client.
+        """
+        with self._lock:
+            clients = self._loop_clients.setdefault(_running_loop(), {}) if asynchronous else self._clients
+            if key in clients:
+                self.hits += 1
+                return clients[key]
+            self.misses += 1
+            client = build()
+            clients[key] = client
+            return client
+
+    @staticmethod
+    def client_key(client_path: str, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        """:return: Key identifying a client by its class and constructor arguments."""
+        return client_path, json.dumps(kwargs, sort_keys=True, default=repr)
+
+    def stats(self) -> Dict[str, int]:
+        """:return: Dict with client 'hits', 'misses', and the number of 'clients' and 'sessions' held."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            sessions.extend(session for loop_sessions in self._loop_sessions.values() for session in loop_sessions.values())
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'clients': len(self._clients) + sum(len(clients) for clients in self._loop_clients.values()),
+                'sessions': sum(session is not None for session in sessions),
+            }
+
+    async def aclose_loop(self) -> None:
+        """Close the async sessions of the running event loop and forget the clients using them."""
+        loop = _running_loop()
+        with self._lock:
+            sessions = self._loop_sessions.pop(loop, {})
+            self._loop_clients.pop(loop, None)
+        for session in sessions.values():
+            if session is not None and hasattr(session, 'aclose'):
+                await session.aclose()
+
+    def close(self) -> None:
+        """Close every sync and async session and forget every client."""
+        with self._lock:
+            sync_sessions = list(self._sessions.values())
+            loop_sessions = list(self._loop_sessions.items())
+            self._sessions.clear()
+            self._loop_sessions.clear()
+            self._clients.clear()
+            self._loop_clients.clear()
+        for session in sync_sessions:
+            if session is not None and hasattr(session, 'close'):
+                session.close()
+        for loop, sessions in loop_sessions:
+            for session in sessions.values():
+                if session is not None and hasattr(session, 'aclose'):
+                    _close_async(loop, session)
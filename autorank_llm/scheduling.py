@@ -0,0 +1,171 @@
+# scheduling.py
+import logging
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .scoring import ScoreMatrix
+
+logger = logging.getLogger(__name__)
+
+
+class PairingScheduler:
+    """
+    Decides which judges score which candidates. Schedulers are stateful and are
+    asked for a fresh assignment for every task in every round.
+    """
+    def assign(self, names: List[str], scores: Optional[ScoreMatrix] = None) -> Dict[str, List[str]]:
+        """
+        :param names: Names of all models in the pool.
+        :param scores: Scores collected so far, for schedulers that adapt to them.
+        :return: Dict mapping each candidate name to the names of its judges.
+        """
+        raise NotImplementedError
+
+    def expected_judgements(self, num_models: int) -> int:
+        """:return: Number of (judge, candidate) pairs per task for a pool of this size."""
+        raise NotImplementedError
+
+
+class AllPairsScheduler(PairingScheduler):
+    """Every model judges every other model (the default, O(N²) judge calls)."""
+    def assign(self, names: List[str], scores: Optional[ScoreMatrix] = None) -> Dict[str, List[str]]:
+        return {candidate: [judge for judge in names if judge != candidate] for candidate in names}
+
+    def expected_judgements(self, num_models: int) -> int:
+        return num_models * (num_models - 1)
+
+
+class _KJudgeScheduler(PairingScheduler):
+    def __init__(self, k: int, seed: Optional[int] = None) -> None:
+        """
+        :param k: Number of judges per candidate.
+        :param seed: Optional random seed.
+        :raises ValueError: If k is not positive.
+        """
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("k must be a positive integer.")
+        self.k: int = k
+        self.rng: random.Random = random.Random(seed)
+
+    def _k(self, num_models: int) -> int:
+        return min(self.k, num_models - 1)
+
+    def expected_judgements(self, num_models: int) -> int:
+        return num_models * self._k(num_models)
+
+    @staticmethod
+    def _circulant(order: List[str], k: int, offset: int = 0) -> Dict[str, List[str]]:
+        # Candidate order[i] is judged by the k models following it (after skipping `offset`),
+        # so every model judges exactly k candidates and every candidate gets k judges.
+        n = len(order)
+        return {
+            order[i]: [order[(i + 1 + (offset + step) % (n - 1)) % n] for step in range(k)]
+            for i in range(n)
+        }
+
+
+class RoundRobinScheduler(_KJudgeScheduler):
+    """
+    Deterministic k-regular assignment. The judge offset rotates on every call,
+    so over successive tasks each candidate meets every judge.
+    """
+    def __init__(self, k: int) -> None:
+        super().__init__(k)
+        self._offset: int = 0
+
+    def assign(self, names: List[str], scores: Optional[ScoreMatrix] = None) -> Dict[str, List[str]]:
+        if len(names) < 2:
+            return {name: [] for name in names}
+        k = self._k(len(names))
+        assignment = self._circulant(list(names), k, self._offset)
+        self._offset = (self._offset + k) % (len(names) - 1)
+        return assignment
+
+
+class RandomRegularScheduler(_KJudgeScheduler):
+    """Random k-regular assignment: every candidate gets k judges and every model judges k candidates."""
+    def assign(self, names: List[str], scores: Optional[ScoreMatrix] = None) -> Dict[str, List[str]]:
+        if len(names) < 2:
+            return {name: [] for name in names}
+        order = list(names)
+        self.rng.shuffle(order)
+        return self._circulant(order, self._k(len(names)))
+
+
+class ActiveSamplingScheduler(_KJudgeScheduler):
+    """
+    Spends a fixed budget of k judgements per candidate on average, but gives every
+    candidate at least ``min_judges`` and focuses the rest on candidates whose rank is
+    still uncertain: a large standard error relative to the gap to their nearest neighbours.
+    New judges are preferred for each candidate, least-used judges first.
+    """
+    def __init__(self, k: int, min_judges: int = 1, seed: Optional[int] = None) -> None:
+        """
+        :param k: Average number of judges per candidate.
+        :param min_judges: Judges every candidate gets regardless of uncertainty.
+        :param seed: Optional random seed.
+        :raises ValueError: If min_judges is out of range.
+        """
+        super().__init__(k, seed)
+        if not isinstance(min_judges, int) or not 1 <= min_judges <= k:
+            raise ValueError("min_judges must be an integer between 1 and k.")
+        self.min_judges: int = min_judges
+
+    def uncertainty(self, names: List[str], scores: Optional[ScoreMatrix]) -> np.ndarray:
+        """
+        :return: Per-candidate uncertainty; uniform when no scores have been collected yet.
+        """
+        n = len(names)
+        if scores is None or scores.counts.sum() == 0:
+            return np.ones(n)
+        positions = [scores.index[name] for name in names]
+        counts = scores.counts.sum(axis=(0, 2))[positions].astype(float)
+        sums = scores.sums.sum(axis=(0, 2))[positions]
+        squares = scores.squares.sum(axis=(0, 2))[positions]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            variance = np.where(counts > 1, (squares - counts * means ** 2) / np.maximum(counts - 1, 1), np.nan)
+        spread = np.nanmean(variance) if np.any(~np.isnan(variance)) else 1.0
+        variance = np.where(np.isnan(variance), spread, np.maximum(variance, 1e-9))
+        stderr = np.sqrt(variance / np.maximum(counts, 1))
+        filled = np.where(np.isnan(means), np.nanmean(means), means)
+        gaps = np.abs(filled[:, None] - filled[None, :])
+        np.fill_diagonal(gaps, np.inf)
+        nearest = gaps.min(axis=1)
+        return np.where(counts > 0, stderr / (nearest + 1e-3), np.inf)
+
+    def assign(self, names: List[str], scores: Optional[ScoreMatrix] = None) -> Dict[str, List[str]]:
+        n = len(names)
+        if n < 2:
+            return {name: [] for name in names}
+        k = self._k(n)
+        base = min(self.min_judges, k)
+        quota = np.full(n, base)
+        weights = self.uncertainty(names, scores)
+        finite = weights[np.isfinite(weights)]
+        # Unscored candidates rank as more uncertain than any scored one
+        weights = np.where(np.isfinite(weights), weights, 10.0 * finite.max() if finite.size and finite.max() > 0 else 1.0)
+        extra = n * k - int(quota.sum())
+        # Hand out the remaining budget one slot at a time to the most uncertain candidates,
+        # dividing by (slots + 1) so the budget spreads instead of piling onto one candidate.
+        for _ in range(extra):
+            priority = np.where(quota < n - 1, weights / (quota + 1), -1.0)
+            quota[int(np.argmax(priority))] += 1
+        load = {name: 0 for name in names}
+        seen = scores.counts.sum(axis=2) if scores is not None else None
+        assignment: Dict[str, List[str]] = {}
+        for i in sorted(range(n), key=lambda i: -quota[i]):
+            candidate = names[i]
+            judges = [judge for judge in names if judge != candidate]
+            self.rng.shuffle(judges)
+            if seen is not None:
+                column = scores.index[candidate]
+                judges.sort(key=lambda judge: (seen[scores.index[judge], column], load[judge]))
+            else:
+                judges.sort(key=lambda judge: load[judge])
+            assignment[candidate] = judges[:int(quota[i])]
+            for judge in assignment[candidate]:
+                load[judge] += 1
+        return {name: assignment[name] for name in names}
@@ -0,0 +1,398 @@
+# scoring.py
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreMatrix:
+    """
+    Dense judge × candidate × task store of raw judge scores.
+    Each cell keeps the sum, sum of squares and count of its observations,
+    so means and sample variances are available without keeping every score.
+    """
+    def __init__(self, names: Sequence[str], task_capacity: int = 8) -> None:
+        """
+        :param names: Model names; position i is both judge i and candidate i.
+        :param task_capacity: Initial task capacity; grows on demand.
+        :raises ValueError: If input is invalid.
+        """
+        if not names or len(set(names)) != len(names):
+            raise ValueError("names must be a non-empty list of unique model names.")
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.task_ids: List[str] = []
+        self.task_index: Dict[str, int] = {}
+        n = len(self.names)
+        capacity = max(1, task_capacity)
+        self._sums = np.zeros((n, n, capacity))
+        self._squares = np.zeros((n, n, capacity))
+        self._counts = np.zeros((n, n, capacity), dtype=np.int64)
+
+    @property
+    def num_models(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_tasks(self) -> int:
+        return len(self.task_ids)
+
+    @property
+    def sums(self) -> np.ndarray:
+        """Per-cell score sums, shape (judges, candidates, tasks)."""
+        return self._sums[:, :, :self.num_tasks]
+
+    @property
+    def squares(self) -> np.ndarray:
+        """Per-cell sums of squared scores, shape (judges, candidates, tasks)."""
+        return self._squares[:, :, :self.num_tasks]
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Per-cell observation counts, shape (judges, candidates, tasks)."""
+        return self._counts[:, :, :self.num_tasks]
+
+    def _task(self, task_id: str) -> int:
+        position = self.task_index.get(task_id)
+        if position is not None:
+            return position
+        if self.num_tasks == self._sums.shape[2]:
+            grow = self._sums.shape[2]
+            pad = ((0, 0), (0, 0), (0, grow))
+            self._sums = np.pad(self._sums, pad)
+            self._squares = np.pad(self._squares, pad)
+            self._counts = np.pad(self._counts, pad)
+        position = self.num_tasks
+        self.task_ids.append(task_id)
+        self.task_index[task_id] = position
+        return position
+
+    def add_model(self, name: str) -> None:
+        """
+        Add an empty judge row and candidate column for a new model.
+        :param name: Model name.
+        :raises ValueError: If the name is already present.
+        """
+        if name in self.index:
+            raise ValueError(f"Model '{name}' is already in the score matrix.")
+        pad = ((0, 1), (0, 1), (0, 0))
+        self._sums = np.pad(self._sums, pad)
+        self._squares = np.pad(self._squares, pad)
+        self._counts = np.pad(self._counts, pad)
+        self.index[name] = len(self.names)
+        self.names.append(name)
+
+    def remove_model(self, name: str) -> None:
+        """
+        Drop a model's judge row and candidate column, with every score it gave or received.
+        :param name: Model name.
+        :raises ValueError: If the name is unknown or is the last model.
+        """
+        position = self.index.get(name)
+        if position is None:
+            raise ValueError(f"Model '{name}' is not in the score matrix.")
+        if self.num_models == 1:
+            raise ValueError("Cannot remove the last model.")
+        self._sums = np.delete(np.delete(self._sums, position, axis=0), position, axis=1)
+        self._squares = np.delete(np.delete(self._squares, position, axis=0), position, axis=1)
+        self._counts = np.delete(np.delete(self._counts, position, axis=0), position, axis=1)
+        del self.names[position]
+        self.index = {model: i for i, model in enumerate(self.names)}
+
+    def add(self, judge: str, candidate: str, task_id: str, score: float) -> None:
+        """
+        Record one raw score.
+        :param judge: Name of the judging model.
+        :param candidate: Name of the judged model.
+        :param task_id: Task the response answered.
+        :param score: Raw judge score.
+        """
+        self.add_many([judge], [candidate], [task_id], [score])
+
+    def add_many(
+        self,
+        judges: Sequence[str],
+        candidates: Sequence[str],
+        task_ids: Sequence[str],
+        scores: Sequence[float]
+    ) -> None:
+        """Record many raw scores at once; the sequences are aligned by index."""
+        if not (len(judges) == len(candidates) == len(task_ids) == len(scores)):
+            raise ValueError("judges, candidates, task_ids and scores must have the same length.")
+        if not scores:
+            return
+        j = np.fromiter((self.index[name] for name in judges), dtype=np.int64, count=len(judges))
+        c = np.fromiter((self.index[name] for name in candidates), dtype=np.int64, count=len(candidates))
+        t = np.fromiter((self._task(task_id) for task_id in task_ids), dtype=np.int64, count=len(task_ids))
+        values = np.asarray(scores, dtype=float)
+        np.add.at(self._sums, (j, c, t), values)
+        np.add.at(self._squares, (j, c, t), values * values)
+        np.add.at(self._counts, (j, c, t), 1)
+
+    def pair_totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """:return: (score sums, counts), each shape (judges, candidates), summed over tasks."""
+        return self.sums.sum(axis=2), self.counts.sum(axis=2)
+
+    def pair_means(self) -> np.ndarray:
+        """:return: Mean score per (judge, candidate) over all tasks; NaN where a judge never scored a candidate."""
+        sums, counts = self.pair_totals()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def task_means(self) -> np.ndarray:
+        """:return: Mean score per (task, candidate) over all judges, shape (tasks, candidates); NaN where unscored."""
+        sums = self.sums.sum(axis=0).T
+        counts = self.counts.sum(axis=0).T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def task_breakdown(self) -> Dict[str, Dict[str, float]]:
+        """:return: Dict mapping task id to a dict of mean score per scored candidate."""
+        means = self.task_means()
+        return {
+            task_id: {name: float(means[t, i]) for i, name in enumerate(self.names) if not np.isnan(means[t, i])}
+            for t, task_id in enumerate(self.task_ids)
+        }
+
+
+def normalize(skills: np.ndarray) -> np.ndarray:
+    """
+    Vectorized counterpart of utils.normalize_skill_levels: rescale to 0-100, or 50 everywhere if all equal.
+    :param skills: 1-D array of skill levels.
+    :return: Normalized copy.
+    """
+    low, high = skills.min(), skills.max()
+    if high == low:
+        return np.full_like(skills, 50.0, dtype=float)
+    return 100.0 * (skills - low) / (high - low)
+
+
+def weighted_step(sums: np.ndarray, counts: np.ndarray, skills: np.ndarray) -> np.ndarray:
+    """
+    One recursive peer-evaluation update: each candidate's new value is the mean of the
+    scores it received, weighted by the current skill of each judge. Candidates whose judges
+    all have zero weight fall back to the plain mean, and candidates nobody scored get the
+    mean of the others, so they neither lead nor trail the ranking.
+    :param sums: Score sums, shape (judges, candidates).
+    :param counts: Observation counts, shape (judges, candidates).
+    :param skills: Current judge skills, shape (models,).
+    :return: Updated values on the judge score scale.
+    """
+    received = counts.sum(axis=0)
+    weight = skills @ counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted = (skills @ sums) / weight
+        plain = sums.sum(axis=0) / received
+    updated = np.where(weight > 0, weighted, np.where(received > 0, plain, np.nan))
+    if np.isnan(updated).all():
+        return np.zeros_like(updated)
+    return np.where(np.isnan(updated), np.nanmean(updated), updated)
+
+
+def converge_weighted(
+    sums: np.ndarray,
+    counts: np.ndarray,
+    skills: np.ndarray,
+    threshold: float = 0.5,
+    max_iterations: int = 1000
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    Iterate normalize + weighted_step over fixed scores until the largest change
+    in normalized skill falls below threshold.
+    :param sums: Score sums, shape (judges, candidates).
+    :param counts: Observation counts, shape (judges, candidates).
+    :param skills: Initial skills, shape (models,).
+    :param threshold: Convergence threshold on the 0-100 scale.
+    :param max_iterations: Upper bound on iterations.
+    :return: Tuple of (normalized skills, max change per iteration).
+    """
+    current = normalize(np.asarray(skills, dtype=float))
+    deltas: List[float] = []
+    for _ in range(max_iterations):
+        updated = normalize(weighted_step(sums, counts, current))
+        deltas.append(float(np.abs(updated - current).max()))
+        current = updated
+        if deltas[-1] < threshold:
+            break
+    return current, deltas
+
+
+def converge_pagerank(
+    means: np.ndarray,
+    damping: float = 0.85,
+    threshold: float = 1e-6,
+    max_iterations: int = 1000
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    Eigenvector (PageRank-style) aggregation: each judge distributes its own standing
+    over candidates in proportion to the scores it gave them.
+    :param means: Mean score per (judge, candidate); NaN for unobserved pairs.
+    :param damping: Damping factor.
+    :param threshold: Convergence threshold on the stationary distribution.
+    :param max_iterations: Upper bound on iterations.
+    :return: Tuple of (skills normalized to 0-100, max change per iteration).
+    """
+    n = means.shape[0]
+    weights = np.nan_to_num(means, nan=0.0)
+    np.fill_diagonal(weights, 0.0)
+    out = weights.sum(axis=1, keepdims=True)
+    transition = np.where(out > 0, weights / np.where(out > 0, out, 1.0), 1.0 / n)
+    rank = np.full(n, 1.0 / n)
+    deltas: List[float] = []
+    for _ in range(max_iterations):
+        updated = (1 - damping) / n + damping * (rank @ transition)
+        deltas.append(float(np.abs(updated - rank).max()))
+        rank = updated
+        if deltas[-1] < threshold:
+            break
+    return normalize(rank), deltas
+
+
+def pairwise_wins(means: np.ndarray) -> np.ndarray:
+    """
+    Turn per-judge scores into pairwise outcomes: for every judge that scored both a and b,
+    a gets a win over b if it scored higher, and half a win on a tie.
+    :param means: Mean score per (judge, candidate); NaN for unobserved pairs.
+    :return: Win matrix, shape (candidates, candidates).
+    """
+    a = means[:, :, None]
+    b = means[:, None, :]
+    both = ~np.isnan(a) & ~np.isnan(b)
+    wins = np.where(both, (a > b) + 0.5 * (a == b), 0.0).sum(axis=0)
+    np.fill_diagonal(wins, 0.0)
+    return wins
+
+
+def converge_bradley_terry(
+    wins: np.ndarray,
+    threshold: float = 1e-6,
+    max_iterations: int = 1000,
+    prior: float = 0.1
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    Bradley-Terry strengths fitted with the minorization-maximization algorithm.
+    :param wins: wins[a, b] is how often a beat b.
+    :param threshold: Convergence threshold on log-strengths.
+    :param max_iterations: Upper bound on iterations.
+    :param prior: Pseudo-wins added against every opponent, keeping strengths finite for unbeaten models.
+    :return: Tuple of (log-strengths normalized to 0-100, max change per iteration).
+    """
+    n = wins.shape[0]
+    played = (wins + wins.T) > 0
+    smoothed = wins + prior * played
+    games = smoothed + smoothed.T
+    total_wins = smoothed.sum(axis=1)
+    strength = np.ones(n)
+    deltas: List[float] = []
+    for _ in range(max_iterations):
+        pair_sums = strength[:, None] + strength[None, :]
+        denominator = (games / pair_sums).sum(axis=1)
+        updated = np.where(denominator > 0, total_wins / np.where(denominator > 0, denominator, 1.0), strength)
+        updated /= np.exp(np.log(updated).mean())
+        deltas.append(float(np.abs(np.log(updated) - np.log(strength)).max()))
+        strength = updated
+        if deltas[-1] < threshold:
+            break
+    return normalize(np.log(strength)), deltas
+
+
+def judge_offsets(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Per-judge leniency: each judge's mean score minus the mean over all judgements.
+    :param sums: Score sums, shape (judges, candidates).
+    :param counts: Observation counts, shape (judges, candidates).
+    :return: Offsets, shape (judges,); zero for judges that scored nothing.
+    """
+    given = counts.sum(axis=1)
+    total = counts.sum()
+    if total == 0:
+        return np.zeros(counts.shape[0])
+    overall = sums.sum() / total
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(given > 0, sums.sum(axis=1) / np.maximum(given, 1) - overall, 0.0)
+
+
+def center_judges(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Remove judge leniency from score sums. Under sparse pairings a candidate only meets a few
+    judges, so a lenient or harsh judge would otherwise move its candidates up or down.
+    :param sums: Score sums, shape (judges, candidates).
+    :param counts: Observation counts, shape (judges, candidates).
+    :return: Adjusted score sums.
+    """
+    return sums - judge_offsets(sums, counts)[:, None] * counts
+
+
+def kendall_tau(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Kendall rank correlation (tau-a) between two score vectors.
+    :return: Value in [-1, 1]; 1 means identical orderings.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n = a.size
+    if n < 2:
+        return 1.0
+    concordance = np.sign(a[:, None] - a[None, :]) * np.sign(b[:, None] - b[None, :])
+    return float(concordance[np.triu_indices(n, k=1)].sum() / (n * (n - 1) / 2))
+
+
+AGGREGATORS = ('weighted', 'pagerank', 'bradley_terry')
+
+
+def aggregate(
+    scores: ScoreMatrix,
+    method: str = 'weighted',
+    skills: Optional[np.ndarray] = None,
+    threshold: float = 0.5,
+    max_iterations: int = 1000,
+    sparse: bool = False
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    Compute skill levels from a ScoreMatrix with no further model calls.
+    :param scores: The collected scores.
+    :param method: One of 'weighted', 'pagerank' or 'bradley_terry'.
+    :param skills: Initial skills for the weighted method (defaults to equal weights).
+    :param threshold: Convergence threshold for the weighted method.
+    :param max_iterations: Upper bound on iterations.
+    :param sparse: Whether judges only scored a subset of candidates; judge leniency is then
+        removed before weighting (Bradley-Terry only compares within a judge and needs no correction).
+    :return: Tuple of (skills on a 0-100 scale, max change per iteration).
+    :raises ValueError: If the method is unknown.
+    """
+    sums, counts = scores.pair_totals()
+    return aggregate_totals(sums, counts, method, skills, threshold, max_iterations, sparse)
+
+
+def aggregate_totals(
+    sums: np.ndarray,
+    counts: np.ndarray,
+    method: str = 'weighted',
+    skills: Optional[np.ndarray] = None,
+    threshold: float = 0.5,
+    max_iterations: int = 1000,
+    sparse: bool = False
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    aggregate over (judge, candidate) score totals, e.g. reweighted copies of ScoreMatrix.pair_totals().
+    :param sums: Score sums, shape (judges, candidates).
+    :param counts: Observation counts, shape (judges, candidates).
+    :return: Tuple of (skills on a 0-100 scale, max change per iteration).
+    :raises ValueError: If the method is unknown.
+    """
+    if method == 'weighted':
+        if sparse:
+            sums = center_judges(sums, counts)
+        initial = np.full(counts.shape[0], 50.0) if skills is None else np.asarray(skills, dtype=float)
+        return converge_weighted(sums, counts, initial, threshold, max_iterations)
+    if method not in AGGREGATORS:
+        raise ValueError(f"Unknown aggregator '{method}'. Choose from {AGGREGATORS}.")
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    if method == 'pagerank':
+        if sparse:
+            means = np.clip(means - judge_offsets(sums, counts)[:, None], 0.0, None)
+        return converge_pagerank(means, max_iterations=max_iterations)
+    return converge_bradley_terry(pairwise_wins(means), max_iterations=max_iterations)
@@ -0,0 +1,244 @@
+# simulation.py
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_QUALITY_TAG = re.compile(r'\[synthetic:[^\]]*?q=([0-9.]+)\]')
+
+
+class SyntheticBackend:
+    """
+    Offline backend with a known ground-truth quality, configurable latency and failure rate.
+    Generations carry a quality tag; as a judge it scores responses by their tag plus noise,
+    so rankings can be checked against the truth without any real model.
+    """
+    calls: int = 0
+    failures: int = 0
+    _stats_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model_name: str,
+        quality: float = 0.5,
+        latency: str = 'constant',
+        latency_mean: float = 0.0,
+        latency_sigma: float = 0.5,
+        failure_rate: float = 0.0,
+        judge_noise: float = 0.5,
+        response_length: int = 32,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        :param model_name: Model name, echoed in generations.
+        :param quality: Ground-truth quality in [0, 1]; judges map it to 1-9.
+        :param latency: Latency distribution: 'constant', 'uniform' (0 to 2x mean) or 'lognormal'.
+        :param latency_mean: Mean latency per call in seconds.
+        :param latency_sigma: Shape parameter of the lognormal distribution.
+        :param failure_rate: Probability that a call raises ConnectionError, a transient failure.
+        :param judge_noise: Standard deviation of this model's judging noise, in score points.
+        :param response_length: Approximate number of words per generation.
+        :param seed: Optional random seed.
+        :raises ValueError: If input is invalid.
+        """
+        if not 0.0 <= quality <= 1.0:
+            raise ValueError("quality must be between 0 and 1.")
+        if latency not in ('constant', 'uniform', 'lognormal'):
+            raise ValueError("latency must be 'constant', 'uniform' or 'lognormal'.")
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("failure_rate must be between 0 and 1.")
+        self.model_name: str = model_name
+        self.quality: float = quality
+        self.latency: str = latency
+        self.latency_mean: float = latency_mean
+        self.latency_sigma: float = latency_sigma
+        self.failure_rate: float = failure_rate
+        self.judge_noise: float = judge_noise
+        self.response_length: int = response_length
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        with cls._stats_lock:
+            cls.calls = 0
+            cls.failures = 0
+
+    def _delay(self) -> float:
+        with self._lock:
+            if self.latency_mean <= 0:
+                return 0.0
+            if self.latency == 'constant':
+                return self.latency_mean
+            if self.latency == 'uniform':
+                return self._rng.uniform(0, 2 * self.latency_mean)
+            # lognormal with the requested mean
+            mu = math.log(self.latency_mean) - self.latency_sigma ** 2 / 2
+            return self._rng.lognormvariate(mu, self.latency_sigma)
+
+    def _fails(self) -> bool:
+        with self._lock:
+            failed = self._rng.random() < self.failure_rate
+        with SyntheticBackend._stats_lock:
+            SyntheticBackend.calls += 1
+            if failed:
+                SyntheticBackend.failures += 1
+        return failed
+
+    def _score(self, quality: float) -> float:
+        with self._lock:
+            noise = self._rng.gauss(0, self.judge_noise)
+        return round(min(9.0, max(1.0, 1.0 + 8.0 * quality + noise)), 2)
+
+    def respond(self, prompt: str) -> str:
+        """Produce the response text for a prompt, without latency or failures."""
+        qualities = [float(q) for q in _QUALITY_TAG.findall(prompt)]
+        if 'Which response is better' in prompt and len(qualities) == 2:
+            first, second = self._score(qualities[0]), self._score(qualities[1])
+            return f"Winner: {'A' if first > second else 'B' if second > first else 'tie'}"
+        if 'Rate each response' in prompt:
+            return json.dumps({str(i): self._score(q) for i, q in enumerate(qualities, start=1)})
+        if 'Rate the response' in prompt:
+            return f"Score: {self._score(qualities[0]) if qualities else 1.0}"
+        filler = ' '.join(['lorem'] * max(0, self.response_length - 1))
+        return f"[synthetic:{self.model_name}:q={self.quality:.4f}] {filler}"
+
+    def __call__(self, prompt: str) -> str:
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        if self._fails():
+            raise ConnectionError(f"Synthetic failure in {self.model_name}")
+        return self.respond(prompt)
+
+    async def ainvoke(self, prompt: str) -> str:
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        if self._fails():
+            raise ConnectionError(f"Synthetic failure in {self.model_name}")
+        return self.respond(prompt)
+
+
+class BatchedSyntheticBackend(SyntheticBackend):
+    """
+    Synthetic backend simulating a server with batched inference: a ``batch`` of prompts
+    costs a single latency draw, and each prompt in it can fail on its own.
+    """
+    def batch(self, prompts: List[str]) -> List[Any]:
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return [self._batch_item(prompt) for prompt in prompts]
+
+    async def abatch(self, prompts: List[str]) -> List[Any]:
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return [self._batch_item(prompt) for prompt in prompts]
+
+    def _batch_item(self, prompt: str) -> Any:
+        if self._fails():
+            return ConnectionError(f"Synthetic failure in {self.model_name}")
+        return self.respond(prompt)
+
+
+def synthetic_model_configs(
+    num_models: int,
+    seed: int = 0,
+    backend: str = 'synthetic',
+    **backend_params: Any
+) -> List[Dict[str, Any]]:
+    """
+    Build model configs for a synthetic pool with evenly spread ground-truth quality.
+    :param num_models: Number of models.
+    :param seed: Seed for per-model randomness.
+    :param backend: 'synthetic', or 'synthetic_batched' for a backend with batched inference.
+    :param backend_params: Extra SyntheticBackend params shared by every model.
+    :return: List of model configs for LLMEvaluator.
+    """
+    if num_models < 2:
+        raise ValueError("num_models must be at least 2.")
+    order = list(range(num_models))
+    random.Random(seed).shuffle(order)
+    return [
+        {
+            'name': f"model_{i:03d}",
+            'model_name': f"model_{i:03d}",
+            'backend': backend,
+            'params': {'quality': rank / (num_models - 1), 'seed': seed * 1000 + i, **backend_params}
+        }
+        for i, rank in enumerate(order)
+    ]
+
+
+def run_benchmark(
+    num_models: int = 8,
+    num_tasks: int = 4,
+    seed: int = 0,
+    backend_params: Optional[Dict[str, Any]] = None,
+    trace_memory: bool = True,
+    backend: str = 'synthetic',
+    **evaluator_kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Rank a synthetic pool and measure the run.
+    :param num_models: Number of synthetic models.
+    :param num_tasks: Number of tasks in the suite.
+    :param seed: Seed for qualities, latencies and failures.
+    :param backend_params: SyntheticBackend params (latency, failure_rate, ...).
+    :param trace_memory: Record peak memory with tracemalloc; this slows the run, so disable it for throughput numbers.
+    :param backend: 'synthetic', or 'synthetic_batched' to simulate batched inference (with ``backend_batch_size`` > 1).
+    :param evaluator_kwargs: Extra LLMEvaluator arguments (execution_mode, pairing, ...).
+    :return: Dict with the configuration, wall time, call counts, throughput, peak memory and ranking accuracy.
+    """
+    from .evaluator import LLMEvaluator
+    from .scoring import kendall_tau
+
+    configs = synthetic_model_configs(num_models, seed, backend, **(backend_params or {}))
+    quality = {cfg['name']: cfg['params']['quality'] for cfg in configs}
+    tasks = [f"Synthetic task {i}" for i in range(num_tasks)]
+
+    SyntheticBackend.reset_stats()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    evaluator = LLMEvaluator(configs, tasks, **evaluator_kwargs)
+    results = evaluator.evaluate_llms()
+    wall_time = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    ranked = sorted(results['rankings'], key=lambda llm: llm.skill_level, reverse=True)
+    skills = [llm.skill_level for llm in ranked]
+    truth = [quality[llm.name] for llm in ranked]
+    best = max(quality, key=quality.get)
+    return {
+        'num_models': num_models,
+        'num_tasks': num_tasks,
+        'seed': seed,
+        'backend': backend,
+        'backend_params': backend_params or {},
+        'evaluator_kwargs': {
+            key: value if isinstance(value, (int, float, str, bool, type(None))) else repr(value)
+            for key, value in evaluator_kwargs.items()
+        },
+        'wall_time_s': round(wall_time, 4),
+        'calls': SyntheticBackend.calls,
+        'failures': SyntheticBackend.failures,
+        'calls_per_s': round(SyntheticBackend.calls / wall_time, 2) if wall_time > 0 else None,
+        'peak_memory_mb': round(peak / 2 ** 20, 3) if peak is not None else None,
+        'kendall_tau': round(kendall_tau(skills, truth), 4),
+        'top1_correct': ranked[0].name == best,
+        'iterations': results['iterations'],
+    }
@@ -0,0 +1,239 @@
+# sinks.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter, deque
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def response_hash(text: str) -> str:
+    """:return: Content hash used to deduplicate response text across log entries."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class LogSink:
+    """
+    Destination for explainability log entries. Entries are written with their 'response'
+    text replaced by a 'response_hash'; each distinct response is stored once, and iterating
+    the sink yields entries with the text resolved again.
+    """
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Store one entry."""
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Stream the stored entries, oldest first."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def _split(entry: Dict[str, Any]):
+        record = dict(entry)
+        text = record.pop('response', None)
+        digest = None
+        if isinstance(text, str):
+            digest = response_hash(text)
+            record['response_hash'] = digest
+        return record, digest, text
+
+
+class MemorySink(LogSink):
+    """
+    In-memory sink. With ``max_entries`` it is a ring buffer keeping only the newest entries;
+    response texts no longer referenced by any kept entry are dropped with them.
+    """
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        """
+        :param max_entries: Maximum number of entries kept (None for unbounded).
+        :raises ValueError: If max_entries is not positive.
+        """
+        if max_entries is not None and (not isinstance(max_entries, int) or max_entries < 1):
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries: Optional[int] = max_entries
+        self._entries: deque = deque()
+        self._responses: Dict[str, str] = {}
+        self._refs: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        record, digest, text = self._split(entry)
+        with self._lock:
+            if digest is not None:
+                self._responses.setdefault(digest, text)
+                self._refs[digest] += 1
+            self._entries.append(record)
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._release(self._entries.popleft())
+
+    def _release(self, record: Dict[str, Any]) -> None:
+        digest = record.get('response_hash')
+        if digest is None:
+            return
+        self._refs[digest] -= 1
+        if self._refs[digest] <= 0:
+            del self._refs[digest]
+            self._responses.pop(digest, None)
+
+    def _resolve(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        entry = dict(record)
+        digest = entry.get('response_hash')
+        if digest is not None:
+            entry['response'] = self._responses.get(digest)
+        return entry
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            records = list(self._entries)
+        for record in records:
+            yield self._resolve(record)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._resolve(self._entries[index])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def num_responses(self) -> int:
+        """Number of distinct response texts held."""
+        return len(self._responses)
+
+
+class JSONLSink(LogSink):
+    """
+    Append-only JSONL sink. Each distinct response is written once as a
+    {"type": "response"} record before the first entry that refers to it.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        :param path: File to append to; existing records are kept and counted.
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._seen: set = set()
+        self._count: int = 0
+        if os.path.exists(path):
+            for record in self._records():
+                if record.get('type') == 'response':
+                    self._seen.add(record['hash'])
+                else:
+                    self._count += 1
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        record, digest, text = self._split(entry)
+        with self._lock:
+            if digest is not None and digest not in self._seen:
+                self._seen.add(digest)
+                self._file.write(json.dumps({'type': 'response', 'hash': digest, 'text': text}) + '\n')
+            self._file.write(json.dumps({'type': 'entry', **record}, default=str) + '\n')
+            self._count += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        responses: Dict[str, str] = {}
+        for record in self._records():
+            if record.pop('type', 'entry') == 'response':
+                responses[record['hash']] = record['text']
+                continue
+            digest = record.get('response_hash')
+            if digest is not None:
+                record['response'] = responses.get(digest)
+            yield record
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class SQLiteSink(LogSink):
+    """
+    SQLite sink with a deduplicated responses table. Iteration streams rows from a cursor.
+    """
+    def __init__(self, path: str = ':memory:') -> None:
+        """
+        :param path: SQLite database path.
+        """
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses (hash TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL, response_hash TEXT)"
+        )
+        self._conn.commit()
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        record, digest, text = self._split(entry)
+        with self._lock:
+            if digest is not None:
+                self._conn.execute("INSERT OR IGNORE INTO responses (hash, text) VALUES (?, ?)", (digest, text))
+            self._conn.execute(
+                "INSERT INTO entries (data, response_hash) VALUES (?, ?)", (json.dumps(record, default=str), digest)
+            )
+            self._conn.commit()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.data, r.text FROM entries e LEFT JOIN responses r ON e.response_hash = r.hash ORDER BY e.id"
+            ).fetchall() if self.path == ':memory:' else None
+        if rows is None:
+            # A separate read connection streams rows without holding the writer lock
+            reader = sqlite3.connect(self.path)
+            try:
+                cursor = reader.execute(
+                    "SELECT e.data, r.text FROM entries e LEFT JOIN responses r ON e.response_hash = r.hash ORDER BY e.id"
+                )
+                for data, text in cursor:
+                    yield self._row(data, text)
+            finally:
+                reader.close()
+            return
+        for data, text in rows:
+            yield self._row(data, text)
+
+    @staticmethod
+    def _row(data: str, text: Optional[str]) -> Dict[str, Any]:
+        entry = json.loads(data)
+        if entry.get('response_hash') is not None:
+            entry['response'] = text
+        return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def num_responses(self) -> int:
+        """Number of distinct response texts stored."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
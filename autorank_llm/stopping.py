@@ -0,0 +1,144 @@
+# stopping.py
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from .scoring import ScoreMatrix, aggregate_totals
+
+logger = logging.getLogger(__name__)
+
+
+class EarlyStopping:
+    """
+    Adaptive judge budget. After every batch of judgements the collected scores are
+    bootstrapped, resampling (judge, candidate, task) cells with Poisson weights and
+    re-aggregating each replicate. This gives confidence intervals on every model's skill
+    and the probability that each model ranks above each other one.
+
+    A pair's ordering is settled once that probability reaches ``confidence`` either way.
+    Candidates whose relevant pairs are all settled get no further generations or judge
+    calls, though they keep judging others. The run stops once every relevant pair is
+    settled. With ``top_k`` only the pairs involving the current top k matter; otherwise
+    every pair does.
+    """
+    def __init__(
+        self,
+        confidence: float = 0.95,
+        top_k: Optional[int] = None,
+        num_bootstrap: int = 200,
+        min_judgements: int = 4,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        :param confidence: Probability at which an ordering counts as settled, and the coverage of the intervals.
+        :param top_k: Only settle the order of the top k models and their separation from the rest (None for the full ranking).
+        :param num_bootstrap: Bootstrap replicates per update.
+        :param min_judgements: Judgements every candidate receives before it can be settled.
+        :param seed: Optional random seed for the bootstrap.
+        :raises ValueError: If input is invalid.
+        """
+        if not 0.5 < confidence < 1.0:
+            raise ValueError("confidence must be between 0.5 and 1.")
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            raise ValueError("top_k must be a positive integer.")
+        if not isinstance(num_bootstrap, int) or num_bootstrap < 10:
+            raise ValueError("num_bootstrap must be an integer of at least 10.")
+        if not isinstance(min_judgements, int) or min_judgements < 1:
+            raise ValueError("min_judgements must be a positive integer.")
+        self.confidence: float = confidence
+        self.top_k: Optional[int] = top_k
+        self.num_bootstrap: int = num_bootstrap
+        self.min_judgements: int = min_judgements
+        self._rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the estimates of a previous run."""
+        self.names: List[str] = []
+        self.skills: Optional[np.ndarray] = None
+        self.lower: Optional[np.ndarray] = None
+        self.upper: Optional[np.ndarray] = None
+        self.win_probability: Optional[np.ndarray] = None
+        # Candidates still being judged; None means all of them
+        self.active: Optional[Set[str]] = None
+        self.stopped: bool = False
+        self.skipped: Dict[str, int] = {'generations': 0, 'judgements': 0}
+
+    def bootstrap(self, scores: ScoreMatrix, method: str = 'weighted', sparse: bool = False) -> np.ndarray:
+        """
+        :param scores: The collected scores.
+        :param method: Aggregator used for every replicate.
+        :param sparse: Whether judge leniency is removed before aggregating.
+        :return: Replicate skills, shape (num_bootstrap, models).
+        """
+        sums, counts = scores.sums, scores.counts
+        replicates = np.empty((self.num_bootstrap, scores.num_models))
+        start = self.skills
+        for b in range(self.num_bootstrap):
+            weights = self._rng.poisson(1.0, size=counts.shape)
+            replicates[b], _ = aggregate_totals(
+                (sums * weights).sum(axis=2), (counts * weights).sum(axis=2), method, skills=start, sparse=sparse
+            )
+        return replicates
+
+    def _relevant(self, skills: np.ndarray) -> np.ndarray:
+        """:return: Boolean (models, models) mask of the pairs whose order must be settled."""
+        n = skills.size
+        if self.top_k is None or self.top_k >= n:
+            relevant = np.ones((n, n), dtype=bool)
+        else:
+            top = np.zeros(n, dtype=bool)
+            top[np.argsort(-skills, kind='stable')[:self.top_k]] = True
+            relevant = top[:, None] | top[None, :]
+        np.fill_diagonal(relevant, False)
+        return relevant
+
+    def update(self, scores: ScoreMatrix, method: str = 'weighted', sparse: bool = False) -> bool:
+        """
+        Re-estimate skills, intervals and settled pairs from the scores collected so far.
+        :param scores: The collected scores.
+        :param method: Aggregator, as in LLMEvaluator.
+        :param sparse: Whether judge leniency is removed before aggregating.
+        :return: True once every relevant ordering is settled and the run can stop.
+        """
+        self.names = list(scores.names)
+        if scores.num_models < 2 or scores.num_tasks == 0:
+            return False
+        received = scores.counts.sum(axis=(0, 2))
+        sums, counts = scores.pair_totals()
+        self.skills, _ = aggregate_totals(sums, counts, method, sparse=sparse)
+        replicates = self.bootstrap(scores, method, sparse)
+        alpha = (1.0 - self.confidence) / 2
+        self.lower, self.upper = np.quantile(replicates, [alpha, 1.0 - alpha], axis=0)
+        above = (replicates[:, :, None] > replicates[:, None, :]).mean(axis=0)
+        ties = (replicates[:, :, None] == replicates[:, None, :]).mean(axis=0)
+        self.win_probability = above + 0.5 * ties
+        settled = (self.win_probability >= self.confidence) | (self.win_probability <= 1.0 - self.confidence)
+        open_pairs = self._relevant(self.skills) & ~settled
+        undecided = open_pairs.any(axis=0) | open_pairs.any(axis=1) | (received < self.min_judgements)
+        self.active = {name for name, flag in zip(self.names, undecided) if flag}
+        self.stopped = not self.active
+        logger.debug("Early stopping: %d of %d candidates still undecided", len(self.active), len(self.names))
+        return self.stopped
+
+    def is_active(self, name: str) -> bool:
+        """:return: Whether a candidate still needs generations and judgements."""
+        return self.active is None or name in self.active
+
+    def summary(self) -> Dict[str, Any]:
+        """:return: JSON-serializable state: whether the run stopped, intervals, settled candidates and skipped calls."""
+        intervals = {}
+        if self.lower is not None:
+            intervals = {
+                name: [round(float(low), 3), round(float(high), 3)]
+                for name, low, high in zip(self.names, self.lower, self.upper)
+            }
+        return {
+            'stopped': self.stopped,
+            'confidence': self.confidence,
+            'top_k': self.top_k,
+            'intervals': intervals,
+            'settled': [name for name in self.names if not self.is_active(name)],
+            'skipped': dict(self.skipped),
+        }
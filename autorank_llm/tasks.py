@@ -0,0 +1,156 @@
+# tasks.py
+import json
+import logging
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    """
+    A single benchmark prompt.
+    """
+    def __init__(self, task_id: str, prompt: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        :param task_id: Unique identifier of the task within its suite.
+        :param prompt: The prompt the LLMs are asked to perform.
+        :param metadata: Optional extra fields (category, reference answer, ...).
+        :raises ValueError: If input is invalid.
+        """
+        if not prompt or not isinstance(prompt, str):
+            raise ValueError("Task prompt must be a non-empty string.")
+        self.task_id: str = str(task_id)
+        self.prompt: str = prompt
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+
+    @classmethod
+    def from_record(cls, record: Union[str, Dict[str, Any]], index: int) -> 'Task':
+        """
+        Build a task from a plain string or a dict with 'prompt' (or 'task') and optional 'id'.
+        :param record: The raw record.
+        :param index: Position in the suite, used as the id when none is given.
+        :return: Task instance.
+        :raises ValueError: If the record has no prompt.
+        """
+        if isinstance(record, str):
+            return cls(str(index), record)
+        if not isinstance(record, dict):
+            raise ValueError(f"Task record {index} must be a string or a dict.")
+        fields = dict(record)
+        prompt = fields.pop('prompt', None)
+        alias = fields.pop('task', None)
+        prompt = prompt or alias
+        task_id = fields.pop('id', index)
+        return cls(task_id, prompt, fields)
+
+    def __repr__(self) -> str:
+        return f"Task({self.task_id!r}, {self.prompt!r})"
+
+
+class TaskSuite:
+    """
+    A re-iterable collection of tasks. File-backed suites are streamed lazily,
+    so a suite of any size is never held in memory at once.
+    """
+    def __init__(self, source: Callable[[], Iterable[Any]], name: str = 'suite') -> None:
+        """
+        :param source: Zero-argument callable returning a fresh iterable of raw records on each call.
+        :param name: Name of the suite, used in reports.
+        :raises ValueError: If the suite is empty, a record is invalid or two tasks share an id.
+        """
+        self._source: Callable[[], Iterable[Any]] = source
+        self.name: str = name
+        self._validate()
+
+    def _validate(self) -> None:
+        """Stream the suite once, keeping only the ids, since responses, scores and checkpoints are keyed by them."""
+        seen = set()
+        for task in self:
+            if task.task_id in seen:
+                raise ValueError(f"Duplicate task id '{task.task_id}' in suite '{self.name}'.")
+            seen.add(task.task_id)
+        if not seen:
+            raise ValueError(f"Task suite '{self.name}' is empty.")
+
+    @classmethod
+    def from_list(cls, tasks: List[Union[str, Dict[str, Any]]], name: str = 'suite') -> 'TaskSuite':
+        """
+        :param tasks: List of prompt strings or task dicts.
+        :param name: Name of the suite.
+        :return: TaskSuite instance.
+        :raises ValueError: If the list is empty.
+        """
+        if not isinstance(tasks, list) or not tasks:
+            raise ValueError("tasks must be a non-empty list.")
+        records = list(tasks)
+        return cls(lambda: records, name)
+
+    @classmethod
+    def from_jsonl(cls, path: str, name: Optional[str] = None) -> 'TaskSuite':
+        """
+        Load a suite from a JSONL file with one task per line.
+        :param path: Path to the JSONL file.
+        :param name: Name of the suite (defaults to the path).
+        :return: TaskSuite instance.
+        """
+        def read() -> Iterator[Any]:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        return cls(read, name or path)
+
+    @classmethod
+    def from_yaml(cls, path: str, name: Optional[str] = None) -> 'TaskSuite':
+        """
+        Load a suite from a YAML file. Each document may be a single task, a list of tasks,
+        or a mapping with a 'tasks' list; multi-document files are streamed one document at a time.
+        :param path: Path to the YAML file.
+        :param name: Name of the suite (defaults to the path).
+        :return: TaskSuite instance.
+        :raises ImportError: If PyYAML is not installed.
+        """
+        # YAML support is optional and only imported when needed
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML task suites require PyYAML (pip install pyyaml).")
+
+        def read() -> Iterator[Any]:
+            with open(path, encoding='utf-8') as f:
+                for document in yaml.safe_load_all(f):
+                    if isinstance(document, dict) and 'tasks' in document:
+                        document = document['tasks']
+                    if isinstance(document, list):
+                        yield from document
+                    elif document is not None:
+                        yield document
+        return cls(read, name or path)
+
+    @classmethod
+    def from_file(cls, path: str, name: Optional[str] = None) -> 'TaskSuite':
+        """Load a suite from a .jsonl or .yaml/.yml file based on its extension."""
+        if path.endswith(('.yaml', '.yml')):
+            return cls.from_yaml(path, name)
+        return cls.from_jsonl(path, name)
+
+    def __iter__(self) -> Iterator[Task]:
+        for index, record in enumerate(self._source()):
+            yield Task.from_record(record, index)
+
+    def chunks(self, size: int) -> Iterator[List[Task]]:
+        """
+        Stream the suite in lists of at most ``size`` tasks.
+        :param size: Maximum number of tasks per chunk.
+        :return: Iterator over task lists.
+        :raises ValueError: If size is not positive.
+        """
+        if not isinstance(size, int) or size < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+        iterator = iter(self)
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
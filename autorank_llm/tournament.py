@@ -0,0 +1,157 @@
+# tournament.py
+import logging
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .scoring import converge_bradley_terry, normalize
+
+logger = logging.getLogger(__name__)
+
+
+class SwissTournament:
+    """
+    Pairwise tournament: instead of scoring responses one by one, a neutral judge (a third
+    model) picks the better of two responses to the same task. Each round pairs models with
+    neighbours of similar rating, avoiding rematches, so ``ceil(log2 N)`` rounds of N/2
+    matches order the pool with O(N log N) comparisons per task instead of the O(N²) of
+    all-pairs judging. Elo ratings are updated online as each verdict arrives and drive the
+    next round's pairings; the final skills are the Elo ratings or a Bradley-Terry fit over
+    every verdict.
+    """
+    RATINGS = ('elo', 'bradley_terry')
+
+    def __init__(
+        self,
+        rounds: Optional[int] = None,
+        k_factor: float = 32.0,
+        rating: str = 'elo',
+        judges_per_match: int = 1,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        :param rounds: Number of Swiss rounds (default: ceil(log2 N) for N models).
+        :param k_factor: Elo K-factor: the largest rating change a single verdict can cause.
+        :param rating: Final skills from 'elo' ratings or a 'bradley_terry' fit over all verdicts.
+        :param judges_per_match: Neutral judges deciding each match on each task.
+        :param seed: Optional random seed for first-round pairings and judge tie-breaks.
+        :raises ValueError: If input is invalid.
+        """
+        if rounds is not None and (not isinstance(rounds, int) or rounds < 1):
+            raise ValueError("rounds must be a positive integer.")
+        if k_factor <= 0:
+            raise ValueError("k_factor must be positive.")
+        if rating not in self.RATINGS:
+            raise ValueError(f"rating must be one of {self.RATINGS}.")
+        if not isinstance(judges_per_match, int) or judges_per_match < 1:
+            raise ValueError("judges_per_match must be a positive integer.")
+        self.rounds: Optional[int] = rounds
+        self.k_factor: float = k_factor
+        self.rating: str = rating
+        self.judges_per_match: int = judges_per_match
+        self.rng: random.Random = random.Random(seed)
+        self.reset([])
+
+    def reset(self, names: List[str]) -> None:
+        """
+        Start a new tournament.
+        :param names: Names of the competing models, which also act as judges.
+        :raises ValueError: If there are fewer than three models, leaving no neutral judge.
+        """
+        if names and len(names) < 3:
+            raise ValueError("A tournament needs at least three models, so every match has a neutral judge.")
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.elo: Dict[str, float] = {name: 1000.0 for name in self.names}
+        n = len(self.names)
+        self.wins: np.ndarray = np.zeros((n, n))
+        self.meetings: np.ndarray = np.zeros((n, n), dtype=np.int64)
+        self.load: Dict[str, int] = {name: 0 for name in self.names}
+        self.rounds_played: int = 0
+        self.comparisons: int = 0
+        # Random seeding, so first-round pairings do not follow the config order
+        self._seeding: Dict[str, float] = {name: self.rng.random() for name in self.names}
+
+    def num_rounds(self, num_models: Optional[int] = None) -> int:
+        """:return: Number of Swiss rounds for a pool of this size (default: the current pool)."""
+        n = len(self.names) if num_models is None else num_models
+        return self.rounds or max(1, math.ceil(math.log2(max(n, 2))))
+
+    def expected_comparisons(self, num_models: int) -> int:
+        """:return: Judge calls per task over the whole tournament."""
+        return self.num_rounds(num_models) * (num_models // 2) * min(self.judges_per_match, num_models - 2)
+
+    def standings(self) -> List[str]:
+        """:return: Model names from the highest Elo rating down."""
+        return sorted(self.names, key=lambda name: (-self.elo[name], self._seeding[name]))
+
+    def pairings(self) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Pair each model, from the top of the standings down, with the closest-rated unpaired
+        model it has met least often. With an odd pool the lowest-ranked unpaired model sits out.
+        :return: Tuple of (pairs, the model with a bye or None).
+        """
+        unpaired = self.standings()
+        pairs: List[Tuple[str, str]] = []
+        while len(unpaired) > 1:
+            first = unpaired.pop(0)
+            row = self.meetings[self.index[first]]
+            # Stable on standings order, so among equally fresh opponents the closest in rating wins
+            opponent = min(unpaired, key=lambda name: row[self.index[name]])
+            unpaired.remove(opponent)
+            pairs.append((first, opponent))
+        return pairs, (unpaired[0] if unpaired else None)
+
+    def judges(self, a: str, b: str) -> List[str]:
+        """:return: The neutral judges for a match, least used first."""
+        others = [name for name in self.names if name not in (a, b)]
+        self.rng.shuffle(others)
+        chosen = sorted(others, key=lambda name: self.load[name])[:self.judges_per_match]
+        for name in chosen:
+            self.load[name] += 1
+        return chosen
+
+    def update(self, a: str, b: str, outcome: float) -> None:
+        """
+        Apply one verdict.
+        :param a: First model.
+        :param b: Second model.
+        :param outcome: 1.0 if a won, 0.0 if b won, 0.5 for a tie.
+        """
+        expected = 1.0 / (1.0 + 10.0 ** ((self.elo[b] - self.elo[a]) / 400.0))
+        change = self.k_factor * (outcome - expected)
+        self.elo[a] += change
+        self.elo[b] -= change
+        i, j = self.index[a], self.index[b]
+        self.wins[i, j] += outcome
+        self.wins[j, i] += 1.0 - outcome
+        self.meetings[i, j] += 1
+        self.meetings[j, i] += 1
+        self.comparisons += 1
+
+    def remove(self, name: str) -> None:
+        """Drop a model and every verdict involving it."""
+        keep = [i for i, other in enumerate(self.names) if other != name]
+        self.names = [self.names[i] for i in keep]
+        self.index = {other: i for i, other in enumerate(self.names)}
+        self.wins = self.wins[np.ix_(keep, keep)]
+        self.meetings = self.meetings[np.ix_(keep, keep)]
+        for store in (self.elo, self.load, self._seeding):
+            store.pop(name, None)
+
+    def skills(self) -> np.ndarray:
+        """:return: Skills on a 0-100 scale, aligned with ``names``."""
+        if self.rating == 'bradley_terry' and self.comparisons:
+            return converge_bradley_terry(self.wins)[0]
+        return normalize(np.array([self.elo[name] for name in self.names]))
+
+    def summary(self) -> Dict[str, Any]:
+        """:return: JSON-serializable state: rounds played, comparisons and Elo ratings."""
+        return {
+            'rounds': self.rounds_played,
+            'comparisons': self.comparisons,
+            'rating': self.rating,
+            'elo': {name: round(self.elo[name], 1) for name in self.standings()},
+        }
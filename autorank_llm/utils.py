@@ -1,9 +1,14 @@
 # utils.py
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from .scoring import ScoreMatrix
 
 logger = logging.getLogger(__name__)
 
+
 def normalize_skill_levels(llms: List[Any]) -> None:
     """
     Normalize the skill levels of LLM instances to a 0-100 scale.
@@ -21,6 +26,7 @@ def normalize_skill_levels(llms: List[Any]) -> None:
         else:
             llm.skill_level = 50
 
+
 def rank_llms(llms: List[Any]) -> List[Any]:
     """
     Rank LLM instances based on their skill levels.
@@ -36,49 +42,231 @@ def rank_llms(llms: List[Any]) -> List[Any]:
         logger.info(f"Rank {rank}: {llm.name} with skill level {llm.skill_level:.2f}")
     return sorted_llms
 
+
 # Explainability, fairness, and robustness utilities
 
-def explainability_report(logs: List[Dict[str, Any]]) -> str:
+
+def iter_explainability_report(logs: Iterable[Dict[str, Any]]) -> Iterator[str]:
     """
-    Generate a human-readable explainability report from logs.
-    :param logs: List of explainability log dicts.
-    :return: String report.
+    Lazily generate the explainability report one entry at a time.
+    :param logs: Iterable of explainability log dicts, e.g. a LogSink.
+    :return: Iterator over report lines.
     """
-    report = ["Explainability Report:"]
+    yield "Explainability Report:"
     for entry in logs:
-        report.append(
+        yield (
             f"Iteration {entry['iteration']}: {entry['evaluator']} evaluated {entry['evaluatee']} on task '{entry['task']}'\n"
             f"  Response: {entry['response']}\n  Score: {entry['score']}  Weighted: {entry['weighted_score']}"
         )
-    return '\n'.join(report)
 
-def check_bias_and_fairness(llms: List[Any], logs: List[Dict[str, Any]]) -> Dict[str, str]:
+
+def write_explainability_report(logs: Iterable[Dict[str, Any]], stream: TextIO) -> None:
     """
-    Bias and fairness analysis (future feature).
+    Stream the explainability report to a file-like object without building it in memory.
+    :param logs: Iterable of explainability log dicts, e.g. a LogSink.
+    :param stream: Text stream to write to.
+    """
+    for line in iter_explainability_report(logs):
+        stream.write(line + '\n')
 
-    :param llms: List of LLM instances.
-    :param logs: List of evaluation logs.
-    :return: Dict with bias/fairness metrics.
-    :raises NotImplementedError: This feature is not yet implemented
+
+def explainability_report(logs: Iterable[Dict[str, Any]]) -> str:
     """
-    raise NotImplementedError(
-        "Bias and fairness analysis is planned for a future release. "
-        "Follow https://github.com/acebot712/autorank-llm for updates."
-    )
+    Generate a human-readable explainability report from logs.
+    :param logs: Iterable of explainability log dicts.
+    :return: String report.
+    """
+    return '\n'.join(iter_explainability_report(logs))
+
 
-def check_robustness(llms: List[Any], logs: List[Dict[str, Any]]) -> Dict[str, str]:
+def _score_matrix(llms: List[Any], logs: Union[Iterable[Dict[str, Any]], ScoreMatrix]) -> ScoreMatrix:
+    """
+    :return: The logs as a ScoreMatrix, built in one scan and one vectorized insert; a ScoreMatrix is used as is.
     """
-    Robustness analysis (future feature).
+    if isinstance(logs, ScoreMatrix):
+        return logs
+    judges: List[str] = []
+    candidates: List[str] = []
+    task_ids: List[str] = []
+    scores: List[float] = []
+    for entry in logs:
+        if entry.get('score') is None:
+            continue
+        judges.append(entry['evaluator'])
+        candidates.append(entry['evaluatee'])
+        task_ids.append(str(entry.get('task_id', entry.get('task'))))
+        scores.append(entry['score'])
+    names = list(dict.fromkeys([llm.name for llm in llms or []] + judges + candidates))
+    if not names:
+        raise ValueError("No models to analyse: pass the LLMs or a non-empty log.")
+    matrix = ScoreMatrix(names)
+    matrix.add_many(judges, candidates, task_ids, scores)
+    return matrix
 
-    :param llms: List of LLM instances.
-    :param logs: List of evaluation logs.
-    :return: Dict with robustness metrics.
-    :raises NotImplementedError: This feature is not yet implemented
+
+def _value(x: float) -> Optional[float]:
+    return None if np.isnan(x) else round(float(x), 6)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """:return: numerator / denominator, NaN where the denominator is zero."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+def _orderings(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    raise NotImplementedError(
-        "Robustness analysis is planned for a future release. "
-        "Follow https://github.com/acebot712/autorank-llm for updates."
+    :param rows: Scores, shape (rows, candidates); NaN where unscored.
+    :return: Tuple of (sign of every candidate pair's difference, whether both were scored),
+        each of shape (rows, candidates, candidates).
+    """
+    observed = ~np.isnan(rows)
+    values = np.nan_to_num(rows)
+    signs = np.sign(values[:, :, None] - values[:, None, :])
+    both = (observed[:, :, None] & observed[:, None, :]).astype(float)
+    return signs * both, both
+
+
+def _kendall(signs: np.ndarray, both: np.ndarray, other_signs: np.ndarray, other_both: np.ndarray) -> np.ndarray:
+    """:return: Kendall tau-a between every row of one set of orderings and every row of another, over pairs both scored."""
+    concordant = np.einsum('icd,jcd->ij', signs, other_signs)
+    comparable = np.einsum('icd,jcd->ij', both, other_both) - np.einsum('icc,jcc->ij', both, other_both)
+    return _ratio(concordant, comparable)
+
+
+def check_bias_and_fairness(
+    llms: List[Any],
+    logs: Union[Iterable[Dict[str, Any]], ScoreMatrix],
+    families: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Judge bias and agreement, computed from the judge × candidate × task scores in one vectorized
+    pass, without calling any model. Every score is compared with the leave-one-out consensus,
+    i.e. the mean score the other judges gave the same candidate on the same task:
+
+    - leniency: a judge's mean offset from the consensus on other models (positive is lenient);
+    - self_preference: how much more a judge favours its own responses than its leniency explains
+      (None for judges that never scored themselves; evaluators normally do not let them);
+    - family_preference: with ``families``, a judge's mean offset on other models of its own family
+      minus its offset on models of other families;
+    - kendall_tau: rank agreement of every pair of judges over the candidates both scored, and its mean;
+    - krippendorff_alpha: interval Krippendorff's alpha over (candidate, task) units, 1 for perfect agreement.
+
+    :param llms: LLM instances, whose names fix the model order (may be empty when logs is a ScoreMatrix).
+    :param logs: Explainability entries with 'evaluator', 'evaluatee', 'task_id' and 'score', e.g. a LogSink,
+        or an evaluator's ScoreMatrix.
+    :param families: Optional model name to family name, e.g. {'llama3-8b': 'llama', 'llama3-70b': 'llama'}.
+    :return: JSON-serializable dict of the metrics above, keyed by model name.
+    :raises ValueError: If there are no models.
+    """
+    matrix = _score_matrix(llms, logs)
+    names = matrix.names
+    sums, counts = matrix.sums, matrix.counts
+    cells = _ratio(sums, counts)
+    # Leave-one-out consensus for every (judge, candidate, task) cell
+    consensus = _ratio(sums.sum(axis=0)[None] - sums, counts.sum(axis=0)[None] - counts)
+    residual = np.nan_to_num(cells - consensus)
+    weights = np.where(np.isnan(cells - consensus), 0, counts)
+    by_pair_residual = (weights * residual).sum(axis=2)
+    by_pair_weight = weights.sum(axis=2)
+
+    self_mask = np.eye(len(names), dtype=bool)
+    leniency = _ratio(
+        np.where(self_mask, 0, by_pair_residual).sum(axis=1), np.where(self_mask, 0, by_pair_weight).sum(axis=1)
     )
+    self_preference = _ratio(np.diagonal(by_pair_residual), np.diagonal(by_pair_weight)) - leniency
+
+    means = matrix.pair_means()
+    signs, both = _orderings(means)
+    tau = _kendall(signs, both, signs, both)
+    off_diagonal = tau[~self_mask]
+
+    report: Dict[str, Any] = {
+        'leniency': {name: _value(leniency[i]) for i, name in enumerate(names)},
+        'self_preference': {name: _value(self_preference[i]) for i, name in enumerate(names)},
+        'kendall_tau': {
+            name: {other: _value(tau[i, j]) for j, other in enumerate(names) if j != i} for i, name in enumerate(names)
+        },
+        'mean_kendall_tau': _value(np.nanmean(off_diagonal)) if (~np.isnan(off_diagonal)).any() else None,
+        'krippendorff_alpha': _krippendorff_alpha(cells),
+    }
+    if families is not None:
+        family = np.array([families.get(name, name) for name in names])
+        same = (family[:, None] == family[None, :]) & ~self_mask
+        other = family[:, None] != family[None, :]
+        preference = (
+            _ratio(np.where(same, by_pair_residual, 0).sum(axis=1), np.where(same, by_pair_weight, 0).sum(axis=1))
+            - _ratio(np.where(other, by_pair_residual, 0).sum(axis=1), np.where(other, by_pair_weight, 0).sum(axis=1))
+        )
+        report['family_preference'] = {name: _value(preference[i]) for i, name in enumerate(names)}
+    return report
+
+
+def _krippendorff_alpha(cells: np.ndarray) -> Optional[float]:
+    """
+    Interval Krippendorff's alpha with judges as coders and (candidate, task) cells as units.
+    :param cells: Mean score per (judge, candidate, task); NaN where the judge did not score the cell.
+    :return: Alpha, or None when no unit has two scores.
+    """
+    observed = ~np.isnan(cells)
+    values = np.nan_to_num(cells)
+    per_unit = observed.sum(axis=0)
+    pairable = per_unit >= 2
+    if not pairable.any():
+        return None
+    m = per_unit[pairable]
+    s1 = values.sum(axis=0)[pairable]
+    s2 = (values * values).sum(axis=0)[pairable]
+    n = m.sum()
+    disagreement = (2 * (m * s2 - s1 * s1) / (m - 1)).sum() / n
+    expected = 2 * (n * s2.sum() - s1.sum() ** 2) / (n * (n - 1))
+    if expected <= 0:
+        return 1.0
+    return round(float(1.0 - disagreement / expected), 6)
+
+
+def check_robustness(llms: List[Any], logs: Union[Iterable[Dict[str, Any]], ScoreMatrix]) -> Dict[str, Any]:
+    """
+    Stability of the scores and the ranking, computed from the judge × candidate × task scores in
+    one vectorized pass, without calling any model. Rankings here order models by mean score received.
+
+    - score_variance: sample variance of the scores a judge gave one candidate on one task over
+      repeated samples and rounds, pooled overall, per candidate and per judge (None without repeats);
+    - judge_influence: Kendall tau between the ranking and the ranking without each judge's scores
+      (1.0 means the judge changes nothing);
+    - task_agreement: Kendall tau between each task's ranking and the overall ranking.
+
+    :param llms: LLM instances, whose names fix the model order (may be empty when logs is a ScoreMatrix).
+    :param logs: Explainability entries with 'evaluator', 'evaluatee', 'task_id' and 'score', e.g. a LogSink,
+        or an evaluator's ScoreMatrix.
+    :return: JSON-serializable dict of the metrics above, keyed by model name or task id.
+    :raises ValueError: If there are no models.
+    """
+    matrix = _score_matrix(llms, logs)
+    names = matrix.names
+    sums, squares, counts = matrix.sums, matrix.squares, matrix.counts
+    repeated = counts >= 2
+    # Sum of squared deviations from each cell's mean, and its degrees of freedom
+    deviations = np.where(repeated, squares - _ratio(sums * sums, counts), 0.0)
+    freedom = np.where(repeated, counts - 1, 0)
+    variance = {
+        'pooled': _value(_ratio(deviations.sum(), freedom.sum())),
+        'by_candidate': dict(zip(names, map(_value, _ratio(deviations.sum(axis=(0, 2)), freedom.sum(axis=(0, 2)))))),
+        'by_judge': dict(zip(names, map(_value, _ratio(deviations.sum(axis=(1, 2)), freedom.sum(axis=(1, 2)))))),
+    }
+
+    given_sums, given_counts = matrix.pair_totals()
+    overall = _ratio(given_sums.sum(axis=0), given_counts.sum(axis=0))
+    without = _ratio(given_sums.sum(axis=0)[None] - given_sums, given_counts.sum(axis=0)[None] - given_counts)
+    reference = _orderings(overall[None])
+    influence = _kendall(*_orderings(without), *reference)[:, 0]
+    by_task = _kendall(*_orderings(matrix.task_means()), *reference)[:, 0]
+    return {
+        'score_variance': variance,
+        'judge_influence': {name: _value(influence[i]) for i, name in enumerate(names)},
+        'task_agreement': {task_id: _value(by_task[t]) for t, task_id in enumerate(matrix.task_ids)},
+    }
+
 
 def generate_challenges(llm: Any, num_challenges: int = 5, topic: str = "general") -> List[str]:
     """
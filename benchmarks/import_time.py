@@ -0,0 +1,72 @@
+"""
+Import-time benchmark.
+
+Times each statement in a fresh interpreter, several times, and reports the median
+wall time. Backend SDKs (LangChain) must not be imported by any of these.
+
+    python benchmarks/import_time.py --repeat 10
+    python benchmarks/import_time.py --json --max-ms 250   # exit 1 if any median is slower
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    'python': 'pass',
+    'import autorank_llm': 'import autorank_llm',
+    'from autorank_llm.scoring import aggregate': 'from autorank_llm.scoring import aggregate',
+    'from autorank_llm import LLMEvaluator': 'from autorank_llm import LLMEvaluator',
+    "LLM('a', 'llama2', 'ollama')": "from autorank_llm import LLM; LLM('a', 'llama2', 'ollama')",
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in sys.modules if name.split('.')[0] in ('langchain_community', 'langchain_openai', 'langchain_huggingface'))
+print(elapsed, ','.join(heavy))
+"""
+
+
+def measure(statement, repeat):
+    timings, heavy = [], ''
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(statement=statement)],
+            check=True, capture_output=True, text=True
+        ).stdout.split()
+        timings.append(float(output[0]) * 1000.0)
+        heavy = output[1] if len(output) > 1 else ''
+    return statistics.median(timings), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    parser.add_argument('--max-ms', type=float, default=None, help="Fail if any median exceeds this")
+    args = parser.parse_args()
+
+    results = []
+    for label, statement in STATEMENTS.items():
+        median_ms, heavy = measure(statement, args.repeat)
+        results.append({'statement': label, 'median_ms': round(median_ms, 2), 'backend_modules': heavy})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'statement':<46}{'median ms':>10}  backend SDKs imported")
+        for row in results:
+            print(f"{row['statement']:<46}{row['median_ms']:>10.1f}  {row['backend_modules'] or '-'}")
+
+    if args.max_ms is not None and any(row['median_ms'] > args.max_ms for row in results):
+        sys.exit(1)
+    if any(row['backend_modules'] for row in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Rank quality vs. judge calls for the pairing schedulers and the Swiss tournament.
+
+Simulates a pool of models with known quality and judges with their own leniency and
+noise, fills a ScoreMatrix according to each scheduler, aggregates it, and reports the
+Kendall tau against the true ordering together with the number of judge calls. The
+tournament rows play pairwise comparisons instead, where judge leniency cancels out.
+No model is called, so the script runs in seconds.
+
+    python benchmarks/pairing_tradeoff.py --models 40 --tasks 20 --k 2 4 8
+"""
+import argparse
+import json
+
+import numpy as np
+
+from autorank_llm.scheduling import (
+    ActiveSamplingScheduler,
+    AllPairsScheduler,
+    RandomRegularScheduler,
+    RoundRobinScheduler
+)
+from autorank_llm.scoring import ScoreMatrix, aggregate, kendall_tau
+from autorank_llm.tournament import SwissTournament
+
+
+def simulate(scheduler, quality, leniency, noise, num_tasks, rounds, rng, sparse):
+    names = [f"m{i}" for i in range(len(quality))]
+    scores = ScoreMatrix(names)
+    calls = 0
+    per_round = max(1, num_tasks // rounds)
+    for start in range(0, num_tasks, per_round):
+        judges, candidates, task_ids, values = [], [], [], []
+        for task in range(start, min(num_tasks, start + per_round)):
+            difficulty = rng.normal(0, 0.5)
+            for candidate, assigned in scheduler.assign(names, scores).items():
+                c = scores.index[candidate]
+                for judge in assigned:
+                    j = scores.index[judge]
+                    value = quality[c] + leniency[j] - difficulty + rng.normal(0, noise)
+                    judges.append(judge)
+                    candidates.append(candidate)
+                    task_ids.append(str(task))
+                    values.append(float(np.clip(value, 1, 9)))
+        scores.add_many(judges, candidates, task_ids, values)
+        calls += len(values)
+    skills, _ = aggregate(scores, 'weighted', threshold=1e-3, sparse=sparse)
+    return calls, kendall_tau(skills, quality)
+
+
+def simulate_tournament(tournament, quality, noise, num_tasks, rng):
+    names = [f"m{i}" for i in range(len(quality))]
+    tournament.reset(names)
+    calls = 0
+    for _ in range(tournament.num_rounds()):
+        pairs, _ = tournament.pairings()
+        for a, b in pairs:
+            i, j = tournament.index[a], tournament.index[b]
+            for _ in range(num_tasks):
+                for _ in tournament.judges(a, b):
+                    margin = quality[i] - quality[j] + rng.normal(0, noise) - rng.normal(0, noise)
+                    tournament.update(a, b, 1.0 if margin > 0 else 0.0)
+                    calls += 1
+        tournament.rounds_played += 1
+    return calls, kendall_tau(tournament.skills(), quality)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--models', type=int, default=40)
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--k', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--rounds', type=int, default=4, help="Rounds the active scheduler adapts over")
+    parser.add_argument('--noise', type=float, default=1.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    quality = rng.uniform(3, 8, args.models)
+    leniency = rng.normal(0, 1, args.models)
+
+    schedulers = [('all_pairs', AllPairsScheduler(), False)]
+    for k in args.k:
+        schedulers.append((f'round_robin_k{k}', RoundRobinScheduler(k), True))
+        schedulers.append((f'random_regular_k{k}', RandomRegularScheduler(k, seed=args.seed), True))
+        schedulers.append((f'active_k{k}', ActiveSamplingScheduler(k, seed=args.seed), True))
+
+    results = []
+    for name, scheduler, sparse in schedulers:
+        calls, tau = simulate(
+            scheduler, quality, leniency, args.noise, args.tasks, args.rounds, np.random.default_rng(args.seed), sparse
+        )
+        results.append({'scheduler': name, 'judge_calls': calls, 'kendall_tau': round(tau, 4)})
+    for rating in SwissTournament.RATINGS:
+        tournament = SwissTournament(rating=rating, seed=args.seed)
+        calls, tau = simulate_tournament(tournament, quality, args.noise, args.tasks, np.random.default_rng(args.seed))
+        results.append({'scheduler': f'swiss_{rating}', 'judge_calls': calls, 'kendall_tau': round(tau, 4)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    baseline = results[0]['judge_calls']
+    print(f"{'scheduler':<22}{'judge calls':>12}{'% of all-pairs':>16}{'kendall tau':>13}")
+    for row in results:
+        share = 100.0 * row['judge_calls'] / baseline
+        print(f"{row['scheduler']:<22}{row['judge_calls']:>12}{share:>15.1f}%{row['kendall_tau']:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
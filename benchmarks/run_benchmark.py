@@ -0,0 +1,120 @@
+"""
+Offline end-to-end benchmark of LLMEvaluator on a synthetic model pool.
+
+Runs the full evaluation pipeline against SyntheticBackend models with a known
+ground-truth quality and simulated latency, and reports wall time, backend calls
+per second, peak memory and ranking accuracy (Kendall tau, top-1) per scenario.
+Results can be saved as a JSON baseline and later runs compared against it.
+
+    python benchmarks/run_benchmark.py --models 8 16 --tasks 4 --mode serial thread async
+    python benchmarks/run_benchmark.py --latency-mean 0.05 --batched
+    python benchmarks/run_benchmark.py --save benchmarks/baselines/default.json
+    python benchmarks/run_benchmark.py --compare benchmarks/baselines/default.json
+"""
+import argparse
+import json
+import logging
+import sys
+
+from autorank_llm.policy import CallPolicy
+from autorank_llm.simulation import run_benchmark
+
+
+def scenario_key(row):
+    return (
+        row['num_models'], row['num_tasks'], row['evaluator_kwargs'].get('execution_mode', 'serial'),
+        row.get('backend', 'synthetic')
+    )
+
+
+def compare(results, baseline, throughput_tolerance, accuracy_tolerance):
+    """:return: List of regression messages for scenarios present in both runs."""
+    previous = {scenario_key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get(scenario_key(row))
+        if old is None:
+            continue
+        label = "models={} tasks={} mode={} backend={}".format(*scenario_key(row))
+        if old['calls_per_s'] and row['calls_per_s'] < old['calls_per_s'] * (1 - throughput_tolerance):
+            regressions.append(f"{label}: calls/s {row['calls_per_s']} < baseline {old['calls_per_s']}")
+        if row['kendall_tau'] < old['kendall_tau'] - accuracy_tolerance:
+            regressions.append(f"{label}: kendall tau {row['kendall_tau']} < baseline {old['kendall_tau']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--models', type=int, nargs='+', default=[8, 16])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[4])
+    parser.add_argument('--mode', nargs='+', default=['serial', 'thread', 'async'])
+    parser.add_argument('--max-concurrency', type=int, default=16)
+    parser.add_argument('--latency', default='lognormal', choices=['constant', 'uniform', 'lognormal'])
+    parser.add_argument('--latency-mean', type=float, default=0.0, help="Mean simulated latency per call, in seconds")
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--max-retries', type=int, default=0, help="Retry transient failures through a CallPolicy")
+    parser.add_argument('--batched', action='store_true', help="Simulate a server with batched inference")
+    parser.add_argument('--backend-batch-size', type=int, default=8, help="Prompts per batched call with --batched")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory', action='store_true', help="Trace peak memory (slows the run)")
+    parser.add_argument('--save', help="Write the results to this JSON baseline file")
+    parser.add_argument('--compare', help="Compare against this JSON baseline and exit 1 on regressions")
+    parser.add_argument('--throughput-tolerance', type=float, default=0.3, help="Allowed relative drop in calls/s")
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.05, help="Allowed absolute drop in Kendall tau")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    # Simulated failures are logged by the evaluator; keep the report readable
+    logging.disable(logging.ERROR if args.failure_rate else logging.NOTSET)
+
+    backend_params = {
+        'latency': args.latency,
+        'latency_mean': args.latency_mean,
+        'failure_rate': args.failure_rate,
+    }
+    backend = 'synthetic_batched' if args.batched else 'synthetic'
+    extra = {'backend_batch_size': args.backend_batch_size} if args.batched else {}
+    if args.max_retries:
+        extra['call_policies'] = {backend: CallPolicy(max_retries=args.max_retries, backoff_base=0.01)}
+    results = []
+    for num_models in args.models:
+        for num_tasks in args.tasks:
+            for mode in args.mode:
+                results.append(run_benchmark(
+                    num_models, num_tasks, seed=args.seed, backend_params=backend_params,
+                    trace_memory=args.memory, backend=backend, execution_mode=mode,
+                    max_concurrency=args.max_concurrency, **extra
+                ))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{'models':>7}{'tasks':>7}{'mode':>8}{'calls':>8}{'wall s':>9}"
+            f"{'calls/s':>10}{'peak MB':>9}{'tau':>7}{'top1':>6}"
+        )
+        for row in results:
+            peak = '-' if row['peak_memory_mb'] is None else f"{row['peak_memory_mb']:.2f}"
+            print(
+                f"{row['num_models']:>7}{row['num_tasks']:>7}{row['evaluator_kwargs']['execution_mode']:>8}"
+                f"{row['calls']:>8}{row['wall_time_s']:>9.3f}{row['calls_per_s']:>10.1f}{peak:>9}"
+                f"{row['kendall_tau']:>7.3f}{'yes' if row['top1_correct'] else 'no':>6}"
+            )
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.throughput_tolerance, args.accuracy_tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import unittest
+from autorank_llm.budget import BudgetExceededError, TokenBudget, count_tokens, truncate_tokens
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.models import LLM
+from autorank_llm.simulation import synthetic_model_configs
+
+TASKS = [f'task {i}' for i in range(6)]
+
+
+class WordTokenizer:
+    """Whitespace tokenizer with the encode/decode interface of tiktoken encodings."""
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return ' '.join(tokens)
+
+
+class TestTruncation(unittest.TestCase):
+    """Test token counting and truncation."""
+
+    def test_default_counter(self):
+        """Test that plain counters truncate to the longest prefix within the limit."""
+        text = 'x' * 100
+        self.assertEqual(count_tokens(text), 25)
+        self.assertEqual(truncate_tokens(text, 30), text)
+        self.assertEqual(truncate_tokens(text, 5), 'x' * 23 + ' [...]')
+
+    def test_encode_decode_tokenizer(self):
+        """Test head and middle truncation with an encode/decode tokenizer."""
+        text = ' '.join(str(i) for i in range(10))
+        self.assertEqual(truncate_tokens(text, 3, WordTokenizer()), '0 1 2 [...]')
+        self.assertEqual(truncate_tokens(text, 4, WordTokenizer(), 'middle'), '0 1 [...] 8 9')
+
+    def test_budget_counts_truncations(self):
+        """Test that the budget counts cut texts by kind and leaves short ones alone."""
+        budget = TokenBudget(tokenizer=WordTokenizer(), truncation='middle')
+        self.assertEqual(budget.truncate('a b c', 3, 'judge_inputs'), 'a b c')
+        self.assertEqual(budget.truncate('a b c d e', 2, 'judge_inputs'), 'a [...] e')
+        self.assertEqual(budget.truncate('a b c', None), 'a b c')
+        self.assertEqual(budget.truncated, {'generations': 0, 'judge_inputs': 1})
+
+
+class TestTokenBudget(unittest.TestCase):
+    """Test usage accounting and hard limits."""
+
+    def test_invalid(self):
+        """Test that invalid budgets are rejected."""
+        for kwargs in ({'max_tokens': 0}, {'max_run_tokens': -5}, {'max_cost': 0}, {'truncation': 'tail'},
+                       {'degrade_at': 0.5}, {'max_run_tokens': 10, 'degrade_at': 1.5}):
+            with self.assertRaises(ValueError):
+                TokenBudget(**kwargs)
+
+    def test_usage_and_cost(self):
+        """Test per-model tokens and cost, priced by name or model name."""
+        budget = TokenBudget(tokenizer=WordTokenizer(), prices={'gpt': (1.0, 2.0), 'b': (10.0, 0.0)})
+        budget.charge('a', 'gpt', 'one two', 'three four five')
+        budget.charge('a', 'gpt', 'one', None)
+        budget.charge('b', 'gpt', 'one two three', 'four')
+        summary = budget.summary()
+        self.assertEqual(summary['models']['a'], {'calls': 2, 'prompt_tokens': 3, 'completion_tokens': 3, 'cost': 9e-6})
+        self.assertEqual(summary['models']['b']['cost'], 3e-5)
+        self.assertEqual(summary['tokens'], 10)
+        self.assertFalse(summary['exhausted'])
+
+    def test_hard_limit_and_degrade(self):
+        """Test that caps halve past degrade_at and calls fail fast once the limit is spent."""
+        budget = TokenBudget(max_tokens=10, max_judge_tokens=7, max_run_tokens=10, degrade_at=0.5,
+                             tokenizer=WordTokenizer())
+        budget.charge('a', 'a', 'one two', 'three')
+        self.assertEqual((budget.generation_limit, budget.judge_limit), (10, 7))
+        budget.check('a')
+        budget.charge('a', 'a', 'one two', 'three four')
+        self.assertEqual((budget.generation_limit, budget.judge_limit), (5, 3))
+        budget.charge('a', 'a', 'one two three', '')
+        self.assertTrue(budget.exhausted)
+        with self.assertRaises(BudgetExceededError):
+            budget.check('a')
+        self.assertEqual(budget.summary()['skipped_calls'], 1)
+        budget.reset()
+        self.assertFalse(budget.exhausted)
+
+    def test_llm_generation_cap(self):
+        """Test that perform_task caps responses, and that skipped calls return None."""
+        llm = LLM('m', 'm', backend='synthetic', params={'response_length': 100})
+        self.assertEqual(llm.perform_task('task', max_tokens=5), '[synthetic:m:q=0.5000] [...]')
+        budget = TokenBudget(max_tokens=5, max_run_tokens=1)
+        llm = LLM('m', 'm', backend='synthetic', params={'response_length': 100}, budget=budget)
+        self.assertTrue(llm.perform_task('task').endswith(' [...]'))
+        self.assertIsNone(llm.perform_task('task'))
+        self.assertEqual(budget.summary()['models']['m']['calls'], 1)
+        self.assertEqual(budget.truncated['generations'], 1)
+
+    def test_backend_max_tokens_argument(self):
+        """Test that backends with a max-tokens argument receive the generation cap."""
+        budget = TokenBudget(max_tokens=64)
+        self.assertEqual(LLM('m', 'llama3', backend='ollama', budget=budget).llm.kwargs, {'num_predict': 64})
+        llm = LLM('m', 'gpt', backend='openai', params={'max_tokens': 8}, budget=budget)
+        self.assertEqual(llm.llm.kwargs, {'max_tokens': 8})
+
+
+class TestBudgetedEvaluation(unittest.TestCase):
+    """Test token budgets in a full run."""
+
+    def setUp(self):
+        self.configs = synthetic_model_configs(4, seed=0, judge_noise=0.0, response_length=200)
+
+    def run_with(self, budget, **kwargs):
+        return LLMEvaluator(self.configs, TASKS, token_budget=budget, **kwargs).evaluate_llms()
+
+    def test_judge_inputs_are_capped(self):
+        """Test that capping judge inputs shrinks judge prompts without changing the scores."""
+        full = self.run_with(TokenBudget())
+        capped = self.run_with(TokenBudget(max_judge_tokens=16))
+        self.assertEqual(capped['task_breakdown'], full['task_breakdown'])
+        self.assertEqual(capped['token_budget']['truncated']['judge_inputs'], 4 * 3 * len(TASKS))
+        self.assertLess(capped['token_budget']['tokens'], full['token_budget']['tokens'] / 2)
+
+    def test_hard_budget_stops_the_run(self):
+        """Test that a spent budget ends the run gracefully with the scores collected so far."""
+        full = self.run_with(TokenBudget())['token_budget']['tokens']
+        results = self.run_with(TokenBudget(max_run_tokens=full // 3), task_chunk_size=1, rounds=2)
+        summary = results['token_budget']
+        self.assertTrue(summary['stopped'])
+        self.assertTrue(summary['exhausted'])
+        self.assertLess(summary['tokens'], full / 2)
+        self.assertEqual(len(results['rankings']), 4)
+        self.assertTrue(results['task_breakdown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
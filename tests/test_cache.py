@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+import unittest
+from autorank_llm.cache import CacheMissError, ResponseCache
+from autorank_llm.models import LLM, LLMEvaluationHelper, ModelRegistry
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache storage and eviction."""
+
+    def test_make_key_depends_on_every_field(self):
+        """Test that keys change with backend, model, prompt and params."""
+        base = ResponseCache.make_key('ollama', 'llama2', 'hi', {'temperature': 0})
+        self.assertEqual(base, ResponseCache.make_key('ollama', 'llama2', 'hi', {'temperature': 0}))
+        self.assertNotEqual(base, ResponseCache.make_key('openai', 'llama2', 'hi', {'temperature': 0}))
+        self.assertNotEqual(base, ResponseCache.make_key('ollama', 'mistral', 'hi', {'temperature': 0}))
+        self.assertNotEqual(base, ResponseCache.make_key('ollama', 'llama2', 'hello', {'temperature': 0}))
+        self.assertNotEqual(base, ResponseCache.make_key('ollama', 'llama2', 'hi', {'temperature': 1}))
+
+    def test_hit_and_miss_counters(self):
+        """Test that get_or_call only calls on a miss and counts both outcomes."""
+        cache = ResponseCache()
+        calls = []
+        for _ in range(3):
+            cache.get_or_call('k', lambda: calls.append(1) or 'value')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'entries': 1})
+
+    def test_max_entries_evicts_least_recently_used(self):
+        """Test LRU eviction once max_entries is exceeded."""
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', '1')
+        time.sleep(0.01)
+        cache.put('b', '2')
+        time.sleep(0.01)
+        cache.get('a')
+        cache.put('c', '3')
+        self.assertEqual(cache.get('a'), '1')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_max_age_expires_entries(self):
+        """Test that stale entries are treated as misses."""
+        cache = ResponseCache(max_age=0.01)
+        cache.put('a', '1')
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+
+    def test_persistence_and_replay(self):
+        """Test that a replay cache reuses stored responses and never calls the model."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite')
+            cache = ResponseCache(path)
+            cache.put('a', '1')
+            cache.close()
+
+            replay = ResponseCache(path, replay=True)
+            self.assertEqual(replay.get_or_call('a', lambda: 'fresh'), '1')
+            with self.assertRaises(CacheMissError):
+                replay.get_or_call('b', lambda: 'fresh')
+            replay.put('b', '2')
+            self.assertEqual(replay.stats()['entries'], 1)
+            replay.close()
+
+    def test_writes_are_group_committed(self):
+        """Test that hits and puts are committed together on flush, not one by one, and survive close."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite')
+            cache = ResponseCache(path, commit_interval=3600)
+            self.assertEqual(cache._conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            cache.put('a', '1')
+            cache.flush()
+            accessed = cache._conn.execute("SELECT accessed_at FROM responses").fetchone()[0]
+            time.sleep(0.01)
+            cache.get('a')
+            cache.put('b', '2')
+            other = ResponseCache(path, replay=True)
+            self.assertIsNone(other.get('b'))
+            cache.flush()
+            self.assertEqual(other.get('b'), '2')
+            touched = other._conn.execute("SELECT accessed_at FROM responses WHERE key = 'a'").fetchone()[0]
+            self.assertGreater(touched, accessed)
+            cache.put('c', '3')
+            cache.close()
+            self.assertEqual(other.get('c'), '3')
+            other.close()
+
+
+class TestLLMCaching(unittest.TestCase):
+    """Test that LLM calls go through the cache."""
+
+    def setUp(self):
+        """Register a backend that counts its calls."""
+        test = self
+
+        class CountingBackend:
+            def __init__(self, model_name, **kwargs):
+                self.kwargs = kwargs
+
+            def __call__(self, prompt):
+                test.calls += 1
+                return "Rated 6"
+
+        self.calls = 0
+        ModelRegistry.register('cached_mock', CountingBackend)
+
+    def test_generation_and_judging_are_cached(self):
+        """Test that repeated generations and judgements are served from the cache."""
+        cache = ResponseCache()
+        llm = LLM('a', 'model', backend='cached_mock', params={'temperature': 0}, cache=cache)
+        self.assertEqual(llm.llm.kwargs, {'temperature': 0})
+        for _ in range(2):
+            llm.perform_task('task')
+            LLMEvaluationHelper.evaluate(llm, 'task', 'response')
+        self.assertEqual(self.calls, 2)
+        llm.perform_task('task', sample=1)
+        self.assertEqual(self.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
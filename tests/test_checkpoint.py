@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from autorank_llm.checkpoint import Checkpoint
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.models import ModelRegistry
+from autorank_llm.scheduling import RandomRegularScheduler
+from autorank_llm.tasks import TaskSuite
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-run."""
+
+
+class CrashingBackend:
+    """Quality-scoring backend that crashes once its call budget is spent."""
+    quality = {'a': 3, 'b': 5, 'c': 8}
+    calls = 0
+    budget = None
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, prompt):
+        if CrashingBackend.budget is not None and CrashingBackend.calls >= CrashingBackend.budget:
+            raise Crash()
+        CrashingBackend.calls += 1
+        for name, value in self.quality.items():
+            if f"'{name} answer'" in prompt:
+                return f"Score: {value}"
+        return f"{self.model_name} answer"
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test the checkpoint store."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.ckpt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_and_reopen(self):
+        """Test that recorded calls and metadata survive reopening."""
+        checkpoint = Checkpoint(self.path)
+        checkpoint.record(
+            1,
+            generations=[('t1', 'a', 0, 'hello')],
+            judgements=[('t1', 'b', 'a', 'abc', 7.0)],
+            assignments=[('t1', [('b', 'a')])]
+        )
+        checkpoint.set(completed_rounds=1, skills={'a': 40.0})
+        checkpoint.close()
+        checkpoint = Checkpoint(self.path)
+        self.assertEqual(checkpoint.generations(1, ['t1', 't2']), {('t1', 'a', 0): 'hello'})
+        self.assertEqual(checkpoint.generations(2, ['t1']), {})
+        self.assertEqual(checkpoint.judgements(1, ['t1']), {('t1', 'b', 'a', 'abc'): 7.0})
+        self.assertEqual(checkpoint.assignment(1, 't1'), [('b', 'a')])
+        self.assertEqual(checkpoint.get('skills'), {'a': 40.0})
+        self.assertIsNone(checkpoint.get('missing'))
+        self.assertEqual(checkpoint.stats(), {'generations': 1, 'judgements': 1})
+        checkpoint.close()
+
+    def test_many_task_ids(self):
+        """Test that lookups over more task ids than SQLite binds in one statement are split into chunks."""
+        checkpoint = Checkpoint(self.path)
+        task_ids = [f"t{i}" for i in range(2500)]
+        checkpoint.record(
+            1,
+            generations=[(task_id, 'a', 0, task_id) for task_id in task_ids],
+            judgements=[(task_id, 'b', 'a', 'abc', 5.0) for task_id in task_ids[::2]]
+        )
+        generations = checkpoint.generations(1, task_ids)
+        self.assertEqual(len(generations), 2500)
+        self.assertEqual(generations[('t1999', 'a', 0)], 't1999')
+        self.assertEqual(len(checkpoint.judgements(1, task_ids)), 1250)
+        self.assertEqual(checkpoint.generations(1, []), {})
+        checkpoint.close()
+
+
+class TestResume(unittest.TestCase):
+    """Test resuming an interrupted evaluation."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.ckpt')
+        ModelRegistry.register('crashing', CrashingBackend)
+        CrashingBackend.calls = 0
+        CrashingBackend.budget = None
+        self.configs = [{'name': name, 'model_name': name, 'backend': 'crashing'} for name in ('a', 'b', 'c')]
+        self.tasks = ['one', 'two', 'three']
+
+    def tearDown(self):
+        CrashingBackend.budget = None
+        self.tmp.cleanup()
+
+    def _crash_after(self, budget, **kwargs):
+        CrashingBackend.budget = budget
+        evaluator = LLMEvaluator(
+            self.configs, self.tasks, task_chunk_size=1, threshold=1e-3, checkpoint=Checkpoint(self.path), **kwargs
+        )
+        with self.assertRaises(Crash):
+            evaluator.evaluate_llms()
+        evaluator.checkpoint.close()
+        CrashingBackend.budget = None
+
+    def test_resume_reissues_only_missing_calls(self):
+        """Test that a resumed run makes exactly the calls the crashed run did not record."""
+        total = 3 * 3 + 3 * 6
+        self._crash_after(14)
+        recorded = Checkpoint(self.path).stats()
+        done = recorded['generations'] + recorded['judgements']
+        self.assertGreater(done, 0)
+        self.assertLess(done, total)
+
+        CrashingBackend.calls = 0
+        results = LLMEvaluator.resume(self.path)
+        self.assertEqual(CrashingBackend.calls, total - done)
+        ranked = sorted(results['rankings'], key=lambda llm: llm.skill_level, reverse=True)
+        self.assertEqual([llm.name for llm in ranked], ['c', 'b', 'a'])
+        self.assertEqual(len(results['explainability_log']), 18)
+
+        # A finished run resumes without any calls
+        CrashingBackend.calls = 0
+        LLMEvaluator.resume(self.path)
+        self.assertEqual(CrashingBackend.calls, 0)
+
+    def test_resume_keeps_sparse_assignments(self):
+        """Test that a resumed sparse run judges the pairs recorded before the crash."""
+        self._crash_after(12, pairing=RandomRegularScheduler(1, seed=0))
+        CrashingBackend.calls = 0
+        evaluator = LLMEvaluator.from_checkpoint(self.path, pairing=RandomRegularScheduler(1, seed=1))
+        results = evaluator.evaluate_llms()
+        recorded = evaluator.checkpoint.stats()
+        self.assertEqual(recorded, {'generations': 9, 'judgements': 9})
+        self.assertEqual(len(results['explainability_log']), 9)
+
+    def test_checkpoint_validation(self):
+        """Test that a checkpoint refuses a different model pool and needs a suite it cannot store."""
+        LLMEvaluator(self.configs, self.tasks, checkpoint=Checkpoint(self.path))
+        with self.assertRaises(ValueError):
+            LLMEvaluator(self.configs[:2], self.tasks, checkpoint=Checkpoint(self.path))
+        suite_path = os.path.join(self.tmp.name, 'suite.ckpt')
+        LLMEvaluator(self.configs, TaskSuite.from_list(self.tasks), checkpoint=Checkpoint(suite_path))
+        with self.assertRaises(ValueError):
+            LLMEvaluator.from_checkpoint(suite_path)
+        evaluator = LLMEvaluator.from_checkpoint(suite_path, task=TaskSuite.from_list(self.tasks))
+        self.assertEqual(len(evaluator.llms), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+import unittest
+from autorank_llm.concurrency import BatchSpec, Call, ExecutionEngine, ModelAffinity
+
+
+class TestExecutionEngine(unittest.TestCase):
+    """Test the ExecutionEngine execution modes."""
+
+    def test_invalid_arguments(self):
+        """Test that the engine validates inputs."""
+        with self.assertRaises(ValueError):
+            ExecutionEngine(mode='gpu')
+        with self.assertRaises(ValueError):
+            ExecutionEngine(max_concurrency=0)
+        with self.assertRaises(ValueError):
+            ExecutionEngine(backend_limits={'ollama': 0})
+        with self.assertRaises(ValueError):
+            ExecutionEngine(max_batch_size=0)
+
+    def test_results_keep_submission_order(self):
+        """Test that every mode returns results in submission order."""
+        for mode in ExecutionEngine.MODES:
+            engine = ExecutionEngine(mode=mode, max_concurrency=4)
+            calls = [Call('mock', lambda i=i: (time.sleep(0.001 * (5 - i)), i)[1]) for i in range(5)]
+            self.assertEqual(engine.map(calls), [0, 1, 2, 3, 4])
+
+    def test_async_mode_prefers_coroutines(self):
+        """Test that async mode awaits the native coroutine when available."""
+        async def native():
+            return 'async'
+
+        engine = ExecutionEngine(mode='async')
+        results = engine.map([Call('mock', lambda: 'sync', native), Call('mock', lambda: 'sync')])
+        self.assertEqual(results, ['async', 'sync'])
+
+    def test_async_mode_inside_running_loop(self):
+        """Test that blocking map refuses to run inside an event loop and amap can be awaited there."""
+        engine = ExecutionEngine(mode='async')
+
+        async def inside():
+            with self.assertRaises(RuntimeError):
+                engine.map([Call('mock', lambda: 'sync')])
+            return await engine.amap([Call('mock', lambda: 'sync')])
+
+        self.assertEqual(asyncio.run(inside()), ['sync'])
+
+    def test_backend_limit_is_respected(self):
+        """Test that per-backend limits cap the calls in flight."""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def work():
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+
+        for mode in ('thread', 'async'):
+            state['peak'] = 0
+            engine = ExecutionEngine(mode=mode, max_concurrency=8, backend_limits={'slow': 2})
+            engine.map([Call('slow', work) for _ in range(8)])
+            self.assertLessEqual(state['peak'], 2)
+            self.assertGreaterEqual(state['peak'], 1)
+
+    def test_limited_backend_does_not_starve_others(self):
+        """Test that calls queued on a backend at its limit do not hold workers needed by other backends."""
+        for mode in ('thread', 'async'):
+            calls = [Call('slow', lambda: time.sleep(0.05)) for _ in range(3)] + [Call('free', lambda: 'done')] * 4
+            seen = []
+            engine = ExecutionEngine(mode=mode, max_concurrency=2, backend_limits={'slow': 1})
+            engine.map(calls, on_result=lambda index, result: seen.append(index))
+            self.assertEqual(sorted(seen), list(range(7)))
+            # The free calls run beside the first slow call instead of queueing behind the others
+            self.assertEqual(sorted(seen[:4]), [3, 4, 5, 6])
+
+    def test_batchable_calls_are_coalesced(self):
+        """Test that calls sharing a batch key are merged up to the batch size and results stay in order."""
+        for mode in ExecutionEngine.MODES:
+            batches = []
+
+            def run_batch(items):
+                batches.append(list(items))
+                return [item * 10 for item in items]
+
+            calls = [
+                Call('mock', lambda i=i: i * 10, batch=BatchSpec('key', i, run_batch)) for i in range(5)
+            ] + [Call('mock', lambda: 'single')]
+            engine = ExecutionEngine(mode=mode, max_concurrency=4, max_batch_size=2)
+            self.assertEqual(engine.map(calls), [0, 10, 20, 30, 40, 'single'])
+            self.assertEqual(sorted(batches), [[0, 1], [2, 3]])
+            self.assertEqual(ExecutionEngine(mode=mode).map(calls[:2]), [0, 10])
+
+    def test_results_are_reported_as_they_complete(self):
+        """Test that on_result sees every call once, batched or not, before map returns, in completion order."""
+        for mode in ExecutionEngine.MODES:
+            calls = [
+                Call('mock', lambda i=i: (time.sleep(0.002 * (4 - i)), i)[1]) for i in range(4)
+            ] + [Call('mock', lambda i=i: i, batch=BatchSpec('key', i, lambda items: list(items))) for i in (4, 5)]
+            seen = []
+            engine = ExecutionEngine(mode=mode, max_concurrency=8, max_batch_size=2)
+            results = engine.map(calls, on_result=lambda index, result: seen.append((index, result)))
+            self.assertEqual(sorted(seen), list(enumerate(results)))
+            if mode != 'serial':
+                # The slowest call was submitted first and finishes last
+                self.assertEqual(seen[-1], (0, 0))
+            waves = ExecutionEngine(mode=mode, affinity=ModelAffinity())
+            seen = []
+            waves.map(model_calls(['a', 'b', 'a'])[0], on_result=lambda index, result: seen.append(index))
+            self.assertEqual(sorted(seen), [0, 1, 2])
+
+
+def model_calls(models, log=None):
+    """One call per entry in models, recording the order in which the calls run."""
+    log = [] if log is None else log
+    return [
+        Call('ollama', lambda i=i, m=m: (log.append(m), i)[1], labels={'model': m, 'role': 'judge'})
+        for i, m in enumerate(models)
+    ], log
+
+
+class TestModelAffinity(unittest.TestCase):
+    """Test call reordering by model."""
+
+    def test_invalid_arguments(self):
+        """Test that capacities must be positive."""
+        with self.assertRaises(ValueError):
+            ModelAffinity(resident_models=0)
+        with self.assertRaises(ValueError):
+            ModelAffinity(capacities={'gpu': 0})
+
+    def test_groups_calls_and_keeps_results(self):
+        """Test that each model's calls run together, in their own order, with results in submission order."""
+        for mode in ExecutionEngine.MODES:
+            affinity = ModelAffinity()
+            calls, log = model_calls(['a', 'b', 'a', 'c', 'b', 'a'])
+            results = ExecutionEngine(mode=mode, max_concurrency=2, affinity=affinity).map(calls)
+            self.assertEqual(results, [0, 1, 2, 3, 4, 5])
+            self.assertEqual(log, ['a', 'a', 'a', 'b', 'b', 'c'])
+            self.assertEqual(affinity.counts['loads'], 3)
+            self.assertEqual(affinity.counts['naive_loads'], 6)
+
+    def test_resident_models_go_first(self):
+        """Test that the model left loaded by the previous batch runs first in the next one."""
+        affinity = ModelAffinity()
+        engine = ExecutionEngine(affinity=affinity)
+        engine.map(model_calls(['a', 'b'])[0])
+        calls, log = model_calls(['a', 'b'])
+        engine.map(calls)
+        self.assertEqual(log, ['b', 'a'])
+        self.assertEqual(affinity.counts['swaps'], 2)
+        self.assertEqual(affinity.stats()['resident'], {'ollama': ['a']})
+
+    def test_waves_follow_capacity_and_hosts(self):
+        """Test that a wave holds at most the resident capacity of each host."""
+        affinity = ModelAffinity(resident_models=2, hosts={'x': 'gpu'}, capacities={'gpu': 1})
+        calls, _ = model_calls(['a', 'b', 'c', 'x', 'a'])
+        calls.append(Call('ollama', lambda: None))
+        waves = affinity.plan(calls)
+        self.assertEqual(waves, [[5], [0, 4, 1, 3], [2]])
+        self.assertEqual(affinity.counts['loads'], 4)
+        self.assertEqual(affinity.counts['swaps'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+from autorank_llm.concurrency import Call, ExecutionEngine
+from autorank_llm.distributed import Coordinator, DistributedEngine, WorkUnit, run_worker
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.models import LLM, ModelRegistry
+from autorank_llm.simulation import synthetic_model_configs
+
+TASKS = ['task 1', 'task 2', 'task 3']
+
+
+class CrashOnceBackend:
+    """Kills its worker process on the first call, leaving a marker so the retry succeeds."""
+    marker = ''
+
+    def __init__(self, model_name):
+        pass
+
+    def __call__(self, prompt):
+        if not os.path.exists(CrashOnceBackend.marker):
+            open(CrashOnceBackend.marker, 'w').close()
+            os._exit(1)
+        return 'Score: 5' if 'Rate the response' in prompt else 'an answer'
+
+
+class TestDistributedEvaluation(unittest.TestCase):
+    """Test sharded evaluation on local worker processes and remote workers."""
+
+    def setUp(self):
+        self.configs = synthetic_model_configs(4, seed=0, judge_noise=0.0)
+
+    def run_distributed(self, cluster_config, remote=None):
+        evaluator = LLMEvaluator(self.configs, TASKS)
+        coordinator = evaluator.enable_distributed(cluster_config)
+        if remote is not None:
+            threading.Thread(target=run_worker, args=(coordinator.address, 'secret', remote), daemon=True).start()
+        try:
+            return evaluator.evaluate_llms(), coordinator.stats()
+        finally:
+            evaluator.disable_distributed()
+
+    def test_matches_single_process(self):
+        """Test that merged worker shards give the same scores and ranking as one process."""
+        expected = LLMEvaluator(self.configs, TASKS).evaluate_llms()
+        results, stats = self.run_distributed({'workers': 2})
+        self.assertEqual(results['task_breakdown'], expected['task_breakdown'])
+        self.assertEqual([llm.name for llm in results['rankings']], [llm.name for llm in expected['rankings']])
+        self.assertEqual(results['failures'], {'generations': 0, 'judgements': 0})
+        # Every model is pinned to one shard, and both shards get work
+        self.assertEqual(sorted(stats['local-0']['models'] + stats['local-1']['models']), [c['name'] for c in self.configs])
+        self.assertEqual(stats['local-0']['units'] + stats['local-1']['units'], 4 * 3 + 4 * 3 * 3)
+
+    def test_remote_worker(self):
+        """Test a shard served by run_worker through the socket broker."""
+        remote = self.configs[0]['name']
+        results, stats = self.run_distributed(
+            {'workers': 1, 'hosts': {'box': [remote]}, 'address': ('127.0.0.1', 0), 'authkey': 'secret'}, remote='box'
+        )
+        self.assertEqual(stats['box']['models'], [remote])
+        self.assertEqual(stats['box']['units'], 3 + 3 * 3)
+        self.assertEqual(results['failures'], {'generations': 0, 'judgements': 0})
+
+    def test_disable_restores_local_engine(self):
+        """Test that disabling stops the workers and later runs stay in process."""
+        evaluator = LLMEvaluator(self.configs, TASKS)
+        coordinator = evaluator.enable_distributed({'workers': 1})
+        with self.assertRaises(ValueError):
+            evaluator.enable_distributed()
+        evaluator.disable_distributed()
+        self.assertTrue(coordinator.closed)
+        self.assertIsNone(evaluator.coordinator)
+        self.assertEqual(len(evaluator.evaluate_llms()['rankings']), 4)
+
+
+class TestCoordinator(unittest.TestCase):
+    """Test worker failure handling."""
+
+    def test_invalid_config(self):
+        """Test that invalid cluster configs are rejected."""
+        for kwargs in ({'workers': 0}, {'workers': -1}, {'hosts': {'box': ['a']}}, {'concurrency': 0}, {'timeout': 0}):
+            with self.assertRaises(ValueError):
+                Coordinator(**kwargs)
+
+    def test_timeout_fails_units(self):
+        """Test that units of a shard no worker serves fail once the timeout passes."""
+        coordinator = Coordinator(workers=0, hosts={'box': ['judge']}, address=('127.0.0.1', 0), timeout=0.5)
+        judge = LLM('judge', 'model', backend='synthetic')
+        try:
+            results = coordinator.run([WorkUnit.generate(judge, 'task', 0), WorkUnit.judge(judge, 'task', ['a', 'b'], None)])
+        finally:
+            coordinator.close()
+        self.assertEqual(results, [None, [None, None]])
+        self.assertEqual(coordinator.stats()['box']['failed'], 2)
+
+    def test_authkey(self):
+        """Test that a remote broker gets a random key by default and rejects workers with the wrong one."""
+        coordinator = Coordinator(workers=0, hosts={'box': ['judge']}, address=('127.0.0.1', 0))
+        other = Coordinator(workers=0, hosts={'box': ['judge']}, address=('127.0.0.1', 0))
+        try:
+            self.assertEqual(len(coordinator.authkey), 64)
+            self.assertNotEqual(coordinator.authkey, other.authkey)
+            with self.assertRaises(multiprocessing.AuthenticationError):
+                run_worker(coordinator.address, other.authkey, 'box')
+        finally:
+            coordinator.close()
+            other.close()
+        with self.assertRaises(ValueError):
+            Coordinator(workers=0, hosts={'box': ['judge']}, address=('127.0.0.1', 0), authkey='')
+
+    def test_local_and_remote_calls_overlap(self):
+        """Test that local calls run while remote units are out, and results merge in submission order."""
+        coordinator = Coordinator(workers=0, hosts={'box': ['judge']}, address=('127.0.0.1', 0))
+        threading.Thread(target=run_worker, args=(coordinator.address, coordinator.authkey, 'box'), daemon=True).start()
+        judge = LLM('judge', 'model', backend='synthetic')
+        remote_done = threading.Event()
+        completed = []
+
+        def on_result(index, result):
+            completed.append(index)
+            if index == 1:
+                remote_done.set()
+
+        # The local call only returns True if the remote unit finishes while it is running
+        calls = [
+            Call('local', lambda: remote_done.wait(10)),
+            Call('synthetic', judge.perform_task, unit=WorkUnit.generate(judge, 'task', 0)),
+            Call('local', lambda: 'second local'),
+        ]
+        engine = DistributedEngine(coordinator, ExecutionEngine())
+        try:
+            results = engine.map(calls, on_result)
+        finally:
+            coordinator.close()
+        self.assertIs(results[0], True)
+        self.assertIsInstance(results[1], str)
+        self.assertEqual(results[2], 'second local')
+        self.assertEqual(sorted(completed), [0, 1, 2])
+        self.assertLess(completed.index(1), completed.index(0))
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs the fork start method")
+    def test_dead_worker_is_replaced(self):
+        """Test that a dead worker's units are resubmitted to the remaining workers."""
+        ModelRegistry.register('crash_once', CrashOnceBackend)
+        with tempfile.TemporaryDirectory() as directory:
+            CrashOnceBackend.marker = os.path.join(directory, 'crashed')
+            coordinator = Coordinator(workers=2, concurrency=1, start_method='fork')
+            llm = LLM('model', 'model', backend='crash_once')
+            try:
+                results = coordinator.run([WorkUnit.generate(llm, 'task', 0)])
+                stats = coordinator.stats()
+            finally:
+                coordinator.close()
+        self.assertEqual(results, ['an answer'])
+        self.assertEqual(sum(1 for shard in stats.values() if shard['alive'] is False), 1)
+        self.assertEqual(coordinator.local_shards, [shard for shard, entry in stats.items() if entry['alive']])
+
+
+if __name__ == '__main__':
+    unittest.main()
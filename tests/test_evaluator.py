@@ -0,0 +1,352 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest import mock
+from autorank_llm.concurrency import ModelAffinity
+from autorank_llm.evaluator import LLMEvaluator, PluginManager
+from autorank_llm.models import ModelRegistry
+from autorank_llm.scheduling import RandomRegularScheduler
+from autorank_llm.simulation import synthetic_model_configs
+from autorank_llm.sinks import MemorySink
+from autorank_llm.tasks import TaskSuite
+
+
+class CountingBackend:
+    """Backend that records every prompt it receives."""
+    calls = []
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, prompt):
+        CountingBackend.calls.append((self.model_name, prompt))
+        if 'JSON object' in prompt:
+            count = prompt.count("Response ")
+            return '{' + ', '.join(f'"{i}": 7' for i in range(1, count + 1)) + '}'
+        if prompt.startswith('Task:'):
+            return "I rate it 7"
+        return f"{self.model_name} answer"
+
+
+class BatchingCountingBackend(CountingBackend):
+    """Counting backend that also accepts batches of prompts."""
+    batch_sizes = []
+
+    def batch(self, prompts):
+        BatchingCountingBackend.batch_sizes.append(len(prompts))
+        return [self(prompt) for prompt in prompts]
+
+
+class QualityBackend:
+    """Backend whose judges rate each model's answer by a fixed quality."""
+    quality = {'a': 3, 'b': 5, 'c': 8}
+    calls = 0
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, prompt):
+        QualityBackend.calls += 1
+        for name, value in self.quality.items():
+            if f"'{name} answer'" in prompt:
+                return f"Score: {value}"
+        return f"{self.model_name} answer"
+
+
+class TestLLMEvaluator(unittest.TestCase):
+    """Test the LLMEvaluator orchestration."""
+
+    def setUp(self):
+        """Register a counting backend and build a three-model evaluator."""
+        CountingBackend.calls = []
+        ModelRegistry.register('counting', CountingBackend)
+        self.configs = [
+            {'name': name, 'model_name': name, 'backend': 'counting'}
+            for name in ('a', 'b', 'c')
+        ]
+
+    def _generation_calls(self):
+        return [call for call in CountingBackend.calls if not call[1].startswith('Task:')]
+
+    def _judge_calls(self):
+        return [call for call in CountingBackend.calls if call[1].startswith('Task:')]
+
+    def test_init_validation(self):
+        """Test that the evaluator validates inputs."""
+        with self.assertRaises(ValueError):
+            LLMEvaluator([], 'task')
+        with self.assertRaises(ValueError):
+            LLMEvaluator(self.configs, '')
+        with self.assertRaises(ValueError):
+            LLMEvaluator(self.configs, 'task', num_samples=0)
+        with self.assertRaises(ValueError):
+            LLMEvaluator(self.configs, 'task', rounds=0)
+        with self.assertRaises(ValueError):
+            LLMEvaluator(self.configs, 'task', aggregator='elo')
+
+    def test_generates_once_per_model(self):
+        """Test that each model generates once per round, not once per judge."""
+        evaluator = LLMEvaluator(self.configs, 'task', debug=True)
+        evaluator.evaluate_llms()
+        self.assertEqual(len(self._generation_calls()), 3)
+        self.assertEqual(len(self._judge_calls()), 6)
+
+    def test_logs_are_plain_data(self):
+        """Test that results and dashboard data carry a bounded list of recent entries and stay JSON-serializable."""
+        evaluator = LLMEvaluator(self.configs, ['one', 'two'], debug=True)
+        evaluator.logger.max_recent = 5
+        results = evaluator.evaluate_llms()
+        self.assertIsInstance(results['explainability_log'], list)
+        self.assertEqual(len(results['explainability_log']), 5)
+        self.assertEqual(results['explainability_count'], 12)
+        self.assertEqual(results['explainability_log'], list(evaluator.log_sink)[-5:])
+        data = json.loads(json.dumps(evaluator.get_dashboard_data()))
+        self.assertEqual(data['explainability_count'], 12)
+
+    def test_num_samples(self):
+        """Test that every judge scores every sample of every peer."""
+        evaluator = LLMEvaluator(self.configs, 'task', debug=True, num_samples=2)
+        results = evaluator.evaluate_llms()
+        self.assertEqual(len(self._generation_calls()), 6)
+        self.assertEqual(len(self._judge_calls()), 12)
+        self.assertEqual(len(results['explainability_log']), 12)
+
+    def test_concurrent_modes_match_serial(self):
+        """Test that thread and async execution issue the same calls as serial mode."""
+        for mode in ('thread', 'async'):
+            CountingBackend.calls = []
+            evaluator = LLMEvaluator(self.configs, 'task', debug=True, execution_mode=mode, max_concurrency=4)
+            results = evaluator.evaluate_llms()
+            self.assertEqual(len(self._generation_calls()), 3)
+            self.assertEqual(len(self._judge_calls()), 6)
+            self.assertEqual([entry['score'] for entry in results['explainability_log']], [7.0] * 6)
+
+    def test_async_mode_inside_running_loop(self):
+        """Test that evaluate_llms raises inside an event loop instead of ranking nothing, and aevaluate_llms works."""
+        evaluator = LLMEvaluator(self.configs, 'task', debug=True, execution_mode='async')
+
+        async def inside():
+            with self.assertRaises(RuntimeError):
+                evaluator.evaluate_llms()
+            return await evaluator.aevaluate_llms()
+
+        results = asyncio.run(inside())
+        self.assertEqual(len(results['rankings']), 3)
+        self.assertEqual(len(results['explainability_log']), 6)
+
+    def test_backend_batching(self):
+        """Test that batch-capable backends receive merged prompts and produce the same scores."""
+        ModelRegistry.register('batching_counting', BatchingCountingBackend)
+        configs = [dict(cfg, backend='batching_counting') for cfg in self.configs]
+        tasks = ['one', 'two', 'three']
+        for mode in ('serial', 'thread', 'async'):
+            BatchingCountingBackend.batch_sizes = []
+            CountingBackend.calls = []
+            evaluator = LLMEvaluator(configs, tasks, execution_mode=mode, backend_batch_size=4, task_chunk_size=3)
+            evaluator.evaluate_llms()
+            # 3 models x 3 tasks generations and 3 x 2 x 3 judgements, in batches of up to 4 per model and role
+            self.assertEqual(sum(BatchingCountingBackend.batch_sizes), 27)
+            self.assertEqual(len(BatchingCountingBackend.batch_sizes), 9)
+            self.assertEqual(evaluator.scores.counts.sum(), 18)
+        unbatched = LLMEvaluator(configs, tasks, backend_batch_size=1)
+        BatchingCountingBackend.batch_sizes = []
+        unbatched.evaluate_llms()
+        self.assertEqual(BatchingCountingBackend.batch_sizes, [])
+        # Batching is opt-in
+        LLMEvaluator(configs, tasks).evaluate_llms()
+        self.assertEqual(BatchingCountingBackend.batch_sizes, [])
+        with self.assertRaises(ValueError):
+            LLMEvaluator(configs, tasks, backend_batch_size=0)
+
+    def test_task_suite(self):
+        """Test that a suite is evaluated in one run with a per-task breakdown."""
+        suite = TaskSuite.from_list([{'id': 'q1', 'prompt': 'one'}, {'id': 'q2', 'prompt': 'two'}, 'three'])
+        evaluator = LLMEvaluator(self.configs, suite, debug=True, task_chunk_size=2, execution_mode='thread')
+        results = evaluator.evaluate_llms()
+        self.assertEqual(len(self._generation_calls()), 9)
+        self.assertEqual(len(self._judge_calls()), 18)
+        self.assertEqual(set(results['task_breakdown']), {'q1', 'q2', '2'})
+        self.assertEqual(results['task_breakdown']['q1'], {'a': 7.0, 'b': 7.0, 'c': 7.0})
+        self.assertEqual({entry['task_id'] for entry in results['explainability_log']}, {'q1', 'q2', '2'})
+
+    def test_list_of_prompts(self):
+        """Test that a plain list of prompts is accepted as a suite."""
+        evaluator = LLMEvaluator(self.configs, ['one', 'two'], debug=True)
+        evaluator.evaluate_llms()
+        self.assertEqual(len(self._generation_calls()), 6)
+
+    def test_batched_judging(self):
+        """Test that each judge scores all peers of a task in one prompt."""
+        evaluator = LLMEvaluator(self.configs, 'task', debug=True, judge_batch_size=8)
+        results = evaluator.evaluate_llms()
+        self.assertEqual(len(self._judge_calls()), 3)
+        self.assertEqual(len(results['explainability_log']), 6)
+        self.assertEqual({entry['score'] for entry in results['explainability_log']}, {7.0})
+
+    def test_rounds_are_collected_once(self):
+        """Test that convergence never triggers extra model calls beyond the sampled rounds."""
+        evaluator = LLMEvaluator(self.configs, 'task', rounds=2)
+        results = evaluator.evaluate_llms()
+        self.assertEqual(len(self._generation_calls()), 6)
+        self.assertEqual(len(self._judge_calls()), 12)
+        self.assertEqual({entry['iteration'] for entry in results['explainability_log']}, {1, 2})
+        self.assertTrue(results['converged'])
+        self.assertEqual(results['iterations'], len(results['convergence_deltas']))
+
+    def test_converges_in_memory_to_quality_order(self):
+        """Test that the ranking follows judge scores and re-converging issues no calls."""
+        ModelRegistry.register('quality', QualityBackend)
+        configs = [{'name': name, 'model_name': name, 'backend': 'quality'} for name in ('a', 'b', 'c')]
+        for aggregator in ('weighted', 'pagerank', 'bradley_terry'):
+            QualityBackend.calls = 0
+            evaluator = LLMEvaluator(configs, 'task', aggregator=aggregator, threshold=1e-3)
+            results = evaluator.evaluate_llms()
+            ranked = sorted(results['rankings'], key=lambda llm: llm.skill_level, reverse=True)
+            self.assertEqual([llm.name for llm in ranked], ['c', 'b', 'a'], aggregator)
+            calls = QualityBackend.calls
+            evaluator.converge()
+            self.assertEqual(QualityBackend.calls, calls)
+
+    def test_sparse_pairing(self):
+        """Test that a k-judge scheduler limits the judge calls per task."""
+        configs = [{'name': str(i), 'model_name': str(i), 'backend': 'counting'} for i in range(6)]
+        evaluator = LLMEvaluator(configs, ['one', 'two'], pairing=RandomRegularScheduler(2, seed=0))
+        results = evaluator.evaluate_llms()
+        self.assertEqual(len(self._judge_calls()), 2 * 6 * 2)
+        self.assertEqual(len(results['rankings']), 6)
+
+    def test_add_and_retire_model(self):
+        """Test that adding a model issues only its O(N) calls and retiring one issues none."""
+        ModelRegistry.register('quality', QualityBackend)
+        configs = [{'name': name, 'model_name': name, 'backend': 'quality'} for name in ('a', 'b', 'c')]
+        with mock.patch.dict(QualityBackend.quality, {'d': 6}):
+            evaluator = LLMEvaluator(configs, ['one', 'two'], threshold=1e-3)
+            evaluator.evaluate_llms()
+            QualityBackend.calls = 0
+            results = evaluator.add_model({'name': 'd', 'model_name': 'd', 'backend': 'quality'})
+            # Per task: one generation, d judges three peers, three peers judge d
+            self.assertEqual(QualityBackend.calls, 2 * (1 + 3 + 3))
+            ranked = sorted(results['rankings'], key=lambda llm: llm.skill_level, reverse=True)
+            self.assertEqual([llm.name for llm in ranked], ['c', 'd', 'b', 'a'])
+            self.assertEqual(evaluator.scores.counts.sum(), 4 * 3 * 2)
+            with self.assertRaises(ValueError):
+                evaluator.add_model({'name': 'd', 'model_name': 'd', 'backend': 'quality'})
+
+            QualityBackend.calls = 0
+            results = evaluator.retire_model('c')
+            self.assertEqual(QualityBackend.calls, 0)
+            self.assertEqual([llm.name for llm in results['rankings']], ['a', 'b', 'd'])
+            self.assertEqual(max(results['rankings'], key=lambda llm: llm.skill_level).name, 'd')
+            with self.assertRaises(ValueError):
+                evaluator.retire_model('c')
+
+    def test_bounded_log_sink(self):
+        """Test that a capped sink bounds the explainability log."""
+        evaluator = LLMEvaluator(self.configs, ['one', 'two'], log_sink=MemorySink(max_entries=4))
+        results = evaluator.evaluate_llms()
+        self.assertEqual(len(results['explainability_log']), 4)
+        self.assertTrue(all(entry['response'].endswith('answer') for entry in results['explainability_log']))
+
+
+class TestModelAffinityEvaluation(unittest.TestCase):
+    """Test that grouping calls by model changes the swap count but not the results."""
+
+    def test_results_match_naive_order(self):
+        configs = synthetic_model_configs(5, seed=0, judge_noise=0.7)
+        tasks = [f"task {i}" for i in range(6)]
+        naive = LLMEvaluator(configs, tasks, task_chunk_size=2).evaluate_llms()
+        grouped = LLMEvaluator(
+            configs, tasks, task_chunk_size=2, model_affinity=ModelAffinity(resident_models=2)
+        ).evaluate_llms()
+        self.assertEqual(grouped['task_breakdown'], naive['task_breakdown'])
+        swaps = grouped['model_affinity']
+        self.assertLess(swaps['swaps'], swaps['naive_swaps'] / 4)
+        self.assertIsNone(naive['model_affinity'])
+
+
+class CountingPlugin:
+    """Plugin counting its runs and, when incremental, the log entries it was given."""
+    def __init__(self, incremental=False, delay=0.0, timeout=None):
+        self.incremental = incremental
+        self.delay = delay
+        if timeout is not None:
+            self.timeout = timeout
+        self.runs = 0
+        self.entries = 0
+
+    def run(self, *args, entries=None, **kwargs):
+        time.sleep(self.delay)
+        self.runs += 1
+        self.entries += len(entries or [])
+        return {'runs': self.runs, 'entries': self.entries}
+
+
+class TestPluginManager(unittest.TestCase):
+    """Test memoized, concurrent and incremental plugin runs."""
+
+    def setUp(self):
+        ModelRegistry.register('counting', CountingBackend)
+        self.configs = [{'name': name, 'model_name': name, 'backend': 'counting'} for name in ('a', 'b', 'c')]
+
+    def test_memoized_until_scores_change(self):
+        """Test that polling an unchanged evaluation reuses plugin results."""
+        evaluator = LLMEvaluator(self.configs, ['one', 'two'])
+        plugin = CountingPlugin()
+        evaluator.register_plugin(plugin)
+        evaluator.evaluate_llms()
+        evaluator.run_plugins()
+        evaluator.get_dashboard_data()
+        self.assertEqual(plugin.runs, 1)
+        evaluator.run_plugins(top_k=3)
+        self.assertEqual(plugin.runs, 2)
+        evaluator.add_model({'name': 'd', 'model_name': 'd', 'backend': 'counting'})
+        self.assertEqual(evaluator.run_plugins(), [{'runs': 3, 'entries': 0}])
+        self.assertEqual(evaluator.plugin_manager.stats['memo_hits'], 1)
+
+    def test_incremental_plugins_get_new_entries(self):
+        """Test that incremental plugins receive each explainability entry once."""
+        evaluator = LLMEvaluator(self.configs, ['one', 'two'], log_sink=MemorySink(max_entries=100))
+        plugin = CountingPlugin(incremental=True)
+        evaluator.register_plugin(plugin)
+        evaluator.evaluate_llms()
+        self.assertEqual(evaluator.run_plugins(), [{'runs': 1, 'entries': 3 * 2 * 2}])
+        evaluator.add_model({'name': 'd', 'model_name': 'd', 'backend': 'counting'})
+        # d judges three peers and is judged by three, on two tasks
+        self.assertEqual(evaluator.run_plugins(), [{'runs': 2, 'entries': 12 + 12}])
+        self.assertEqual(len(evaluator.logger.entries_since(0)[0]), 24)
+
+    def test_thread_pool_with_timeouts(self):
+        """Test that plugins run concurrently and a slow plugin times out without blocking the others."""
+        manager = PluginManager(executor='thread', timeout=2.0)
+        plugins = [CountingPlugin(delay=0.3), CountingPlugin(delay=0.3), CountingPlugin(delay=1.0, timeout=0.1)]
+        for plugin in plugins:
+            manager.register(plugin)
+        started = time.perf_counter()
+        results = manager.run()
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertEqual(results, [{'runs': 1, 'entries': 0}, {'runs': 1, 'entries': 0}, None])
+        self.assertEqual(manager.stats['timeouts'], 1)
+        manager.close()
+
+    def test_failures_and_process_pool(self):
+        """Test that failing plugins yield None and process pools run picklable plugins."""
+        manager = PluginManager()
+        manager.register(lambda: 1 / 0)
+        manager.register(lambda: 'ok')
+        self.assertEqual(manager.run(), [None, 'ok'])
+        self.assertEqual(manager.stats['failures'], 1)
+        manager = PluginManager(executor='process', max_workers=1)
+        with self.assertRaises(ValueError):
+            manager.register(CountingPlugin(incremental=True))
+        manager.register(sum)
+        self.assertEqual(manager.run([1, 2, 3], state_version=0), [6])
+        self.assertEqual(manager.run([1, 2, 3], state_version=0), [6])
+        self.assertEqual(manager.stats['memo_hits'], 1)
+        manager.close()
+        with self.assertRaises(ValueError):
+            PluginManager(executor='async')
+
+
+if __name__ == '__main__':
+    unittest.main()
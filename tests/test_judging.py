@@ -0,0 +1,156 @@
+import unittest
+from autorank_llm.judging import (
+    ScoringProtocol, build_batch_prompt, build_pairwise_prompt, heuristic_score, parse_batch_scores, parse_pairwise_verdict
+)
+from autorank_llm.metrics import Metrics
+from autorank_llm.models import LLM, LLMEvaluationHelper, ModelRegistry
+
+
+class TestBatchJudging(unittest.TestCase):
+    """Test batched judge prompts and score parsing."""
+
+    def test_build_batch_prompt(self):
+        """Test that every response is numbered in the prompt."""
+        prompt = build_batch_prompt('task', ['first', 'second'])
+        self.assertIn("Response 1: 'first'", prompt)
+        self.assertIn("Response 2: 'second'", prompt)
+        with self.assertRaises(ValueError):
+            build_batch_prompt('task', [])
+
+    def test_parse_json_object(self):
+        """Test the JSON object fast path, including surrounding chatter."""
+        self.assertEqual(parse_batch_scores('Sure! {"1": 7, "2": 3.5} Hope that helps.', 2), [7.0, 3.5])
+
+    def test_parse_json_array_and_lines(self):
+        """Test the JSON array and "N: score" fallbacks."""
+        self.assertEqual(parse_batch_scores('[6, 8]', 2), [6.0, 8.0])
+        self.assertEqual(parse_batch_scores('Response 1: 5\nResponse 2: 9', 2), [5.0, 9.0])
+
+    def test_parse_rejects_incomplete_or_ambiguous(self):
+        """Test that answers that cannot be mapped back return None."""
+        self.assertIsNone(parse_batch_scores('{"1": 7}', 2))
+        self.assertIsNone(parse_batch_scores('{"1": 7, "2": 42}', 2))
+        self.assertIsNone(parse_batch_scores('1: 5\n1: 6\n2: 7', 2))
+        self.assertIsNone(parse_batch_scores('They are all good', 2))
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    """Test LLMEvaluationHelper.evaluate_batch."""
+
+    def setUp(self):
+        test = self
+
+        class ScriptedBackend:
+            def __init__(self, model_name):
+                pass
+
+            def __call__(self, prompt):
+                test.prompts.append(prompt)
+                return test.answer if 'JSON object' in prompt else "Score: 4"
+
+        self.prompts = []
+        ModelRegistry.register('scripted_judge', ScriptedBackend)
+        self.judge = LLM('judge', 'model', backend='scripted_judge')
+
+    def test_single_prompt_for_batch(self):
+        """Test that a parsable answer costs one judge call."""
+        self.answer = '{"1": 8, "2": 2, "3": 5}'
+        scores = LLMEvaluationHelper.evaluate_batch(self.judge, 'task', ['a', 'b', 'c'])
+        self.assertEqual(scores, [8.0, 2.0, 5.0])
+        self.assertEqual(len(self.prompts), 1)
+
+    def test_falls_back_to_pairs(self):
+        """Test per-response judging when the batched answer cannot be parsed."""
+        self.answer = 'All fine.'
+        scores = LLMEvaluationHelper.evaluate_batch(self.judge, 'task', ['a', 'b'])
+        self.assertEqual(scores, [4.0, 4.0])
+        self.assertEqual(len(self.prompts), 3)
+
+
+class TestScoringProtocol(unittest.TestCase):
+    """Test single-score prompts and parsing."""
+
+    def test_prompt_formats(self):
+        """Test that each format asks for its score form on top of the rating request."""
+        tag = ScoringProtocol().prompt('task', 'answer')
+        self.assertTrue(tag.startswith("Task: 'task'. Response: 'answer'."))
+        self.assertIn("'Score: N'", tag)
+        self.assertIn('{"score": N}', ScoringProtocol('json').prompt('task', 'answer'))
+        plain = LLMEvaluationHelper.build_scoring_prompt('task', 'answer')
+        self.assertEqual(ScoringProtocol('plain').prompt('task', 'answer'), plain)
+        with self.assertRaises(ValueError):
+            ScoringProtocol('xml')
+        with self.assertRaises(ValueError):
+            ScoringProtocol().prompt('', 'answer')
+
+    def test_structured_fast_paths(self):
+        """Test exact and embedded tag and JSON answers."""
+        protocol = ScoringProtocol()
+        self.assertEqual(protocol.parse('Score: 7'), (7.0, 'tag'))
+        self.assertEqual(protocol.parse('**Score:** 8/10'), (8.0, 'tag'))
+        self.assertEqual(protocol.parse('The answer covers 3 of 4 points.\nScore: 6'), (6.0, 'tag'))
+        self.assertEqual(ScoringProtocol('json').parse('{"score": 5.5}'), (5.5, 'json'))
+        self.assertEqual(protocol.parse('Here you go: {"score": 6}'), (6.0, 'json'))
+
+    def test_heuristic_ignores_scale(self):
+        """Test that mentions of the scale are not taken for the score."""
+        self.assertEqual(ScoringProtocol().parse('On a 1 to 9 scale I give it 7.'), (7.0, 'heuristic'))
+        self.assertEqual(heuristic_score('I would say 7/10.'), 7.0)
+        self.assertEqual(heuristic_score('Rated between 1 and 10: 3'), 3.0)
+
+    def test_failures(self):
+        """Test that unparsable or out-of-range answers yield None rather than a low score."""
+        self.assertEqual(ScoringProtocol().parse('No opinion.'), (None, 'failed'))
+        self.assertEqual(ScoringProtocol(heuristic=False).parse('I give it 7.'), (None, 'failed'))
+        self.assertEqual(ScoringProtocol(heuristic=False).parse('Score: 42'), (None, 'failed'))
+
+
+class TestPairwiseJudging(unittest.TestCase):
+    """Test pairwise prompts and verdict parsing."""
+
+    def test_prompt(self):
+        """Test that both responses are labelled in the prompt."""
+        prompt = build_pairwise_prompt('task', 'first', 'second')
+        self.assertIn("Response A: 'first'", prompt)
+        self.assertIn("Response B: 'second'", prompt)
+        with self.assertRaises(ValueError):
+            build_pairwise_prompt('task', 'first', '')
+
+    def test_verdicts(self):
+        """Test winner lines, bare verdicts and answers without a verdict."""
+        self.assertEqual(parse_pairwise_verdict('A is clearer.\nWinner: A'), 1.0)
+        self.assertEqual(parse_pairwise_verdict('**Winner:** Response B'), 0.0)
+        self.assertEqual(parse_pairwise_verdict('winner: tie'), 0.5)
+        self.assertEqual(parse_pairwise_verdict(' B. '), 0.0)
+        self.assertIsNone(parse_pairwise_verdict('Both are fine.'))
+
+
+class TestEvaluateParsing(unittest.TestCase):
+    """Test that evaluate drops unparsable answers and counts parse methods."""
+
+    def test_unparsable_answer(self):
+        test = self
+
+        class FixedBackend:
+            def __init__(self, model_name):
+                pass
+
+            def __call__(self, prompt):
+                return test.answer
+
+        ModelRegistry.register('fixed_judge', FixedBackend)
+        metrics = Metrics()
+        judge = LLM('judge', 'model', backend='fixed_judge', metrics=metrics)
+        self.answer = 'Score: 9'
+        self.assertEqual(LLMEvaluationHelper.evaluate(judge, 'task', 'answer'), 9.0)
+        self.answer = 'No idea.'
+        self.assertIsNone(LLMEvaluationHelper.evaluate(judge, 'task', 'answer'))
+        counts = {
+            entry['labels']['method']: entry['value']
+            for entry in metrics.to_dict()['counters']['autorank_score_parse_total']
+        }
+        self.assertEqual(counts, {'tag': 1.0, 'failed': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.metrics import NULL_METRICS, Histogram, Metrics
+from autorank_llm.models import ModelRegistry
+from tests.test_evaluator import CountingBackend
+
+
+class TestMetrics(unittest.TestCase):
+    """Test the metrics store and its exports."""
+
+    def test_histogram(self):
+        """Test bucket counts, quantiles and the cumulative export."""
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.quantile(0.5), 1.0)
+        self.assertIsNone(histogram.quantile(1.0))
+        exported = histogram.to_dict()
+        self.assertEqual(exported['buckets'], {'0.1': 1, '1.0': 3, '+Inf': 4})
+        self.assertAlmostEqual(exported['mean'], 1.5625)
+
+    def test_prometheus_and_json_export(self):
+        """Test that counters, gauges and histograms render in both formats."""
+        metrics = Metrics(buckets=(1.0,))
+        metrics.inc('autorank_calls_total', model='a', role='judge')
+        metrics.inc('autorank_calls_total', model='a', role='judge')
+        metrics.set('autorank_cache_hits', 3)
+        metrics.observe('autorank_call_latency_seconds', 0.5, model='a"b')
+        text = metrics.to_prometheus()
+        self.assertIn('# TYPE autorank_calls_total counter', text)
+        self.assertIn('autorank_calls_total{model="a",role="judge"} 2.0', text)
+        self.assertIn('autorank_cache_hits 3', text)
+        self.assertIn('autorank_call_latency_seconds_bucket{model="a\\"b",le="1.0"} 1', text)
+        self.assertIn('autorank_call_latency_seconds_count{model="a\\"b"} 1', text)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'metrics.json')
+            metrics.write(path)
+            with open(path) as f:
+                data = json.load(f)
+        self.assertEqual(data['counters']['autorank_calls_total'][0]['value'], 2.0)
+
+    def test_null_metrics_record_nothing(self):
+        """Test that disabled metrics ignore every recording."""
+        NULL_METRICS.inc('x')
+        NULL_METRICS.observe('y', 1.0)
+        with NULL_METRICS.timer('z'):
+            pass
+        self.assertFalse(NULL_METRICS.enabled)
+        self.assertEqual(NULL_METRICS.to_dict(), {'counters': {}, 'gauges': {}, 'histograms': {}})
+
+
+class TestEvaluatorMetrics(unittest.TestCase):
+    """Test the metrics recorded by an evaluation run."""
+
+    def setUp(self):
+        ModelRegistry.register('counting', CountingBackend)
+        self.configs = [{'name': name, 'model_name': name, 'backend': 'counting'} for name in ('a', 'b', 'c')]
+
+    def _series(self, snapshot, kind, name):
+        return {tuple(sorted(item['labels'].items())): item for item in snapshot[kind].get(name, [])}
+
+    def test_run_records_calls_tokens_and_phases(self):
+        """Test per-role call counts, latency histograms, token counts and phase timings."""
+        for mode in ('serial', 'thread', 'async'):
+            evaluator = LLMEvaluator(self.configs, ['one', 'two'], execution_mode=mode, metrics=Metrics())
+            evaluator.evaluate_llms()
+            snapshot = evaluator.get_dashboard_data()['metrics']
+            calls = self._series(snapshot, 'counters', 'autorank_calls_total')
+            self.assertEqual(calls[(('model', 'a'), ('role', 'generate'))]['value'], 2, mode)
+            self.assertEqual(calls[(('model', 'a'), ('role', 'judge'))]['value'], 4, mode)
+            latency = self._series(snapshot, 'histograms', 'autorank_call_latency_seconds')
+            self.assertEqual(latency[(('model', 'b'), ('role', 'judge'))]['count'], 4)
+            waits = self._series(snapshot, 'histograms', 'autorank_queue_wait_seconds')
+            self.assertEqual(sum(item['count'] for item in waits.values()), 18)
+            tokens = self._series(snapshot, 'counters', 'autorank_tokens_total')
+            self.assertGreater(tokens[(('kind', 'completion'), ('model', 'c'))]['value'], 0)
+            phases = self._series(snapshot, 'histograms', 'autorank_phase_seconds')
+            self.assertEqual(set(phases), {(('phase', 'round'),), (('phase', 'converge'),), (('phase', 'log'),)})
+            failed = self._series(snapshot, 'gauges', 'autorank_failed_calls')
+            self.assertEqual(failed[(('role', 'judgements'),)]['value'], 0)
+
+    def test_disabled_by_default(self):
+        """Test that metrics are off unless requested."""
+        evaluator = LLMEvaluator(self.configs, 'task')
+        evaluator.evaluate_llms()
+        self.assertIsNone(evaluator.get_dashboard_data()['metrics'])
+        with self.assertRaises(ValueError):
+            evaluator.export_metrics('metrics.prom')
+
+    def test_export_prometheus_file(self):
+        """Test writing a Prometheus textfile."""
+        evaluator = LLMEvaluator(self.configs, 'task', metrics=Metrics())
+        evaluator.evaluate_llms()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'autorank.prom')
+            evaluator.export_metrics(path)
+            with open(path) as f:
+                text = f.read()
+        self.assertIn('autorank_call_latency_seconds_bucket{model="a",role="generate",le="+Inf"} 1', text)
+        self.assertIn('autorank_convergence_iterations', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
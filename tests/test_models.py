@@ -1,12 +1,47 @@
+import asyncio
 import unittest
 from unittest.mock import patch, Mock
+from autorank_llm.cache import ResponseCache
 from autorank_llm.models import (
     LLM,
     ModelRegistry,
-    LLMEvaluationHelper
+    LLMEvaluationHelper,
+    OllamaBackend
 )
 
 
+class LazyBackend:
+    """Backend that counts how often it is constructed."""
+    instances = 0
+
+    def __init__(self, model_name):
+        LazyBackend.instances += 1
+
+    def __call__(self, prompt):
+        return "lazy"
+
+
+class BatchingBackend:
+    """Backend implementing the optional batch and stream methods."""
+    batches = []
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, prompt):
+        return f"Response to: {prompt}"
+
+    def batch(self, prompts):
+        BatchingBackend.batches.append(list(prompts))
+        return [ValueError('bad prompt') if prompt == 'bad' else f"Response to: {prompt}" for prompt in prompts]
+
+    async def abatch(self, prompts):
+        return self.batch(prompts)
+
+    def stream(self, prompt):
+        yield from ('Response ', 'to: ', prompt)
+
+
 class TestModelRegistry(unittest.TestCase):
     """Test the ModelRegistry system."""
 
@@ -31,6 +66,40 @@ class TestModelRegistry(unittest.TestCase):
             ModelRegistry.get_backend('definitely_not_a_backend')
         self.assertIn('not registered', str(context.exception))
 
+    def test_register_by_import_path(self):
+        """Test that string-registered backends are imported on first lookup."""
+        ModelRegistry.register('lazy_path', 'autorank_llm.models:OllamaBackend')
+        self.assertTrue(ModelRegistry.is_registered('lazy_path'))
+        self.assertIs(ModelRegistry.get_backend('lazy_path'), OllamaBackend)
+
+    def test_bad_import_path(self):
+        ModelRegistry.register('bad_path', 'no_colon_here')
+        with self.assertRaises(ValueError):
+            ModelRegistry.get_backend('bad_path')
+
+    def test_builtin_backend_defers_client(self):
+        """Test that built-in wrappers import LangChain and build the client only on first use."""
+        backend = OllamaBackend('llama2', temperature=0)
+        self.assertIsNone(backend._llm)
+        with patch('autorank_llm.models._import_object', side_effect=ImportError('missing')):
+            with self.assertRaises(ImportError) as context:
+                backend('hello')
+        self.assertIn('Ollama backend not available', str(context.exception))
+        client_class = Mock()
+        with patch('autorank_llm.models._import_object', return_value=client_class):
+            backend('hello')
+        client_class.assert_called_once_with(model='llama2', temperature=0)
+
+    def test_builtin_backend_batches_and_streams_through_client(self):
+        """Test that built-in wrappers map batch and stream onto the LangChain client."""
+        backend = OllamaBackend('llama2')
+        backend.llm = Mock()
+        backend.llm.batch.return_value = ['a', 'b']
+        self.assertEqual(backend.batch(['x', 'y']), ['a', 'b'])
+        backend.llm.batch.assert_called_once_with(['x', 'y'], return_exceptions=True)
+        backend.stream('x')
+        backend.llm.stream.assert_called_once_with('x')
+
 
 class TestLLM(unittest.TestCase):
     """Test the LLM class."""
@@ -58,8 +127,20 @@ class TestLLM(unittest.TestCase):
         self.assertTrue(50 <= llm.skill_level <= 100)
         self.assertEqual(llm.evaluations, [])
 
+    def test_backend_is_constructed_lazily(self):
+        """Test that the backend instance is only built on first use."""
+        ModelRegistry.register('lazy_count', LazyBackend)
+        LazyBackend.instances = 0
+        llm = LLM('lazy', 'model', backend='lazy_count')
+        self.assertEqual(LazyBackend.instances, 0)
+        self.assertEqual(llm.perform_task('task'), 'lazy')
+        llm.perform_task('task')
+        self.assertEqual(LazyBackend.instances, 1)
+
     def test_init_validation(self):
         """Test that LLM validates inputs."""
+        with self.assertRaises(ValueError):
+            LLM('name', 'model', backend='definitely_not_a_backend')
         with self.assertRaises(ValueError):
             LLM('', 'model', backend='mock')
         with self.assertRaises(ValueError):
@@ -88,6 +169,51 @@ class TestLLM(unittest.TestCase):
         mock_logger.exception.assert_called_once()
 
 
+class TestBackendProtocol(unittest.TestCase):
+    """Test the optional batch and streaming backend methods."""
+
+    def setUp(self):
+        ModelRegistry.register('batching', BatchingBackend)
+        BatchingBackend.batches = []
+        self.llm = LLM('batcher', 'model', backend='batching', cache=ResponseCache())
+
+    def test_capabilities(self):
+        """Test that optional methods are detected."""
+        self.assertEqual(
+            self.llm.capabilities, {'ainvoke': False, 'batch': True, 'abatch': True, 'stream': True, 'astream': False}
+        )
+        self.assertTrue(self.llm.supports_batch)
+        self.assertFalse(self.llm.supports_async)
+
+    def test_perform_batch_uses_cache_and_isolates_failures(self):
+        """Test that cached prompts are not resent and a failed prompt only loses its own response."""
+        self.assertEqual(self.llm.perform_task('one'), 'Response to: one')
+        responses = self.llm.perform_batch(['one', 'two', 'bad'])
+        self.assertEqual(responses, ['Response to: one', 'Response to: two', None])
+        self.assertEqual(BatchingBackend.batches, [['two', 'bad']])
+        self.assertEqual(asyncio.run(self.llm.aperform_batch(['two', 'three'])), ['Response to: two', 'Response to: three'])
+        self.assertEqual(BatchingBackend.batches[-1], ['three'])
+
+    def test_perform_batch_handles_exceptions(self):
+        """Test that a failed batch call yields None for every prompt."""
+        self.llm.llm.batch = Mock(side_effect=Exception('down'))
+        self.assertEqual(self.llm.perform_batch(['x', 'y']), [None, None])
+
+    def test_stream(self):
+        """Test native streaming, caching of the streamed response, and the single-chunk fallback."""
+        self.assertEqual(list(self.llm.stream('hi')), ['Response ', 'to: ', 'hi'])
+        self.assertEqual(list(self.llm.stream('hi')), ['Response to: hi'])
+        ModelRegistry.register('plain', LazyBackend)
+        self.assertEqual(list(LLM('plain', 'model', backend='plain').stream('hi')), ['lazy'])
+
+    def test_evaluate_many(self):
+        """Test that several judge prompts are scored with one batch call."""
+        scores = LLMEvaluationHelper.evaluate_many(self.llm, [('task one', ['answer']), ('task two', ['x', 'y'])])
+        self.assertEqual(len(BatchingBackend.batches), 1)
+        self.assertEqual(len(scores), 2)
+        self.assertEqual(len(scores[1]), 2)
+
+
 class TestLLMEvaluationHelper(unittest.TestCase):
     """Test the LLMEvaluationHelper class."""
 
@@ -0,0 +1,186 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+from email.utils import formatdate
+from types import SimpleNamespace
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.models import ModelRegistry
+from autorank_llm.policy import (
+    CallPolicy,
+    CallTimeoutError,
+    CircuitOpenError,
+    TokenBucket,
+    is_transient,
+    retry_after
+)
+
+
+class RateLimitError(Exception):
+    """Mimics a provider's HTTP 429 error."""
+    status_code = 429
+
+
+class AuthenticationError(Exception):
+    status_code = 401
+
+
+class Flaky:
+    """Callable failing with the given errors before succeeding."""
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+class RateLimitedBackend:
+    """Quality backend whose judge calls are rate limited every other time."""
+    quality = {'a': 3, 'b': 5, 'c': 8}
+    attempts = 0
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, prompt):
+        for name, value in self.quality.items():
+            if f"'{name} answer'" in prompt:
+                RateLimitedBackend.attempts += 1
+                if RateLimitedBackend.attempts % 2:
+                    raise RateLimitError("429 Too Many Requests")
+                return f"Score: {value}"
+        return f"{self.model_name} answer"
+
+
+class TestCallPolicy(unittest.TestCase):
+    """Test retries, rate limits, timeouts and circuit breaking."""
+
+    def test_is_transient(self):
+        """Test that rate limits, timeouts and 5xx are retried but client errors are not."""
+        self.assertTrue(is_transient(RateLimitError()))
+        self.assertTrue(is_transient(ConnectionError()))
+        self.assertTrue(is_transient(CallTimeoutError()))
+        self.assertFalse(is_transient(AuthenticationError()))
+        self.assertFalse(is_transient(ValueError()))
+        self.assertFalse(is_transient(CircuitOpenError()))
+
+    def test_retries_transient_errors(self):
+        """Test that transient errors are retried with backoff and permanent ones are raised at once."""
+        policy = CallPolicy(max_retries=3, backoff_base=0.001, seed=0)
+        flaky = Flaky(RateLimitError(), ConnectionError())
+        self.assertEqual(policy.call('m', 'prompt', flaky), 'ok')
+        self.assertEqual(flaky.calls, 3)
+        self.assertEqual(policy.stats()['retries'], 2)
+        permanent = Flaky(AuthenticationError())
+        with self.assertRaises(AuthenticationError):
+            policy.call('m', 'prompt', permanent)
+        self.assertEqual(permanent.calls, 1)
+        exhausted = Flaky(*[RateLimitError()] * 5)
+        with self.assertRaises(RateLimitError):
+            policy.call('other', 'prompt', exhausted)
+        self.assertEqual(exhausted.calls, 4)
+
+    def test_retry_after_header(self):
+        """Test that Retry-After headers in seconds or as an HTTP date are honoured and capped at backoff_max."""
+        def limited(headers):
+            error = RateLimitError()
+            error.response = SimpleNamespace(status_code=429, headers=headers)
+            return error
+
+        self.assertEqual(retry_after(limited({'Retry-After': '2'})), 2.0)
+        self.assertEqual(retry_after(limited({'retry-after-ms': '1500'})), 1.5)
+        self.assertAlmostEqual(retry_after(limited({'retry-after': formatdate(time.time() + 20, usegmt=True)})), 20, delta=1.5)
+        self.assertIsNone(retry_after(limited({'Retry-After': 'soon'})))
+        self.assertIsNone(retry_after(limited({})))
+        policy = CallPolicy(backoff_max=5.0, seed=0)
+        self.assertEqual(policy._backoff(0, limited({'Retry-After': '2'})), 2.0)
+        self.assertEqual(policy._backoff(0, limited({'Retry-After': '120'})), 5.0)
+        with mock.patch('autorank_llm.policy.time.sleep') as sleep:
+            flaky = Flaky(limited({'Retry-After': '3'}))
+            self.assertEqual(policy.call('m', 'prompt', flaky), 'ok')
+        sleep.assert_called_with(3.0)
+
+    def test_circuit_breaker(self):
+        """Test that a failing model's circuit opens, fails fast, and closes after a successful trial."""
+        policy = CallPolicy(max_retries=0, failure_threshold=2, reset_timeout=0.05)
+        for _ in range(2):
+            with self.assertRaises(RateLimitError):
+                policy.call('m', 'prompt', Flaky(RateLimitError()))
+        untouched = Flaky()
+        with self.assertRaises(CircuitOpenError):
+            policy.call('m', 'prompt', untouched)
+        self.assertEqual(untouched.calls, 0)
+        self.assertEqual(policy.stats()['open_circuits'], ['m'])
+        self.assertEqual(policy.call('n', 'prompt', Flaky()), 'ok')
+        time.sleep(0.06)
+        self.assertEqual(policy.call('m', 'prompt', untouched), 'ok')
+        self.assertEqual(policy.breaker('m').state, 'closed')
+
+    def test_circuit_breaker_ignores_permanent_errors(self):
+        """Test that non-transient errors, such as a bad API key, do not open the circuit."""
+        policy = CallPolicy(max_retries=0, failure_threshold=2)
+        for _ in range(3):
+            with self.assertRaises(AuthenticationError):
+                policy.call('m', 'prompt', Flaky(AuthenticationError()))
+        self.assertEqual(policy.breaker('m').state, 'closed')
+        self.assertEqual(policy.breaker('m').failures, 0)
+        self.assertEqual(policy.call('m', 'prompt', Flaky()), 'ok')
+
+    def test_timeouts(self):
+        """Test that slow sync and async calls time out."""
+        policy = CallPolicy(max_retries=0, timeout=0.01)
+        with self.assertRaises(CallTimeoutError):
+            policy.call('m', 'prompt', lambda: time.sleep(0.2))
+
+        async def slow():
+            await asyncio.sleep(0.2)
+
+        with self.assertRaises(CallTimeoutError):
+            asyncio.run(policy.acall('m', 'prompt', slow))
+
+    def test_token_bucket(self):
+        """Test that the bucket allows a burst and then asks callers to wait."""
+        bucket = TokenBucket(60, capacity=2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 1.0, places=1)
+        # 400 characters are about 100 tokens: 40 over a 60 tokens/min budget, none over 6000
+        policy = CallPolicy(tokens_per_minute=60, model_limits={'big': {'tokens_per_minute': 6000}})
+        self.assertAlmostEqual(policy._throttle('small', 'x' * 400), 40.0, delta=0.5)
+        self.assertEqual(policy._throttle('big', 'x' * 400), 0.0)
+        self.assertAlmostEqual(policy.stats()['throttled_seconds'], 40.0, delta=0.5)
+
+
+class TestEvaluatorFailures(unittest.TestCase):
+    """Test that failed judgements never become zero scores."""
+
+    def setUp(self):
+        ModelRegistry.register('rate_limited', RateLimitedBackend)
+        RateLimitedBackend.attempts = 0
+        self.configs = [{'name': name, 'model_name': name, 'backend': 'rate_limited'} for name in ('a', 'b', 'c')]
+
+    def test_failures_are_dropped_without_policy(self):
+        """Test that failed judgements are counted and left out of the scores."""
+        results = LLMEvaluator(self.configs, 'task').evaluate_llms()
+        self.assertEqual(results['failures'], {'generations': 0, 'judgements': 3})
+        self.assertEqual(len(results['explainability_log']), 3)
+        self.assertNotIn(0.0, [entry['score'] for entry in results['explainability_log']])
+
+    def test_policy_retries_rate_limits(self):
+        """Test that a call policy turns rate-limited judgements into real scores."""
+        policy = CallPolicy(max_retries=2, backoff_base=0.001)
+        evaluator = LLMEvaluator(self.configs, 'task', threshold=1e-3, call_policies={'rate_limited': policy})
+        results = evaluator.evaluate_llms()
+        self.assertEqual(results['failures'], {'generations': 0, 'judgements': 0})
+        self.assertEqual(len(results['explainability_log']), 6)
+        ranked = sorted(results['rankings'], key=lambda llm: llm.skill_level, reverse=True)
+        self.assertEqual([llm.name for llm in ranked], ['c', 'b', 'a'])
+        self.assertEqual(evaluator.get_dashboard_data()['call_policy_stats']['rate_limited']['retries'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import unittest
+from autorank_llm.models import LLM, LangChainBackend, ModelRegistry
+from autorank_llm.pool import ClientPool
+
+
+class NamespaceBackend(LangChainBackend):
+    """LangChain-style backend whose 'client' records its constructor arguments."""
+    client_path = 'types:SimpleNamespace'
+    display_name = 'Namespace'
+    pool_name = 'namespace'
+    session_args = ('http_client', 'http_async_client')
+
+
+class FakeSession:
+    def __init__(self, asynchronous, max_connections, keepalive_expiry):
+        self.asynchronous = asynchronous
+        self.max_connections = max_connections
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestClientPool(unittest.TestCase):
+    """Test client and session sharing."""
+
+    def setUp(self):
+        self.pool = ClientPool(pool_size=8, pool_sizes={'namespace': 4}, session_factory=FakeSession)
+
+    def test_identical_configs_share_a_client(self):
+        """Test that backends with the same model and params reuse one client."""
+        first = NamespaceBackend('m1', pool=self.pool, temperature=0).llm
+        second = NamespaceBackend('m1', pool=self.pool, temperature=0).llm
+        other = NamespaceBackend('m1', pool=self.pool, temperature=1).llm
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(self.pool.stats(), {'hits': 1, 'misses': 2, 'clients': 2, 'sessions': 1})
+
+    def test_models_share_sessions_per_endpoint(self):
+        """Test that different models on one endpoint share keep-alive sessions sized per backend."""
+        a = NamespaceBackend('m1', pool=self.pool, base_url='http://gpu-1').llm
+        b = NamespaceBackend('m2', pool=self.pool, base_url='http://gpu-1').llm
+        c = NamespaceBackend('m3', pool=self.pool, base_url='http://gpu-2').llm
+        self.assertIs(a.http_client, b.http_client)
+        self.assertIsNot(a.http_client, c.http_client)
+        self.assertFalse(a.http_client.asynchronous)
+        self.assertFalse(hasattr(a, 'http_async_client'))
+        self.assertEqual(a.http_client.max_connections, 4)
+        self.pool.close()
+        self.assertTrue(a.http_client.closed)
+        self.assertEqual(self.pool.stats()['clients'], 0)
+
+    def test_async_sessions_are_per_event_loop(self):
+        """Test that async clients and sessions are shared within a loop, not across loops, and closed with it."""
+        first, second = NamespaceBackend('m1', pool=self.pool), NamespaceBackend('m2', pool=self.pool)
+
+        async def clients():
+            return first.async_llm, second.async_llm, first.async_llm
+
+        a, b, again = asyncio.run(clients())
+        self.assertIs(a, again)
+        self.assertIs(a.http_async_client, b.http_async_client)
+        self.assertTrue(a.http_async_client.asynchronous)
+        self.assertIs(a.http_client, self.pool.session('namespace'))
+        other, _, _ = asyncio.run(clients())
+        self.assertIsNot(other.http_async_client, a.http_async_client)
+
+        async def close_loop():
+            client = first.async_llm
+            await self.pool.aclose_loop()
+            return client
+
+        closed = asyncio.run(close_loop())
+        self.assertTrue(closed.http_async_client.closed)
+        self.assertFalse(a.http_async_client.closed)
+        self.pool.close()
+        self.assertTrue(a.http_async_client.closed)
+        self.assertTrue(other.http_async_client.closed)
+        self.assertEqual(self.pool.stats(), {'hits': 2, 'misses': 5, 'clients': 0, 'sessions': 0})
+
+    def test_async_engine_closes_loop_sessions(self):
+        """Test that an async engine closes the sessions opened on each batch's loop before the loop ends."""
+        from autorank_llm.concurrency import Call, ExecutionEngine
+        backend = NamespaceBackend('m1', pool=self.pool)
+        engine = ExecutionEngine(mode='async', client_pool=self.pool)
+
+        async def call():
+            return backend.async_llm
+
+        first, = engine.map([Call('namespace', lambda: None, call)])
+        second, = engine.map([Call('namespace', lambda: None, call)])
+        self.assertTrue(first.http_async_client.closed)
+        self.assertIsNot(first.http_async_client, second.http_async_client)
+        # Only the sync session outlives the loops
+        self.assertEqual(self.pool.stats()['sessions'], 1)
+
+    def test_explicit_session_and_missing_httpx(self):
+        """Test that a user-supplied session wins and that no session is injected when unavailable."""
+        own = object()
+        client = NamespaceBackend('m1', pool=self.pool, http_client=own).llm
+        self.assertIs(client.http_client, own)
+        bare = ClientPool(session_factory=lambda *args: None)
+        client = NamespaceBackend('m1', pool=bare).llm
+        self.assertFalse(hasattr(client, 'http_client'))
+
+    def test_llm_forwards_pool_and_default_pool(self):
+        """Test that LLM passes its pool to LangChain backends and that the default pool is shared."""
+        ModelRegistry.register('namespace', NamespaceBackend)
+        llm = LLM('a', 'm1', backend='namespace', pool=self.pool)
+        self.assertIs(llm.llm.pool, self.pool)
+        self.assertIs(LLM('b', 'm1', backend='namespace').llm.pool, ClientPool.default())
+        with self.assertRaises(ValueError):
+            ClientPool(pool_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
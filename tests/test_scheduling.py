@@ -0,0 +1,70 @@
+import unittest
+from collections import Counter
+from autorank_llm.scheduling import (
+    ActiveSamplingScheduler,
+    AllPairsScheduler,
+    RandomRegularScheduler,
+    RoundRobinScheduler
+)
+from autorank_llm.scoring import ScoreMatrix
+
+NAMES = [f"m{i}" for i in range(7)]
+
+
+class TestPairingSchedulers(unittest.TestCase):
+    """Test the judge assignment schedulers."""
+
+    def assertRegular(self, assignment, k):
+        judge_load = Counter(judge for judges in assignment.values() for judge in judges)
+        for candidate, judges in assignment.items():
+            self.assertEqual(len(judges), k)
+            self.assertEqual(len(set(judges)), k)
+            self.assertNotIn(candidate, judges)
+        self.assertEqual(set(judge_load.values()), {k})
+
+    def test_all_pairs(self):
+        assignment = AllPairsScheduler().assign(NAMES)
+        self.assertRegular(assignment, len(NAMES) - 1)
+        self.assertEqual(AllPairsScheduler().expected_judgements(7), 42)
+
+    def test_round_robin_rotates_judges(self):
+        """Test that successive assignments cover every judge for every candidate."""
+        scheduler = RoundRobinScheduler(2)
+        met = {name: set() for name in NAMES}
+        for _ in range(3):
+            assignment = scheduler.assign(NAMES)
+            self.assertRegular(assignment, 2)
+            for candidate, judges in assignment.items():
+                met[candidate].update(judges)
+        self.assertTrue(all(len(judges) == len(NAMES) - 1 for judges in met.values()))
+
+    def test_random_regular(self):
+        scheduler = RandomRegularScheduler(3, seed=1)
+        self.assertRegular(scheduler.assign(NAMES), 3)
+        self.assertEqual(scheduler.expected_judgements(7), 21)
+        self.assertRegular(RandomRegularScheduler(10).assign(NAMES[:3]), 2)
+
+    def test_invalid_k(self):
+        with self.assertRaises(ValueError):
+            RandomRegularScheduler(0)
+        with self.assertRaises(ValueError):
+            ActiveSamplingScheduler(2, min_judges=3)
+
+    def test_active_sampling_focuses_on_uncertain_candidates(self):
+        """Test that the budget is kept and extra judges go to closely ranked candidates."""
+        scores = ScoreMatrix(NAMES)
+        means = {'m0': 1.0, 'm1': 9.0, 'm2': 5.0, 'm3': 5.05, 'm4': 3.0, 'm5': 7.0, 'm6': 2.0}
+        for candidate, mean in means.items():
+            judges = [name for name in NAMES if name != candidate][:2]
+            for offset, judge in zip((-0.5, 0.5), judges):
+                scores.add(judge, candidate, 't', mean + offset)
+        assignment = ActiveSamplingScheduler(2, seed=0).assign(NAMES, scores)
+        self.assertEqual(sum(len(judges) for judges in assignment.values()), 14)
+        self.assertTrue(all(len(judges) >= 1 for judges in assignment.values()))
+        self.assertGreater(len(assignment['m2']), len(assignment['m1']))
+        self.assertGreater(len(assignment['m3']), len(assignment['m0']))
+        self.assertTrue(all(candidate not in judges for candidate, judges in assignment.items()))
+
+
+if __name__ == '__main__':
+    unittest.main()
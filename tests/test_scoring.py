@@ -0,0 +1,131 @@
+import unittest
+import numpy as np
+from autorank_llm.scoring import (
+    ScoreMatrix,
+    aggregate,
+    center_judges,
+    converge_weighted,
+    kendall_tau,
+    normalize,
+    pairwise_wins,
+    weighted_step
+)
+
+
+def _dominance_matrix():
+    """Every judge scores 'c' > 'b' > 'a'."""
+    scores = ScoreMatrix(['a', 'b', 'c'])
+    quality = {'a': 3.0, 'b': 5.0, 'c': 8.0}
+    for judge in quality:
+        for candidate, value in quality.items():
+            if judge != candidate:
+                scores.add(judge, candidate, 'task', value)
+    return scores
+
+
+class TestScoreMatrix(unittest.TestCase):
+    """Test the ScoreMatrix store."""
+
+    def test_add_and_means(self):
+        """Test that repeated scores accumulate and average per cell and per task."""
+        scores = ScoreMatrix(['a', 'b'], task_capacity=1)
+        scores.add_many(['a', 'a', 'b'], ['b', 'b', 'a'], ['t1', 't2', 't1'], [6.0, 8.0, 4.0])
+        self.assertEqual(scores.num_tasks, 2)
+        self.assertEqual(scores.counts.shape, (2, 2, 2))
+        means = scores.pair_means()
+        self.assertEqual(means[0, 1], 7.0)
+        self.assertEqual(means[1, 0], 4.0)
+        self.assertTrue(np.isnan(means[0, 0]))
+        self.assertEqual(scores.task_breakdown(), {'t1': {'a': 4.0, 'b': 6.0}, 't2': {'b': 8.0}})
+
+    def test_add_and_remove_model(self):
+        """Test that models can join and leave without disturbing other cells."""
+        scores = _dominance_matrix()
+        scores.add_model('d')
+        self.assertEqual(scores.counts.shape, (4, 4, 1))
+        scores.add('d', 'c', 'task', 9.0)
+        scores.remove_model('b')
+        self.assertEqual(scores.names, ['a', 'c', 'd'])
+        self.assertEqual(scores.index, {'a': 0, 'c': 1, 'd': 2})
+        means = scores.pair_means()
+        self.assertEqual(means[scores.index['a'], scores.index['c']], 8.0)
+        self.assertEqual(means[scores.index['d'], scores.index['c']], 9.0)
+        self.assertTrue(np.isnan(means[scores.index['c'], scores.index['d']]))
+        with self.assertRaises(ValueError):
+            scores.add_model('a')
+        with self.assertRaises(ValueError):
+            scores.remove_model('b')
+
+    def test_validation(self):
+        """Test that duplicate names and misaligned inputs are rejected."""
+        with self.assertRaises(ValueError):
+            ScoreMatrix(['a', 'a'])
+        with self.assertRaises(ValueError):
+            ScoreMatrix(['a', 'b']).add_many(['a'], ['b'], ['t'], [1.0, 2.0])
+
+
+class TestAggregators(unittest.TestCase):
+    """Test the vectorized skill aggregators."""
+
+    def test_weighted_step_is_skill_weighted_mean(self):
+        """Test that the matrix update equals the skill-weighted mean score per candidate."""
+        scores = ScoreMatrix(['a', 'b', 'c', 'd'])
+        observations = [('a', 'b', 6.0), ('c', 'b', 2.0), ('b', 'a', 9.0), ('a', 'c', 5.0), ('b', 'c', 7.0)]
+        for judge, candidate, value in observations:
+            scores.add(judge, candidate, 't', value)
+        skills = np.array([80.0, 0.0, 50.0, 10.0])
+        sums, counts = scores.pair_totals()
+        updated = weighted_step(sums, counts, skills)
+        self.assertAlmostEqual(updated[0], 9.0)  # only judge has zero weight: plain mean
+        self.assertAlmostEqual(updated[1], (6.0 * 80.0 + 2.0 * 50.0) / 130.0)
+        self.assertAlmostEqual(updated[2], 5.0)
+        self.assertAlmostEqual(updated[3], np.mean(updated[:3]))  # never scored: neutral
+
+    def test_converge_weighted_reaches_fixed_point(self):
+        """Test that the weighted iteration stops once normalized skills settle."""
+        scores = _dominance_matrix()
+        sums, counts = scores.pair_totals()
+        skills, deltas = converge_weighted(sums, counts, np.array([90.0, 60.0, 70.0]), threshold=1e-6)
+        self.assertLess(deltas[-1], 1e-6)
+        self.assertEqual(list(np.argsort(-skills)), [2, 1, 0])
+        np.testing.assert_allclose(normalize(weighted_step(sums, counts, skills)), skills, atol=1e-5)
+
+    def test_alternative_aggregators_agree_on_clear_order(self):
+        """Test that every aggregator recovers an unambiguous ordering."""
+        scores = _dominance_matrix()
+        for method in ('weighted', 'pagerank', 'bradley_terry'):
+            skills, deltas = aggregate(scores, method)
+            self.assertEqual(list(np.argsort(-skills)), [2, 1, 0], method)
+            self.assertTrue(deltas)
+
+    def test_pairwise_wins(self):
+        """Test that wins only count judges that scored both candidates."""
+        wins = pairwise_wins(_dominance_matrix().pair_means())
+        self.assertEqual(wins[2, 0], 1.0)  # only judge 'b' scored both 'a' and 'c'
+        self.assertEqual(wins[0, 2], 0.0)
+
+    def test_center_judges_removes_leniency(self):
+        """Test that a uniformly lenient judge no longer lifts its candidates."""
+        scores = ScoreMatrix(['a', 'b', 'c'])
+        scores.add('a', 'b', 't', 9.0)  # lenient judge
+        scores.add('a', 'c', 't', 9.0)
+        scores.add('b', 'c', 't', 5.0)
+        scores.add('c', 'b', 't', 5.0)
+        sums, counts = scores.pair_totals()
+        centered = center_judges(sums, counts)
+        self.assertAlmostEqual(centered[0, 1], 7.0)
+        self.assertAlmostEqual(centered[2, 1], 7.0)
+        self.assertAlmostEqual(centered.sum(), sums.sum())
+
+    def test_kendall_tau(self):
+        self.assertEqual(kendall_tau([1, 2, 3], [10, 20, 30]), 1.0)
+        self.assertEqual(kendall_tau([1, 2, 3], [3, 2, 1]), -1.0)
+        self.assertAlmostEqual(kendall_tau([1, 2, 3], [1, 3, 2]), 1 / 3)
+
+    def test_unknown_aggregator(self):
+        with self.assertRaises(ValueError):
+            aggregate(_dominance_matrix(), 'elo')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import unittest
+from autorank_llm.judging import build_batch_prompt
+from autorank_llm.models import LLMEvaluationHelper, ModelRegistry
+from autorank_llm.simulation import SyntheticBackend, run_benchmark, synthetic_model_configs
+
+
+class TestSyntheticBackend(unittest.TestCase):
+    """Test the offline synthetic backend."""
+
+    def test_registered_by_default(self):
+        """Test that the backend resolves from the registry."""
+        self.assertIs(ModelRegistry.get_backend('synthetic'), SyntheticBackend)
+
+    def test_judge_scores_follow_quality(self):
+        """Test that noiseless judges map the quality tag onto the 1-9 scale."""
+        judge = SyntheticBackend('judge', judge_noise=0.0)
+        good = SyntheticBackend('good', quality=1.0)('task')
+        bad = SyntheticBackend('bad', quality=0.0)('task')
+        self.assertEqual(LLMEvaluationHelper.extract_numerical_score(judge(f"Response: '{good}'. Rate the response")), 9.0)
+        self.assertEqual(json.loads(judge(build_batch_prompt('task', [good, bad]))), {'1': 9.0, '2': 1.0})
+
+    def test_failures_are_counted(self):
+        """Test that failing calls raise and are counted."""
+        SyntheticBackend.reset_stats()
+        backend = SyntheticBackend('flaky', failure_rate=1.0)
+        with self.assertRaises(ConnectionError):
+            backend('task')
+        self.assertEqual((SyntheticBackend.calls, SyntheticBackend.failures), (1, 1))
+
+    def test_invalid_params(self):
+        """Test that invalid parameters are rejected."""
+        with self.assertRaises(ValueError):
+            SyntheticBackend('m', quality=2.0)
+        with self.assertRaises(ValueError):
+            SyntheticBackend('m', latency='gamma')
+
+
+class TestRunBenchmark(unittest.TestCase):
+    """Test the end-to-end synthetic benchmark."""
+
+    def test_configs_spread_quality(self):
+        """Test that the pool covers qualities 0 to 1 evenly."""
+        configs = synthetic_model_configs(5, seed=3)
+        qualities = sorted(cfg['params']['quality'] for cfg in configs)
+        self.assertEqual(qualities, [0.0, 0.25, 0.5, 0.75, 1.0])
+        with self.assertRaises(ValueError):
+            synthetic_model_configs(1)
+
+    def test_recovers_true_ranking(self):
+        """Test that the evaluator recovers the ground-truth order and makes the expected calls."""
+        result = run_benchmark(num_models=5, num_tasks=2, trace_memory=False)
+        # 5 models x 2 tasks generations, plus 5 x 4 judgements per task
+        self.assertEqual(result['calls'], 5 * 2 + 5 * 4 * 2)
+        self.assertEqual(result['failures'], 0)
+        self.assertGreater(result['kendall_tau'], 0.9)
+        self.assertTrue(result['top1_correct'])
+        self.assertIsNone(result['peak_memory_mb'])
+
+    def test_concurrent_mode_with_failures(self):
+        """Test a threaded run with failing calls still completes."""
+        result = run_benchmark(
+            num_models=4, num_tasks=2, backend_params={'failure_rate': 0.2}, execution_mode='thread', max_concurrency=4
+        )
+        self.assertGreater(result['failures'], 0)
+        self.assertGreater(result['peak_memory_mb'], 0)
+        self.assertEqual(result['evaluator_kwargs']['execution_mode'], 'thread')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from autorank_llm.sinks import JSONLSink, MemorySink, SQLiteSink, response_hash
+
+
+def _entry(i, response):
+    return {'iteration': 1, 'evaluator': 'a', 'evaluatee': 'b', 'task': 't', 'response': response, 'score': i}
+
+
+class TestLogSinks(unittest.TestCase):
+    """Test the explainability log sinks."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sinks(self):
+        return [
+            MemorySink(),
+            JSONLSink(os.path.join(self.tmp.name, 'log.jsonl')),
+            SQLiteSink(),
+            SQLiteSink(os.path.join(self.tmp.name, 'log.sqlite')),
+        ]
+
+    def test_round_trip_resolves_responses(self):
+        """Test that every sink returns entries in order with their response text."""
+        for sink in self._sinks():
+            for i in range(3):
+                sink.write(_entry(i, 'same answer' if i < 2 else 'other answer'))
+            entries = list(sink)
+            self.assertEqual(len(sink), 3)
+            self.assertEqual([entry['score'] for entry in entries], [0, 1, 2])
+            self.assertEqual(entries[0]['response'], 'same answer')
+            self.assertEqual(entries[2]['response_hash'], response_hash('other answer'))
+            sink.close()
+
+    def test_responses_are_deduplicated(self):
+        """Test that repeated responses are stored once."""
+        memory, sqlite = MemorySink(), SQLiteSink()
+        jsonl_path = os.path.join(self.tmp.name, 'dedup.jsonl')
+        jsonl = JSONLSink(jsonl_path)
+        for sink in (memory, sqlite, jsonl):
+            for i in range(5):
+                sink.write(_entry(i, 'a long response'))
+        jsonl.close()
+        self.assertEqual(memory.num_responses, 1)
+        self.assertEqual(sqlite.num_responses, 1)
+        with open(jsonl_path, encoding='utf-8') as f:
+            self.assertEqual(sum('a long response' in line for line in f), 1)
+
+    def test_ring_buffer_releases_responses(self):
+        """Test that a capped memory sink keeps only the newest entries and their responses."""
+        sink = MemorySink(max_entries=2)
+        for i in range(4):
+            sink.write(_entry(i, f'response {i}'))
+        self.assertEqual([entry['score'] for entry in sink], [2, 3])
+        self.assertEqual(sink.num_responses, 2)
+        self.assertEqual(sink[0]['response'], 'response 2')
+
+    def test_jsonl_sink_reopens_existing_file(self):
+        path = os.path.join(self.tmp.name, 'resume.jsonl')
+        first = JSONLSink(path)
+        first.write(_entry(0, 'x'))
+        first.close()
+        second = JSONLSink(path)
+        second.write(_entry(1, 'x'))
+        self.assertEqual(len(second), 2)
+        self.assertEqual([entry['response'] for entry in second], ['x', 'x'])
+        second.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.models import ModelRegistry
+from autorank_llm.scoring import ScoreMatrix
+from autorank_llm.stopping import EarlyStopping
+from tests.test_evaluator import QualityBackend
+
+
+def filled_matrix(quality, num_tasks, noise=None):
+    """Every model judges every other on each task, scoring the candidate's quality plus a per-task offset."""
+    names = list(quality)
+    scores = ScoreMatrix(names)
+    judges, candidates, task_ids, values = [], [], [], []
+    for t in range(num_tasks):
+        for judge in names:
+            for candidate in names:
+                if judge != candidate:
+                    judges.append(judge)
+                    candidates.append(candidate)
+                    task_ids.append(f"t{t}")
+                    values.append(quality[candidate] + (noise[t % len(noise)] if noise else 0.0))
+    scores.add_many(judges, candidates, task_ids, values)
+    return scores
+
+
+class TestEarlyStopping(unittest.TestCase):
+    """Test bootstrap intervals and settled orderings."""
+
+    def test_invalid_arguments(self):
+        """Test that invalid settings are rejected."""
+        for kwargs in ({'confidence': 0.5}, {'top_k': 0}, {'num_bootstrap': 5}, {'min_judgements': 0}):
+            with self.assertRaises(ValueError):
+                EarlyStopping(**kwargs)
+
+    def test_clear_ranking_settles(self):
+        """Test that well separated models settle with ordered, non-overlapping intervals."""
+        stopping = EarlyStopping(seed=0)
+        scores = filled_matrix({'a': 2.0, 'b': 5.0, 'c': 8.0}, 3, noise=[-1.0, 0.0, 1.0])
+        self.assertTrue(stopping.update(scores))
+        summary = stopping.summary()
+        self.assertEqual(summary['settled'], ['a', 'b', 'c'])
+        self.assertLess(summary['intervals']['a'][1], summary['intervals']['b'][0])
+        self.assertGreater(stopping.win_probability[2, 0], 0.95)
+
+    def test_ties_never_settle(self):
+        """Test that indistinguishable models stay active."""
+        stopping = EarlyStopping(seed=0)
+        self.assertFalse(stopping.update(filled_matrix({'a': 5.0, 'b': 5.0, 'c': 5.0}, 4)))
+        self.assertEqual(stopping.active, {'a', 'b', 'c'})
+
+    def test_top_k_ignores_the_tail(self):
+        """Test that tied models below the top k do not keep the run going."""
+        quality = {'a': 9.0, 'b': 3.0, 'c': 3.0}
+        self.assertFalse(EarlyStopping(seed=0).update(filled_matrix(quality, 4)))
+        self.assertTrue(EarlyStopping(top_k=1, seed=0).update(filled_matrix(quality, 4)))
+
+    def test_min_judgements(self):
+        """Test that candidates stay active until they have enough judgements."""
+        stopping = EarlyStopping(min_judgements=10, seed=0)
+        self.assertFalse(stopping.update(filled_matrix({'a': 2.0, 'b': 8.0}, 3)))
+        self.assertEqual(stopping.active, {'a', 'b'})
+
+
+class TestEvaluatorEarlyStopping(unittest.TestCase):
+    """Test that the evaluator stops judging once the ranking is settled."""
+
+    def setUp(self):
+        ModelRegistry.register('quality', QualityBackend)
+        self.configs = [{'name': name, 'model_name': name, 'backend': 'quality'} for name in ('a', 'b', 'c')]
+        self.tasks = [f"task {i}" for i in range(12)]
+
+    def test_stops_early_with_same_ranking(self):
+        """Test that a settled ranking ends the run with fewer calls and the same order."""
+        QualityBackend.calls = 0
+        full = LLMEvaluator(self.configs, self.tasks, task_chunk_size=2, threshold=1e-3).evaluate_llms()
+        full_calls = QualityBackend.calls
+        self.assertIsNone(full['early_stopping'])
+
+        QualityBackend.calls = 0
+        stopping = EarlyStopping(min_judgements=4, seed=0)
+        evaluator = LLMEvaluator(
+            self.configs, self.tasks, task_chunk_size=2, threshold=1e-3, rounds=2, early_stopping=stopping
+        )
+        results = evaluator.evaluate_llms()
+        self.assertLess(QualityBackend.calls, full_calls / 2)
+        self.assertTrue(results['early_stopping']['stopped'])
+        self.assertEqual([llm.name for llm in results['rankings']], [llm.name for llm in full['rankings']])
+        self.assertEqual(evaluator.get_dashboard_data()['early_stopping']['settled'], ['a', 'b', 'c'])
+
+    def test_settled_candidates_are_skipped(self):
+        """Test that only undecided candidates keep being generated and judged."""
+        configs = self.configs + [{'name': 'd', 'model_name': 'd', 'backend': 'quality'}]
+        # c and d tie, so their order never settles
+        with mock.patch.dict(QualityBackend.quality, {'d': 8}):
+            evaluator = LLMEvaluator(configs, self.tasks, task_chunk_size=2, early_stopping=EarlyStopping(seed=0))
+            results = evaluator.evaluate_llms()
+        summary = results['early_stopping']
+        self.assertFalse(summary['stopped'])
+        self.assertEqual(set(summary['settled']), {'a', 'b'})
+        self.assertGreater(summary['skipped']['generations'], 0)
+        self.assertGreater(summary['skipped']['judgements'], 0)
+        received = evaluator.scores.counts.sum(axis=(0, 2))
+        self.assertLess(received[evaluator.scores.index['a']], received[evaluator.scores.index['c']])
+
+
+if __name__ == '__main__':
+    unittest.main()
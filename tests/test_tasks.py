@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+from autorank_llm.tasks import Task, TaskSuite
+
+
+class TestTaskSuite(unittest.TestCase):
+    """Test loading and streaming task suites."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_task_from_record(self):
+        """Test building tasks from strings and dicts."""
+        self.assertEqual(Task.from_record('hi', 3).task_id, '3')
+        task = Task.from_record({'id': 'q1', 'prompt': 'hi', 'category': 'math'}, 0)
+        self.assertEqual((task.task_id, task.prompt, task.metadata), ('q1', 'hi', {'category': 'math'}))
+        self.assertEqual(Task.from_record({'task': 'hi'}, 0).prompt, 'hi')
+        # Both prompt keys are consumed, so neither leaks into the metadata
+        task = Task.from_record({'prompt': 'hi', 'task': 'alias', 'category': 'math'}, 0)
+        self.assertEqual((task.prompt, task.metadata), ('hi', {'category': 'math'}))
+        with self.assertRaises(ValueError):
+            Task.from_record({'id': 'q1'}, 0)
+
+    def test_from_jsonl(self):
+        """Test that JSONL suites skip blank lines and can be iterated repeatedly."""
+        lines = [json.dumps({'id': 'a', 'prompt': 'first'}), '', json.dumps({'prompt': 'second'})]
+        suite = TaskSuite.from_jsonl(self._write('suite.jsonl', '\n'.join(lines)))
+        self.assertEqual([task.task_id for task in suite], ['a', '1'])
+        self.assertEqual([task.prompt for task in suite], ['first', 'second'])
+
+    def test_from_yaml(self):
+        """Test YAML suites with a 'tasks' mapping and with multiple documents."""
+        mapping = TaskSuite.from_file(self._write('suite.yaml', "tasks:\n  - id: a\n    prompt: first\n  - second\n"))
+        self.assertEqual([task.prompt for task in mapping], ['first', 'second'])
+        documents = TaskSuite.from_yaml(self._write('docs.yml', "prompt: first\n---\nprompt: second\n"))
+        self.assertEqual([task.prompt for task in documents], ['first', 'second'])
+
+    def test_chunks(self):
+        """Test streaming a suite in fixed-size chunks."""
+        suite = TaskSuite.from_list(['a', 'b', 'c'])
+        self.assertEqual([[task.prompt for task in chunk] for chunk in suite.chunks(2)], [['a', 'b'], ['c']])
+        with self.assertRaises(ValueError):
+            list(suite.chunks(0))
+
+    def test_from_list_validation(self):
+        """Test that empty suites are rejected."""
+        with self.assertRaises(ValueError):
+            TaskSuite.from_list([])
+        with self.assertRaisesRegex(ValueError, 'empty'):
+            TaskSuite.from_jsonl(self._write('empty.jsonl', '\n\n'))
+        with self.assertRaisesRegex(ValueError, 'empty'):
+            TaskSuite(lambda: [], 'nothing')
+
+    def test_duplicate_ids(self):
+        """Test that suites with two tasks under one id are rejected when built, naming the id."""
+        lines = [json.dumps({'id': 'a', 'prompt': 'first'}), json.dumps({'id': 'a', 'prompt': 'second'})]
+        with self.assertRaisesRegex(ValueError, "'a'"):
+            TaskSuite.from_jsonl(self._write('suite.jsonl', '\n'.join(lines)))
+        with self.assertRaisesRegex(ValueError, "'q1'"):
+            TaskSuite.from_yaml(self._write('suite.yaml', "- id: q1\n  prompt: first\n- id: q1\n  prompt: second\n"))
+        # An explicit id can also collide with the position-based id of a plain string
+        with self.assertRaisesRegex(ValueError, "'1'"):
+            TaskSuite.from_list(['first', 'second', {'id': 1, 'prompt': 'third'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
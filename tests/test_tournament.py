@@ -0,0 +1,134 @@
+import unittest
+from unittest import mock
+import numpy as np
+from autorank_llm.evaluator import LLMEvaluator
+from autorank_llm.models import ModelRegistry
+from autorank_llm.scheduling import RoundRobinScheduler
+from autorank_llm.simulation import SyntheticBackend, synthetic_model_configs
+from autorank_llm.tournament import SwissTournament
+from autorank_llm.utils import rank_llms
+
+
+class FirstShownBackend:
+    """Judge that always prefers the response shown first."""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def __call__(self, prompt):
+        if 'Which response is better' in prompt:
+            return "Winner: A"
+        return f"{self.model_name} answer"
+
+
+class TestSwissTournament(unittest.TestCase):
+    """Test Swiss pairings and online ratings."""
+
+    def test_invalid_arguments(self):
+        """Test that invalid settings and pools without a neutral judge are rejected."""
+        for kwargs in ({'rounds': 0}, {'k_factor': 0}, {'rating': 'glicko'}, {'judges_per_match': 0}):
+            with self.assertRaises(ValueError):
+                SwissTournament(**kwargs)
+        with self.assertRaises(ValueError):
+            SwissTournament().reset(['a', 'b'])
+
+    def test_pairings_cover_pool_with_bye(self):
+        """Test that every model plays once per round and an odd pool gives one bye."""
+        tournament = SwissTournament(seed=0)
+        tournament.reset(['a', 'b', 'c', 'd', 'e'])
+        pairs, bye = tournament.pairings()
+        self.assertEqual(len(pairs), 2)
+        self.assertEqual(sorted([name for pair in pairs for name in pair] + [bye]), ['a', 'b', 'c', 'd', 'e'])
+
+    def test_pairs_neighbours_without_rematches(self):
+        """Test that later rounds pair similar ratings and avoid opponents already met."""
+        tournament = SwissTournament(seed=0)
+        tournament.reset(['a', 'b', 'c', 'd'])
+        tournament.update('a', 'b', 1.0)
+        tournament.update('c', 'd', 1.0)
+        self.assertCountEqual(tournament.standings()[:2], ['a', 'c'])
+        pairs, bye = tournament.pairings()
+        self.assertIsNone(bye)
+        self.assertEqual(sorted(tuple(sorted(pair)) for pair in pairs), [('a', 'c'), ('b', 'd')])
+
+    def test_elo_update(self):
+        """Test that a win moves both ratings by the same amount and an upset moves them more."""
+        tournament = SwissTournament(k_factor=32.0)
+        tournament.reset(['a', 'b', 'c'])
+        tournament.update('a', 'b', 1.0)
+        self.assertAlmostEqual(tournament.elo['a'], 1016.0)
+        self.assertAlmostEqual(tournament.elo['b'], 984.0)
+        tournament.update('a', 'b', 0.0)
+        self.assertGreater(tournament.elo['b'] - 984.0, 16.0)
+        self.assertEqual(tournament.comparisons, 2)
+        self.assertEqual(tournament.wins[0, 1], 1.0)
+
+    def test_comparisons_grow_as_n_log_n(self):
+        """Test that the tournament needs far fewer calls than all-pairs judging."""
+        tournament = SwissTournament()
+        self.assertEqual(tournament.expected_comparisons(64), 6 * 32)
+        self.assertLess(tournament.expected_comparisons(64), 64 * 63 // 10)
+
+
+class TestTournamentEvaluation(unittest.TestCase):
+    """Test the evaluator's tournament mode."""
+
+    def test_ranks_synthetic_pool(self):
+        """Test that a tournament recovers the best model with O(N log N) comparisons."""
+        configs = synthetic_model_configs(8, seed=0, judge_noise=0.0)
+        tournament = SwissTournament(seed=0, rating='bradley_terry')
+        SyntheticBackend.reset_stats()
+        results = LLMEvaluator(configs, ['t1', 't2'], tournament=tournament).evaluate_llms()
+        self.assertEqual(SyntheticBackend.calls, 8 * 2 + tournament.expected_comparisons(8) * 2)
+        best = max(configs, key=lambda config: config['params']['quality'])
+        self.assertEqual(rank_llms(results['rankings'])[0].name, best['name'])
+        self.assertEqual(results['tournament']['rounds'], 3)
+        self.assertEqual(results['iterations'], 3)
+        self.assertEqual(len(list(results['explainability_log'])), 2 * results['tournament']['comparisons'])
+        self.assertEqual(len(results['task_breakdown']), 2)
+
+    def test_ratings_update_as_verdicts_arrive(self):
+        """Test that each verdict is rated when its call completes, not after the round's batch."""
+        configs = synthetic_model_configs(4, seed=0, judge_noise=0.0)
+        evaluator = LLMEvaluator(configs, ['t1'], tournament=SwissTournament(rounds=1, seed=0))
+        prompts, seen = [], []
+        update, call = SwissTournament.update, SyntheticBackend.__call__
+
+        def rate(tournament, a, b, outcome):
+            seen.append(len(prompts))
+            update(tournament, a, b, outcome)
+
+        def answer(backend, prompt):
+            prompts.append(prompt)
+            return call(backend, prompt)
+
+        with mock.patch.object(SwissTournament, 'update', rate), mock.patch.object(SyntheticBackend, '__call__', answer):
+            evaluator.evaluate_llms()
+        # 4 generations, then two matches: the first verdict is rated before the second comparison runs
+        self.assertEqual(seen, [5, 6])
+
+    def test_alternates_response_order(self):
+        """Test that a judge favouring the first position cannot decide a pair."""
+        ModelRegistry.register('first_shown', FirstShownBackend)
+        configs = [{'name': name, 'model_name': name, 'backend': 'first_shown'} for name in 'abc']
+        evaluator = LLMEvaluator(configs, ['t1', 't2'], tournament=SwissTournament(rounds=1, seed=0))
+        evaluator.evaluate_llms()
+        wins = evaluator.tournament.wins
+        np.testing.assert_array_equal(wins, wins.T)
+
+    def test_incompatible_options(self):
+        """Test that tournament mode rejects options it cannot honour."""
+        configs = synthetic_model_configs(3)
+        with self.assertRaises(ValueError):
+            LLMEvaluator(configs, 'task', tournament=SwissTournament(), pairing=RoundRobinScheduler(1))
+        with self.assertRaises(ValueError):
+            LLMEvaluator(configs[:2], 'task', tournament=SwissTournament())
+        evaluator = LLMEvaluator(configs, 'task', tournament=SwissTournament())
+        evaluator.evaluate_llms()
+        with self.assertRaises(ValueError):
+            evaluator.add_model({'name': 'new', 'model_name': 'new', 'backend': 'synthetic'})
+        self.assertEqual(len(evaluator.retire_model(configs[0]['name'])['rankings']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,17 @@
 import unittest
 from unittest.mock import Mock
-from autorank_llm.utils import normalize_skill_levels, rank_llms, explainability_report, check_bias_and_fairness, check_robustness
+import io
+import numpy as np
+from autorank_llm.scoring import ScoreMatrix
+from autorank_llm.utils import (
+    check_bias_and_fairness,
+    check_robustness,
+    explainability_report,
+    normalize_skill_levels,
+    rank_llms,
+    write_explainability_report
+)
+
 
 class TestUtils(unittest.TestCase):
 
@@ -43,25 +54,97 @@ class TestUtils(unittest.TestCase):
 
     def test_explainability_report(self):
         logs = [
-            {'iteration': 1, 'evaluator': 'A', 'evaluatee': 'B', 'task': 'foo', 'response': 'bar', 'score': 7, 'weighted_score': 70},
-            {'iteration': 2, 'evaluator': 'B', 'evaluatee': 'A', 'task': 'foo', 'response': 'baz', 'score': 8, 'weighted_score': 80},
+            {'iteration': 1, 'evaluator': 'A', 'evaluatee': 'B', 'task': 'foo', 'response': 'bar',
+             'score': 7, 'weighted_score': 70},
+            {'iteration': 2, 'evaluator': 'B', 'evaluatee': 'A', 'task': 'foo', 'response': 'baz',
+             'score': 8, 'weighted_score': 80},
         ]
         report = explainability_report(logs)
         self.assertIn('Explainability Report:', report)
         self.assertIn('Iteration 1: A evaluated B', report)
         self.assertIn('Iteration 2: B evaluated A', report)
 
+    def test_write_explainability_report(self):
+        logs = iter([
+            {'iteration': 1, 'evaluator': 'A', 'evaluatee': 'B', 'task': 'foo', 'response': 'bar',
+             'score': 7, 'weighted_score': 70},
+        ])
+        stream = io.StringIO()
+        write_explainability_report(logs, stream)
+        self.assertTrue(stream.getvalue().startswith('Explainability Report:\n'))
+        self.assertIn('Iteration 1: A evaluated B', stream.getvalue())
+
+    def _matrix(self, entries):
+        matrix = ScoreMatrix(['a', 'b', 'c', 'd'])
+        matrix.add_many(*zip(*entries))
+        return matrix
+
     def test_check_bias_and_fairness(self):
-        with self.assertRaises(NotImplementedError):
-            check_bias_and_fairness(self.llms, [])
+        # Candidate quality a < b < c < d; judge b is lenient by 1 and judge c adds 2 for itself and d
+        quality = {'a': 2.0, 'b': 4.0, 'c': 6.0, 'd': 8.0}
+        entries = [
+            (judge, candidate, task, quality[candidate] + (judge == 'b') + 2 * (judge == 'c' and candidate in 'cd'))
+            for judge in 'abcd' for candidate in 'abcd' for task in ('t1', 't2')
+            if judge != candidate or judge == 'c'
+        ]
+        report = check_bias_and_fairness([], self._matrix(entries), families={'c': 'x', 'd': 'x'})
+        self.assertEqual(max(report['leniency'], key=report['leniency'].get), 'b')
+        self.assertGreater(report['leniency']['b'], 0.3)
+        self.assertGreater(report['self_preference']['c'], 1.0)
+        self.assertIsNone(report['self_preference']['a'])
+        self.assertGreater(report['family_preference']['c'], 1.5)
+        self.assertIsNone(report['family_preference']['a'])
+        self.assertEqual(report['kendall_tau']['a']['b'], 1.0)
+        self.assertEqual(report['mean_kendall_tau'], 1.0)
+        self.assertGreater(report['krippendorff_alpha'], 0.5)
+        # The same entries as explainability log dicts give the same report
+        logs = [{'evaluator': j, 'evaluatee': c, 'task_id': t, 'score': v} for j, c, t, v in entries]
+        self.assertEqual(check_bias_and_fairness([], logs, families={'c': 'x', 'd': 'x'}), report)
+
+    def test_krippendorff_alpha_matches_definition(self):
+        rng = np.random.default_rng(0)
+        entries = [
+            (judge, candidate, task, float(rng.integers(1, 10)))
+            for judge in 'abcd' for candidate in 'abcd' for task in ('t1', 't2', 't3')
+            if judge != candidate and rng.random() < 0.8
+        ]
+        alpha = check_bias_and_fairness([], self._matrix(entries))['krippendorff_alpha']
+        # Reference: pairable values per (candidate, task) unit, interval metric
+        units = {}
+        for _, candidate, task, value in entries:
+            units.setdefault((candidate, task), []).append(value)
+        units = [values for values in units.values() if len(values) > 1]
+        pooled = [value for values in units for value in values]
+        n = len(pooled)
+        observed = sum(
+            sum((x - y) ** 2 for i, x in enumerate(values) for j, y in enumerate(values) if i != j) / (len(values) - 1)
+            for values in units
+        ) / n
+        expected = sum((x - y) ** 2 for x in pooled for y in pooled) / (n * (n - 1))
+        self.assertAlmostEqual(alpha, 1 - observed / expected, places=5)
 
     def test_check_robustness(self):
-        with self.assertRaises(NotImplementedError):
-            check_robustness(self.llms, [])
+        # Judge d ranks the candidates in reverse; judge a scored b twice on t1
+        entries = [
+            (judge, candidate, task, float(('abcd'.index(candidate) if judge != 'd' else 3 - 'abcd'.index(candidate))))
+            for judge in 'abcd' for candidate in 'abcd' for task in ('t1', 't2')
+            if judge != candidate
+        ] + [('a', 'b', 't1', 3.0)]
+        report = check_robustness([], self._matrix(entries))
+        variance = report['score_variance']
+        self.assertEqual(variance['pooled'], 2.0)
+        self.assertEqual(variance['by_candidate']['b'], 2.0)
+        self.assertIsNone(variance['by_candidate']['c'])
+        self.assertEqual(report['judge_influence']['d'], 1.0)
+        self.assertEqual(report['judge_influence']['b'], 0.5)
+        self.assertEqual(set(report['task_agreement']), {'t1', 't2'})
+        with self.assertRaises(ValueError):
+            check_robustness([], [])
 
     def tearDown(self):
         # Clean up after each test method
         pass
 
+
 if __name__ == '__main__':
     unittest.main()